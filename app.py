@@ -129,7 +129,7 @@ def get_cached_auth():
 # Clés conservées pour l'audit (sans html_content) afin de tenir dans les cellules GSheet (~90k).
 _LIGHT_PAGE_KEYS = (
     "url", "title", "description", "h1", "h2_count", "has_structured_data",
-    "response_time", "last_modified",
+    "response_time", "last_modified", "etag", "content_hash",
 )
 
 
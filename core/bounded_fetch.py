@@ -0,0 +1,103 @@
+"""
+Téléchargements HTTP bornés (crawl V1/hybride, fetch_page, Authority Score, Eco-Score).
+- Requête en flux (stream=True) : Content-Type et Content-Length vérifiés sur les en-têtes,
+  avant de lire le corps ; une réponse non HTML (PDF sans extension, image, archive) est
+  refusée sans être téléchargée.
+- Corps lu par morceaux, décompressé à la volée (gzip / deflate / br selon urllib3), jusqu'à
+  max_bytes octets décompressés : un fichier énorme ou un flux sans fin est coupé net.
+- Refus signalé par ResponseRejected (sous-classe de requests.RequestException : les appelants
+  qui attrapent déjà les erreurs requests n'ont rien à changer).
+"""
+import os
+from typing import Optional, Tuple
+
+import requests
+
+FETCH_MAX_BYTES = int(float(os.environ.get("HOTARU_FETCH_MAX_MB", "10")) * 1024 * 1024)
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024   # limite du protocole sitemaps (50 Mo décompressés)
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseRejected(requests.RequestException):
+    """Réponse écartée avant ou pendant la lecture du corps (reason : "content_type" ou "too_large")."""
+
+    def __init__(self, url: str, reason: str, detail: str = "", status: Optional[int] = None):
+        self.url = url
+        self.reason = reason
+        self.detail = detail
+        self.status = status
+        label = "contenu non HTML" if reason == "content_type" else "réponse trop volumineuse"
+        super().__init__(f"{label} ({detail}) : {url}" if detail else f"{label} : {url}")
+
+
+def accepted_content_type(value: Optional[str], accept: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES) -> bool:
+    """True si le Content-Type est attendu ; en-tête absent = accepté (le corps tranchera)."""
+    if not accept or not value:
+        return True
+    mime = value.split(";", 1)[0].strip().lower()
+    return not mime or mime in accept
+
+
+def check_headers(resp, max_bytes: int = FETCH_MAX_BYTES, accept: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES):
+    """Lève ResponseRejected si les en-têtes annoncent un type refusé ou un corps au-delà de max_bytes (2xx)."""
+    if not 200 <= resp.status_code < 300:
+        return
+    url = getattr(resp, "url", "") or ""
+    content_type = resp.headers.get("Content-Type")
+    if not accepted_content_type(content_type, accept):
+        raise ResponseRejected(url, "content_type", content_type.split(";", 1)[0].strip(), resp.status_code)
+    try:
+        length = int(resp.headers.get("Content-Length") or 0)
+    except ValueError:
+        length = 0
+    if max_bytes and length > max_bytes:
+        raise ResponseRejected(url, "too_large", f"{length} octets annoncés", resp.status_code)
+
+
+def read_bounded(resp, max_bytes: int = FETCH_MAX_BYTES) -> bytes:
+    """Lit le corps d'une réponse stream=True (décompressé) ; au-delà de max_bytes, coupe et lève ResponseRejected."""
+    chunks, total = [], 0
+    for chunk in resp.iter_content(_CHUNK_SIZE):
+        total += len(chunk)
+        if max_bytes and total > max_bytes:
+            raise ResponseRejected(getattr(resp, "url", "") or "", "too_large", f"> {max_bytes} octets", resp.status_code)
+        chunks.append(chunk)
+    resp._content = b"".join(chunks)
+    resp._content_consumed = True
+    return resp._content
+
+
+def bounded_get(
+    session,
+    url: str,
+    max_bytes: int = FETCH_MAX_BYTES,
+    accept: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES,
+    **kwargs,
+) -> requests.Response:
+    """
+    session.get borné : en-têtes vérifiés avant le corps, corps limité à max_bytes.
+    accept=None : pas de filtre de type (sitemaps, API). La réponse retournée s'utilise comme
+    une réponse requests ordinaire (.content, .text) ; connexion rendue au pool dans tous les cas.
+    """
+    kwargs["stream"] = True
+    resp = session.get(url, **kwargs)
+    try:
+        check_headers(resp, max_bytes, accept)
+        read_bounded(resp, max_bytes)
+    except Exception:
+        resp.close()
+        raise
+    return resp
+
+
+__all__ = [
+    "ResponseRejected",
+    "accepted_content_type",
+    "bounded_get",
+    "check_headers",
+    "read_bounded",
+    "FETCH_MAX_BYTES",
+    "HTML_CONTENT_TYPES",
+    "SITEMAP_MAX_BYTES",
+]
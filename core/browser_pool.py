@@ -0,0 +1,381 @@
+"""
+Navigateurs Playwright (Crawl4AI) gardés chauds pour tout le processus : crawls V2, crawl hybride
+et fetch_page (Eco-Score, Master JSON-LD, ...) ne démarrent plus un Chromium à chaque appel.
+- Une boucle asyncio dédiée (thread "hotaru-browser-pool") possède les navigateurs ; les appelants,
+  depuis n'importe quel thread ou boucle, y envoient leurs arun (run_coroutine_threadsafe).
+- Navigateurs partagés par configuration (type, headless, proxy) : au plus BROWSER_POOL_SIZE par
+  configuration, BROWSER_PAGES_PER_BROWSER pages simultanées chacun. Chaque arun ouvre sa propre
+  page, isolée des autres requêtes, fermée après usage.
+- Recyclage : un navigateur qui a servi BROWSER_MAX_USES pages, qui a levé une erreur, ou qui rend
+  une page quand la mémoire du système dépasse BROWSER_MEMORY_LIMIT % (/proc/meminfo) ne reçoit plus
+  de nouvelle page ; il est fermé dès ses pages en cours terminées (contextes et mémoire libérés)
+  et remplacé à la demande.
+- Navigateur inutilisé depuis BROWSER_IDLE_SECONDS : fermé.
+HOTARU_BROWSER_POOL=0 : pool désactivé (un navigateur par crawl / par fetch_page, comme avant).
+"""
+import asyncio
+import atexit
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.resource_blocking import install_resource_blocking
+
+BROWSER_POOL_SIZE = int(os.environ.get("HOTARU_BROWSER_POOL", "4"))
+BROWSER_MAX_USES = int(os.environ.get("HOTARU_BROWSER_MAX_USES", "500"))
+BROWSER_MEMORY_LIMIT = float(os.environ.get("HOTARU_BROWSER_MEMORY_PCT", "90"))
+BROWSER_PAGES_PER_BROWSER = 25
+BROWSER_IDLE_SECONDS = 300
+BROWSER_START_TIMEOUT = 120      # secondes pour lancer Chromium
+_MEMORY_CHECK_INTERVAL = 5.0     # secondes entre deux lectures de /proc/meminfo
+_REAPER_INTERVAL = 30.0
+_pool: Optional["BrowserPool"] = None
+_pool_lock = threading.Lock()
+
+
+def memory_used_percent() -> Optional[float]:
+    """Mémoire du système utilisée (%) d'après /proc/meminfo (MemAvailable) ; None hors Linux."""
+    try:
+        info = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                info[key] = int(value.split()[0])
+        return 100.0 * (1 - info["MemAvailable"] / info["MemTotal"])
+    except (OSError, KeyError, ValueError, IndexError, ZeroDivisionError):
+        return None
+
+
+def _proxy_server(proxy) -> str:
+    if not proxy:
+        return ""
+    if isinstance(proxy, dict):
+        return str(proxy.get("server", ""))
+    return str(getattr(proxy, "server", proxy))
+
+
+def browser_key(config) -> Tuple[str, bool, str]:
+    """Clé de partage : deux configurations donnent des navigateurs interchangeables si même type, headless et proxy."""
+    if config is None:
+        return ("chromium", True, "")
+    proxy = getattr(config, "proxy_config", None) or getattr(config, "proxy", None)
+    return (
+        getattr(config, "browser_type", None) or "chromium",
+        bool(getattr(config, "headless", True)),
+        _proxy_server(proxy),
+    )
+
+
+class _Browser:
+    """Un AsyncWebCrawler du pool (manipulé uniquement dans la boucle du pool)."""
+
+    def __init__(self, key: Tuple):
+        self.key = key
+        self.crawler = None
+        self.error: Optional[BaseException] = None
+        self.ready = asyncio.Event()
+        self.active = 0              # pages en cours (réservées)
+        self.uses = 0                # pages servies
+        self.retiring = False
+        self.started_at = time.time()
+        self.last_used = time.monotonic()
+
+
+class PooledCrawler:
+    """
+    Remplaçant d'AsyncWebCrawler pour un crawl : `async with pool.crawler(cfg) as crawler`,
+    puis crawler.arun(...) comme d'habitude. Aucun navigateur n'est lancé ni fermé par le crawl.
+    """
+
+    def __init__(self, pool: "BrowserPool", browser_config=None):
+        self.pool = pool
+        self.browser_config = browser_config
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def arun(self, url: str, config=None, **kwargs):
+        return await self.pool.arun(url, config=config, browser_config=self.browser_config, **kwargs)
+
+
+class BrowserPool:
+    """
+    Navigateurs Crawl4AI chauds, partagés par les threads et boucles du processus. Thread-safe.
+
+    Usage :
+        pool = get_browser_pool()                          # None si HOTARU_BROWSER_POOL=0
+        result = await pool.arun(url, config=run_config)   # depuis n'importe quelle boucle
+        result = pool.run(url, config=run_config)          # depuis un thread (bloquant)
+        async with pool.crawler(browser_config) as crawler: ...
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_MAX_USES,
+        pages_per_browser: int = BROWSER_PAGES_PER_BROWSER,
+        idle_seconds: float = BROWSER_IDLE_SECONDS,
+        memory_limit: float = BROWSER_MEMORY_LIMIT,
+    ):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.pages_per_browser = max(1, pages_per_browser)
+        self.idle_seconds = idle_seconds
+        self.memory_limit = memory_limit
+        self.stats = {
+            "started": 0,
+            "start_seconds": 0.0,
+            "pages": 0,
+            "errors": 0,
+            "recycled_uses": 0,
+            "recycled_memory": 0,
+            "recycled_error": 0,
+            "closed_idle": 0,
+        }
+        self._browsers: Dict[Tuple, List[_Browser]] = {}
+        self._changed: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._reaper_future = None
+        self._lock = threading.Lock()
+        self._memory_checked = 0.0
+
+    # ── Boucle du pool ─────────────────────────────────────────────────────────
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="hotaru-browser-pool", daemon=True)
+                self._thread.start()
+                self._reaper_future = asyncio.run_coroutine_threadsafe(self._reaper(), self._loop)
+            return self._loop
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def _acquire(self, browser_config) -> _Browser:
+        """Réserve une page sur un navigateur de la configuration (démarré si besoin), attend s'ils sont tous pleins."""
+        key = browser_key(browser_config)
+        changed = self._condition()
+        async with changed:
+            while True:
+                browsers = self._browsers.setdefault(key, [])
+                live = [b for b in browsers if not b.retiring]
+                free = [b for b in live if b.active < self.pages_per_browser]
+                if free:
+                    browser = min(free, key=lambda b: b.active)
+                    break
+                if len(live) < self.size:
+                    browser = _Browser(key)
+                    browsers.append(browser)
+                    asyncio.get_running_loop().create_task(self._start(browser, browser_config))
+                    break
+                await changed.wait()
+            browser.active += 1
+        await browser.ready.wait()
+        if browser.crawler is None:
+            async with changed:
+                browser.active -= 1
+                changed.notify_all()
+            raise browser.error or RuntimeError("navigateur indisponible")
+        return browser
+
+    async def _start(self, browser: _Browser, browser_config):
+        from crawl4ai import AsyncWebCrawler
+
+        start = time.perf_counter()
+        try:
+            crawler = AsyncWebCrawler(config=browser_config) if browser_config is not None else AsyncWebCrawler()
+            install_resource_blocking(crawler)  # profil porté par chaque arun (shared_data)
+            await asyncio.wait_for(crawler.start(), BROWSER_START_TIMEOUT)
+            browser.crawler = crawler
+            self.stats["started"] += 1
+            self.stats["start_seconds"] = round(self.stats["start_seconds"] + time.perf_counter() - start, 3)
+        except Exception as e:
+            browser.error = e
+            changed = self._condition()
+            async with changed:
+                self._forget(browser)
+                changed.notify_all()
+        finally:
+            browser.ready.set()
+
+    def _forget(self, browser: _Browser):
+        browsers = self._browsers.get(browser.key, [])
+        if browser in browsers:
+            browsers.remove(browser)
+
+    def _memory_pressure(self) -> bool:
+        """True au plus une fois par _MEMORY_CHECK_INTERVAL si la mémoire utilisée dépasse memory_limit."""
+        now = time.monotonic()
+        if now - self._memory_checked < _MEMORY_CHECK_INTERVAL:
+            return False
+        self._memory_checked = now
+        used = memory_used_percent()
+        return used is not None and used >= self.memory_limit
+
+    def _retire(self, browser: _Browser, reason: str):
+        if not browser.retiring:
+            browser.retiring = True
+            self.stats[f"recycled_{reason}"] += 1
+
+    async def _release(self, browser: _Browser, used: bool = True, failed: bool = False):
+        changed = self._condition()
+        async with changed:
+            browser.active -= 1
+            browser.last_used = time.monotonic()
+            if used:
+                browser.uses += 1
+                self.stats["pages"] += 1
+            if failed:
+                self.stats["errors"] += 1
+                self._retire(browser, "error")
+            elif browser.uses >= self.max_uses:
+                self._retire(browser, "uses")
+            elif used and self._memory_pressure():
+                self._retire(browser, "memory")
+            close = browser.retiring and browser.active == 0
+            if close:
+                self._forget(browser)
+            changed.notify_all()
+        if close:
+            await self._close(browser)
+
+    async def _close(self, browser: _Browser):
+        crawler, browser.crawler = browser.crawler, None
+        if crawler is not None:
+            try:
+                await crawler.close()
+            except Exception:
+                pass  # navigateur déjà mort
+
+    async def _run(self, url: str, config, browser_config, kwargs):
+        browser = await self._acquire(browser_config)
+        failed = False
+        try:
+            return await browser.crawler.arun(url=url, config=config, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            await asyncio.shield(self._release(browser, failed=failed))
+
+    async def _warm(self, browser_config):
+        browser = await self._acquire(browser_config)
+        await self._release(browser, used=False)
+
+    async def _reaper(self):
+        """Ferme les navigateurs inutilisés depuis idle_seconds."""
+        while True:
+            await asyncio.sleep(_REAPER_INTERVAL)
+            idle = []
+            changed = self._condition()
+            async with changed:
+                now = time.monotonic()
+                for browsers in self._browsers.values():
+                    for browser in list(browsers):
+                        if browser.active == 0 and browser.crawler is not None and now - browser.last_used > self.idle_seconds:
+                            browsers.remove(browser)
+                            idle.append(browser)
+                self.stats["closed_idle"] += len(idle)
+            for browser in idle:
+                await self._close(browser)
+
+    async def _close_all(self):
+        changed = self._condition()
+        async with changed:
+            browsers = [b for group in self._browsers.values() for b in group]
+            self._browsers.clear()
+        for browser in browsers:
+            await self._close(browser)
+
+    # ── API (tout thread, toute boucle) ────────────────────────────────────────
+
+    async def arun(self, url: str, config=None, browser_config=None, **kwargs):
+        """crawler.arun sur un navigateur chaud ; annuler l'appel annule la page dans le pool."""
+        future = self._submit(self._run(url, config, browser_config, kwargs))
+        return await asyncio.wrap_future(future)
+
+    def run(self, url: str, config=None, browser_config=None, timeout: Optional[float] = None, **kwargs):
+        """arun bloquant (threads de crawl, code synchrone) ; TimeoutError : la page est abandonnée."""
+        future = self._submit(self._run(url, config, browser_config, kwargs))
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def crawler(self, browser_config=None) -> PooledCrawler:
+        return PooledCrawler(self, browser_config)
+
+    def warm(self, browser_config=None, timeout: float = BROWSER_START_TIMEOUT):
+        """Démarre un navigateur de la configuration s'il n'y en a pas (lève si Playwright est indisponible)."""
+        self._submit(self._warm(browser_config)).result(timeout)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compteurs et navigateurs ouverts (pages en cours, pages servies) : à copier dans les stats d'un crawl."""
+        browsers = [b for group in list(self._browsers.values()) for b in list(group)]
+        return {
+            **self.stats,
+            "open": len(browsers),
+            "browsers": [
+                {"key": "/".join(str(part) for part in b.key if part != ""), "active": b.active,
+                 "uses": b.uses, "retiring": b.retiring}
+                for b in browsers
+            ],
+        }
+
+    def shutdown(self, timeout: float = 30):
+        """Ferme tous les navigateurs et arrête la boucle du pool (réutilisable ensuite : redémarrage à la demande)."""
+        with self._lock:
+            loop, thread, reaper = self._loop, self._thread, self._reaper_future
+            self._loop = self._thread = self._reaper_future = None
+        if loop is None:
+            return
+        reaper.cancel()
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        if not thread.is_alive():
+            loop.close()
+        self._changed = None
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """Pool du processus (créé au premier appel) ; None si HOTARU_BROWSER_POOL=0."""
+    global _pool
+    if BROWSER_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+__all__ = [
+    "BrowserPool",
+    "PooledCrawler",
+    "browser_key",
+    "get_browser_pool",
+    "memory_used_percent",
+    "BROWSER_MAX_USES",
+    "BROWSER_MEMORY_LIMIT",
+    "BROWSER_PAGES_PER_BROWSER",
+    "BROWSER_POOL_SIZE",
+]
@@ -0,0 +1,285 @@
+"""
+Points de reprise des crawls longs (V1, hybride, V2).
+- Périodiquement (toutes les N pages ou T secondes) : frontier, visited, stats et pages
+  terminées sont écrits dans un fichier SQLite local, en une seule transaction.
+- Après un crash (rerun Streamlit, navigateur tombé, conteneur recyclé), `resume(checkpoint)`
+  recharge cet état : le crawl repart du frontier sauvegardé au lieu de tout recrawler.
+- Les pages sont ajoutées au fil de l'eau (jamais réécrites) ; au pire les N dernières pages
+  sont refaites. Le HTML complet des pages (blob compressé, core/page_store.py) est copié avec
+  elles : resume() le remet dans le store, même après un redémarrage du processus. Toute erreur disque dégrade en crawl sans reprise, jamais en échec de crawl.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from core.frontier import dump_visited
+from core.page_store import PageStore, get_page_store
+
+CHECKPOINT_DIR = os.environ.get("HOTARU_CHECKPOINT_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "hotaru", "checkpoints"
+)
+CHECKPOINT_EVERY = 25        # pages entre deux points de reprise
+CHECKPOINT_INTERVAL = 30.0   # secondes max entre deux points de reprise
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failed (
+    url TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS html_blobs (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+
+def checkpoint_path(
+    engine: str,
+    start_urls: Iterable[str],
+    max_urls: int,
+    owner: Optional[str] = None,
+    options: Optional[Dict] = None,
+) -> str:
+    """
+    Fichier de reprise d'un crawl : même propriétaire (utilisateur ou session), même moteur, mêmes URLs
+    de départ, même budget et mêmes options de crawl (frontier, sitemaps, robots, exclusions, rendu…)
+    → même fichier. Deux utilisateurs, ou un crawl relancé avec d'autres options, ne partagent rien.
+    """
+    key = json.dumps(
+        [owner or "", engine, list(start_urls), int(max_urls), options or {}],
+        sort_keys=True, default=str,
+    )
+    return os.path.join(CHECKPOINT_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".sqlite3")
+
+
+class CrawlCheckpoint:
+    """
+    Point de reprise d'un crawl (un fichier SQLite).
+
+    Usage (côté scraper) :
+        ckpt.add_page(page)                          # à chaque page retenue
+        ckpt.add_failed(url)                         # URL tentée sans page
+        if ckpt.due():
+            ckpt.save(frontier, visited, stats)      # pages en attente + état, atomique
+        state = ckpt.load()                          # à la reprise (None si rien à reprendre)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        every: int = CHECKPOINT_EVERY,
+        interval: float = CHECKPOINT_INTERVAL,
+        page_store: Optional[PageStore] = None,
+    ):
+        self.path = path
+        self.every = every
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending_pages: List[Dict] = []
+        self._pending_failed: List[str] = []
+        self._pending_blobs: List[Tuple[str, bytes]] = []
+        self._page_store = page_store
+        self._last_save = time.time()
+        self.stats = {"saves": 0, "pages_saved": 0, "errors": 0}
+        # Connexion ouverte à la première écriture ou lecture : sonder resumable() ne crée aucun fichier
+        self._db = None
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                self._db.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error):
+                self.stats["errors"] += 1
+                self._db = None
+                self._disabled = True
+        return self._db
+
+    @classmethod
+    def coerce(cls, checkpoint: Union["CrawlCheckpoint", str, None]) -> Optional["CrawlCheckpoint"]:
+        """Accepte un CrawlCheckpoint, un chemin de fichier ou None."""
+        if checkpoint is None or isinstance(checkpoint, CrawlCheckpoint):
+            return checkpoint
+        return cls(str(checkpoint))
+
+    @property
+    def enabled(self) -> bool:
+        return self._connect() is not None
+
+    # ── Écriture ─────────────────────────────────────────────────────────────
+
+    def add_page(self, page: Dict):
+        # Copie du blob HTML tant qu'il est dans le store (juste rangé par le crawl)
+        key = page.get("html_ref")
+        store = self._page_store if self._page_store is not None else get_page_store()
+        blob = store.get_blob(key) if key and store is not None else None
+        with self._lock:
+            self._pending_pages.append(page)
+            if blob is not None:
+                self._pending_blobs.append((key, blob))
+
+    def add_failed(self, url: str):
+        with self._lock:
+            self._pending_failed.append(url)
+
+    def due(self) -> bool:
+        """True si un point de reprise doit être écrit (N pages ou T secondes depuis le dernier)."""
+        with self._lock:
+            pending = len(self._pending_pages) + len(self._pending_failed)
+        return self.enabled and pending > 0 and (
+            pending >= self.every or time.time() - self._last_save >= self.interval
+        )
+
+    def save(self, frontier: Iterable[str], visited, stats: Dict, done: bool = False):
+        """Écrit pages en attente + frontier + visited + stats dans une seule transaction."""
+        if not self.enabled:
+            return
+        with self._lock:
+            pages, self._pending_pages = self._pending_pages, []
+            failed, self._pending_failed = self._pending_failed, []
+            blobs, self._pending_blobs = self._pending_blobs, []
+            try:
+                rows = [
+                    (p.get("url", ""), zlib.compress(json.dumps(p, ensure_ascii=False, default=str).encode("utf-8"), 6))
+                    for p in pages
+                ]
+                state = {
+                    "frontier": json.dumps(list(frontier)),
+                    "visited": json.dumps(dump_visited(visited)),
+                    "stats": json.dumps(stats, default=str),
+                    "done": json.dumps(bool(done)),
+                    "saved_at": json.dumps(time.time()),
+                }
+                with self._db:
+                    self._db.executemany("INSERT INTO pages (url, data) VALUES (?, ?)", rows)
+                    self._db.executemany("INSERT OR IGNORE INTO html_blobs VALUES (?, ?)", blobs)
+                    self._db.executemany("INSERT OR IGNORE INTO failed VALUES (?)", [(u,) for u in failed])
+                    self._db.executemany("INSERT OR REPLACE INTO state VALUES (?, ?)", state.items())
+                self.stats["saves"] += 1
+                self.stats["pages_saved"] += len(rows)
+            except (sqlite3.Error, TypeError, ValueError):
+                self.stats["errors"] += 1
+                # Pages remises en attente : le prochain point de reprise les réessaiera
+                self._pending_pages[:0] = pages
+                self._pending_failed[:0] = failed
+                self._pending_blobs[:0] = blobs
+            self._last_save = time.time()
+
+    def reset(self):
+        """Vide le point de reprise (nouveau crawl depuis le début)."""
+        with self._lock:
+            self._pending_pages, self._pending_failed, self._pending_blobs = [], [], []
+            if self._connect() is None:
+                return
+            try:
+                with self._db:
+                    for table in ("state", "pages", "failed", "html_blobs"):
+                        self._db.execute(f"DELETE FROM {table}")
+            except sqlite3.Error:
+                self.stats["errors"] += 1
+
+    def close(self):
+        """Ferme la connexion SQLite (rouverte à la prochaine écriture ou lecture)."""
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._db.close()
+                except sqlite3.Error:
+                    pass
+                self._db = None
+
+    def discard(self):
+        """Supprime le point de reprise (crawl terminé et exploité)."""
+        self.close()
+        with self._lock:
+            self._pending_pages, self._pending_failed, self._pending_blobs = [], [], []
+            self._disabled = True
+            for suffix in ("", "-journal", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+
+    # ── Lecture ──────────────────────────────────────────────────────────────
+
+    def load(self) -> Optional[Dict]:
+        """
+        État sauvegardé : {"frontier": [url], "visited": (cf. core.frontier.load_visited), "stats": {}, "pages": [page],
+        "failed": [url], "html_blobs": [(html_ref, blob)], "done": bool, "saved_at": float},
+        ou None si aucun point de reprise.
+        """
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                state = {k: json.loads(v) for k, v in self._db.execute("SELECT key, value FROM state")}
+                if "frontier" not in state:
+                    return None
+                state["pages"] = [
+                    json.loads(zlib.decompress(row[0]).decode("utf-8"))
+                    for row in self._db.execute("SELECT data FROM pages ORDER BY seq")
+                ]
+                state["failed"] = [row[0] for row in self._db.execute("SELECT url FROM failed")]
+                state["html_blobs"] = [(row[0], bytes(row[1])) for row in self._db.execute("SELECT key, data FROM html_blobs")]
+            return state
+        except (sqlite3.Error, zlib.error, ValueError):
+            self.stats["errors"] += 1
+            return None
+
+    def restore_html(self, state: Dict, scope: Optional[str] = None) -> int:
+        """Remet les blobs HTML d'un état chargé (load) dans le store, sous `scope` ; retourne leur nombre."""
+        store = self._page_store if self._page_store is not None else get_page_store()
+        if store is None:
+            return 0
+        blobs = state.get("html_blobs") or []
+        for key, blob in blobs:
+            store.put_blob(key, blob, scope=scope)
+        return len(blobs)
+
+    def resumable(self) -> bool:
+        """
+        True si un crawl interrompu (non terminé) peut être repris. Ne lit que les clés frontier et done
+        de la table state (ni pages ni HTML), sans créer le fichier ni garder de connexion ouverte.
+        """
+        if self._db is None and (self._disabled or not os.path.exists(self.path)):
+            return False
+        query = "SELECT key, value FROM state WHERE key IN ('frontier', 'done')"
+        try:
+            with self._lock:
+                if self._db is not None:
+                    rows = self._db.execute(query).fetchall()
+                else:
+                    db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+                    try:
+                        rows = db.execute(query).fetchall()
+                    finally:
+                        db.close()
+        except sqlite3.Error:
+            self.stats["errors"] += 1
+            return False
+        state = dict(rows)
+        return "frontier" in state and not json.loads(state.get("done", "false"))
+
+
+__all__ = [
+    "CrawlCheckpoint",
+    "checkpoint_path",
+    "CHECKPOINT_DIR",
+    "CHECKPOINT_EVERY",
+    "CHECKPOINT_INTERVAL",
+]
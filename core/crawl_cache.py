@@ -0,0 +1,320 @@
+"""
+Cache disque des pages rendues par le crawl V2 (Crawl4AI), partagé entre sessions Streamlit.
+Un re-crawl de mise au point, un changement d'onglet ou un second audit du même site ne
+refont pas le rendu navigateur des pages encore fraîches.
+- Par URL : HTML rendu, liens internes Crawl4AI, markdown, résultat JS, en-têtes et statut
+  (entrées de core/page_record.py), compressés (zlib) dans un seul fichier SQLite.
+- Emplacement : HOTARU_CRAWL_CACHE_DIR (défaut ~/.cache/hotaru/crawl) ou CrawlCache(directory=...).
+- Durée de validité : CRAWL_CACHE_TTL_HOURS (HOTARU_CRAWL_CACHE_TTL_H), réglable par domaine
+  (set_domain_ttl, gardé dans le fichier : vaut pour toutes les sessions ; 0 = domaine jamais mis
+  en cache). Vérifiée à la lecture : changer un TTL vaut aussi pour les entrées déjà stockées.
+- Taille bornée (HOTARU_CRAWL_CACHE_MB) : éviction des entrées les moins récemment utilisées.
+- purge_domain(domaine) : entrées d'un site supprimées (action du backoffice).
+Remplace le cache interne de Crawl4AI (CacheMode.ENABLED : ni emplacement, ni durée, ni plafond) ;
+le crawl V2 rend en CacheMode.BYPASS. Toute erreur du cache dégrade en rendu normal.
+HOTARU_CRAWL_CACHE=0 : cache désactivé (cache interne de Crawl4AI, comme avant).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+CRAWL_CACHE_DIR = os.environ.get("HOTARU_CRAWL_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "hotaru", "crawl"
+)
+CRAWL_CACHE_MAX_BYTES = int(float(os.environ.get("HOTARU_CRAWL_CACHE_MB", "500")) * 1024 * 1024)
+CRAWL_CACHE_TTL_HOURS = float(os.environ.get("HOTARU_CRAWL_CACHE_TTL_H", "24"))
+EVICT_TARGET_RATIO = 0.9    # après dépassement, on redescend à 90 % du plafond
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    domain TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_domain ON entries (domain);
+CREATE TABLE IF NOT EXISTS domain_ttl (
+    domain TEXT PRIMARY KEY,
+    hours REAL NOT NULL
+);
+"""
+
+
+def cache_domain(url_or_host: str) -> str:
+    """Domaine d'une URL (ou d'un host saisi) pour le cache : minuscules, sans port ni www."""
+    value = (url_or_host or "").strip().lower()
+    host = urlparse(value).netloc if "://" in value else value.split("/")[0]
+    host = host.split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def _links_of(crawl_result):
+    links = getattr(crawl_result, "links", None) or {}
+    internal = links.get("internal", []) if isinstance(links, dict) else []
+    return [link.get("href", "") if isinstance(link, dict) else str(link) for link in internal or []]
+
+
+class CrawlCache:
+    """
+    Pages rendues du crawl V2, thread-safe.
+
+    Usage :
+        cache = get_crawl_cache()                 # None si HOTARU_CRAWL_CACHE=0 ou disque indisponible
+        cr = cache.lookup(url)                    # résultat façon CrawlResult, None si absent ou expiré
+        cache.store(url, crawl_result)            # après un rendu réussi
+        cache.set_domain_ttl("example.com", 2)    # heures ; None : durée par défaut
+        cache.purge_domain("example.com")
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = CRAWL_CACHE_MAX_BYTES,
+        ttl_hours: float = CRAWL_CACHE_TTL_HOURS,
+    ):
+        self.directory = directory or CRAWL_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.ttl_hours = ttl_hours
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0, "purged": 0, "errors": 0}
+        os.makedirs(self.directory, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(self.directory, "crawl_cache.sqlite3"), timeout=30, check_same_thread=False
+        )
+        self._db.executescript(_SCHEMA)
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self._ttls: Dict[str, float] = dict(self._db.execute("SELECT domain, hours FROM domain_ttl").fetchall())
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    # ── Durées de validité ───────────────────────────────────────────────────
+
+    def ttl_for(self, url_or_domain: str) -> float:
+        """TTL (heures) d'une URL : domaine réglé le plus proche (sous-domaines compris), sinon défaut."""
+        domain = cache_domain(url_or_domain)
+        while domain:
+            if domain in self._ttls:
+                return self._ttls[domain]
+            domain = domain.partition(".")[2]
+        return self.ttl_hours
+
+    def set_domain_ttl(self, domain: str, hours: Optional[float]):
+        """TTL (heures) d'un domaine et de ses sous-domaines ; None : retour à la durée par défaut."""
+        domain = cache_domain(domain)
+        if not domain:
+            raise ValueError("Domaine vide")
+        with self._lock:
+            if hours is None:
+                self._db.execute("DELETE FROM domain_ttl WHERE domain = ?", (domain,))
+                self._ttls.pop(domain, None)
+            else:
+                hours = max(0.0, float(hours))
+                self._db.execute("INSERT OR REPLACE INTO domain_ttl VALUES (?, ?)", (domain, hours))
+                self._ttls[domain] = hours
+            self._db.commit()
+
+    def domain_ttls(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._ttls)
+
+    # ── Entrées ──────────────────────────────────────────────────────────────
+
+    def lookup(self, url: str):
+        """
+        Résultat stocké sous forme de CrawlResult minimal (html, links, markdown, js_execution_result,
+        response_headers, status_code, success, from_cache) ; None si absent, expiré ou illisible.
+        """
+        ttl = self.ttl_for(url)
+        try:
+            with self._lock:
+                row = self._db.execute("SELECT data, stored FROM entries WHERE url = ?", (url,)).fetchone()
+                if row is not None and time.time() - row[1] > ttl * 3600:
+                    self._delete(url)
+                    self.stats["expired"] += 1
+                    row = None
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                self._db.execute("UPDATE entries SET accessed = ? WHERE url = ?", (time.time(), url))
+                self._db.commit()
+                self.stats["hits"] += 1
+            data = json.loads(zlib.decompress(row[0]))
+        except (sqlite3.Error, zlib.error, ValueError):
+            self._count("errors")
+            return None
+        return SimpleNamespace(
+            url=url,
+            html=data["html"],
+            links={"internal": [{"href": href} for href in data["links"]]},
+            markdown=SimpleNamespace(raw_markdown=data["markdown"], fit_markdown=data["fit_markdown"]),
+            js_execution_result=data["js_result"],
+            response_headers=data["headers"],
+            status_code=data["status_code"],
+            success=True,
+            error_message="",
+            from_cache=True,
+            cached_at=row[1],
+        )
+
+    def store(self, url: str, crawl_result) -> bool:
+        """Stocke un rendu réussi hors erreur HTTP (TTL du domaine > 0) ; False si non stocké."""
+        status = getattr(crawl_result, "status_code", None)
+        if not getattr(crawl_result, "success", False) or (status or 0) >= 400 or self.ttl_for(url) <= 0:
+            return False
+        markdown = getattr(crawl_result, "markdown", None)
+        headers = getattr(crawl_result, "response_headers", None) or {}
+        lowered = {str(name).lower(): value for name, value in headers.items()}
+        try:
+            data = json.dumps({
+                "html": crawl_result.html or "",
+                "links": [href for href in _links_of(crawl_result) if href],
+                "markdown": getattr(markdown, "raw_markdown", markdown if isinstance(markdown, str) else "") or "",
+                "fit_markdown": getattr(markdown, "fit_markdown", "") or "",
+                "js_result": getattr(crawl_result, "js_execution_result", None),
+                "headers": {name: lowered[name.lower()] for name in _KEPT_HEADERS if lowered.get(name.lower())},
+                "status_code": getattr(crawl_result, "status_code", None),
+            }, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            self._count("errors")
+            return False
+        blob = zlib.compress(data.encode("utf-8"), 6)
+        size = len(blob)
+        if size > self.max_bytes:
+            return False
+        now = time.time()
+        try:
+            with self._lock:
+                previous = self._db.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, cache_domain(url), blob, size, now, now),
+                )
+                self._db.commit()
+                self._total += size - (previous[0] if previous else 0)
+                self.stats["stored"] += 1
+                if self._total > self.max_bytes:
+                    self._evict()
+            return True
+        except sqlite3.Error:
+            self._count("errors")
+            return False
+
+    def _delete(self, url: str):
+        """Supprime une entrée (appelé sous self._lock)."""
+        row = self._db.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+            self._total -= row[0]
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées (appelé sous self._lock)."""
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        rows = self._db.execute("SELECT url, size FROM entries ORDER BY accessed").fetchall()
+        evicted = []
+        for url, size in rows:
+            if self._total <= target:
+                break
+            evicted.append((url,))
+            self._total -= size
+        self._db.executemany("DELETE FROM entries WHERE url = ?", evicted)
+        self._db.commit()
+        self.stats["evicted"] += len(evicted)
+
+    def purge_domain(self, domain: str) -> int:
+        """Supprime les entrées d'un domaine et de ses sous-domaines ; retourne le nombre d'entrées supprimées."""
+        domain = cache_domain(domain)
+        if not domain:
+            return 0
+        where = "domain = ? OR domain LIKE ?"
+        params = (domain, "%." + domain)
+        with self._lock:
+            count, size = self._db.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE {where}", params
+            ).fetchone()
+            self._db.execute(f"DELETE FROM entries WHERE {where}", params)
+            self._db.commit()
+            self._total -= size
+            self.stats["purged"] += count
+        return count
+
+    def clear(self):
+        """Vide le cache (les TTL par domaine sont conservés)."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._total = 0
+
+    def domains(self) -> Dict[str, Dict]:
+        """Entrées par domaine : {domaine: {"pages", "bytes", "newest"}} (backoffice)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT domain, COUNT(*), SUM(size), MAX(stored) FROM entries GROUP BY domain ORDER BY domain"
+            ).fetchall()
+        return {domain: {"pages": pages, "bytes": size, "newest": newest} for domain, pages, size, newest in rows}
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total
+
+    def snapshot(self) -> Dict:
+        """Compteurs du processus, emplacement et taille : à copier dans les stats d'un crawl."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {
+                **self.stats,
+                "directory": self.directory,
+                "entries": entries,
+                "size_bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "ttl_hours": self.ttl_hours,
+            }
+
+
+_shared_cache: Optional[CrawlCache] = None
+_shared_failed = False
+_shared_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Cache partagé du processus (None si désactivé via HOTARU_CRAWL_CACHE=0 ou disque indisponible)."""
+    global _shared_cache, _shared_failed
+    if os.environ.get("HOTARU_CRAWL_CACHE", "1") == "0":
+        return None
+    with _shared_lock:
+        if _shared_cache is None and not _shared_failed:
+            try:
+                _shared_cache = CrawlCache()
+            except (OSError, sqlite3.Error):
+                _shared_failed = True
+        return _shared_cache
+
+
+def make_crawl_cache(cache) -> Optional[CrawlCache]:
+    """Paramètre cache du crawl V2 : True (cache partagé), False/None (pas de cache) ou CrawlCache dédié."""
+    if cache is True:
+        return get_crawl_cache()
+    return cache or None
+
+
+__all__ = [
+    "CrawlCache",
+    "cache_domain",
+    "get_crawl_cache",
+    "make_crawl_cache",
+    "CRAWL_CACHE_DIR",
+    "CRAWL_CACHE_MAX_BYTES",
+    "CRAWL_CACHE_TTL_HOURS",
+]
@@ -0,0 +1,217 @@
+"""
+Crawls V2 en arrière-plan (Streamlit) : chaque crawl tourne dans un thread dédié qui possède sa
+boucle asyncio et son navigateur Crawl4AI ; le script Streamlit n'attend plus la fin du crawl.
+- Progression et logs transmis par une file thread-safe (CrawlJob.poll), relue à chaque rerun.
+- pause() / unpause() : les workers ne prennent plus de nouvelle URL (pages en cours terminées).
+- cancel() : tâche du crawl annulée ; le point de reprise est écrit, le prochain lancement reprend.
+- Plusieurs crawls (sessions différentes) en parallèle, au plus CRAWL_RUNNER_MAX_JOBS à la fois
+  (au-delà, le job attend un créneau : état "pending").
+"""
+import asyncio
+import itertools
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+CRAWL_RUNNER_MAX_JOBS = int(os.environ.get("HOTARU_CRAWL_JOBS", "4"))
+JOB_STATES = ("pending", "running", "paused", "done", "cancelled", "error")
+_SLOT_POLL = 0.2                 # secondes entre deux essais d'un job en attente de créneau
+_slots = threading.BoundedSemaphore(max(1, CRAWL_RUNNER_MAX_JOBS))
+_jobs: Dict[str, "CrawlJob"] = {}
+_jobs_lock = threading.Lock()
+_ids = itertools.count(1)
+
+
+class CrawlJob:
+    """
+    Crawl V2 (HotaruScraperV2) exécuté dans son propre thread et sa propre boucle asyncio.
+
+    Usage :
+        job = start_crawl(scraper)                   # checkpoint=... : reprise d'un crawl interrompu
+        for kind, payload in job.poll():             # ("progress", (message, ratio)) | ("log", message)
+            ...
+        job.pause() ; job.unpause() ; job.cancel()
+        if job.finished and job.state == "done":
+            results, summary = job.result()
+    """
+
+    def __init__(self, scraper, checkpoint=None, job_id: Optional[str] = None):
+        self.id = job_id or f"crawl-{next(_ids)}"
+        self.scraper = scraper
+        self.checkpoint = checkpoint
+        self.state = "pending"
+        self.progress: Tuple[str, float] = ("En attente d'un créneau de crawl...", 0.0)
+        self.error: Optional[BaseException] = None
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+        self.context: Dict[str, Any] = {}   # données de l'appelant (paramètres d'audit, etc.)
+        self._events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self._result = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._gate: Optional[asyncio.Event] = None
+        self._paused = False
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"hotaru-{self.id}", daemon=True)
+
+    # ── Thread du crawl ────────────────────────────────────────────────────────
+
+    def start(self) -> "CrawlJob":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not _slots.acquire(timeout=_SLOT_POLL):
+            if self._cancelled.is_set():
+                self._end("cancelled")
+                return
+        try:
+            self.started_at = time.time()
+            asyncio.run(self._main())
+            self._end("done")
+        except asyncio.CancelledError:
+            self._end("cancelled")
+        except Exception as e:
+            self.error = e
+            self._events.put(("log", f"❌ {e}"))
+            self._end("error")
+        finally:
+            _slots.release()
+
+    async def _main(self):
+        with self._lock:
+            if self._cancelled.is_set():
+                raise asyncio.CancelledError
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.current_task()
+            self._gate = asyncio.Event()
+            if not self._paused:
+                self._gate.set()
+            self.state = "paused" if self._paused else "running"
+        self.scraper.pause_gate = self._gate
+        try:
+            if self.checkpoint is not None:
+                self._result = await self.scraper.resume_async(
+                    self.checkpoint, progress_callback=self._on_progress, log_callback=self._on_log
+                )
+            else:
+                self._result = await self.scraper.run_analysis_async(
+                    progress_callback=self._on_progress, log_callback=self._on_log
+                )
+        finally:
+            self.scraper.pause_gate = None
+
+    def _end(self, state: str):
+        with self._lock:
+            self.state = state
+            self.ended_at = time.time()
+            self._loop = self._task = self._gate = None
+        self._events.put(("state", state))
+        self._done.set()
+
+    def _on_progress(self, message: str, ratio: float):
+        self.progress = (message, ratio)
+        self._events.put(("progress", (message, ratio)))
+
+    def _on_log(self, message: str):
+        self._events.put(("log", message))
+
+    # ── Contrôle (thread Streamlit) ────────────────────────────────────────────
+
+    def _call_in_loop(self, callback):
+        """Planifie `callback` dans la boucle du crawl (sans effet si le crawl est terminé)."""
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            pass  # boucle déjà fermée
+
+    def pause(self):
+        """Suspend le crawl : plus de nouvelle URL, pages en cours terminées."""
+        self._set_paused(True)
+
+    def unpause(self):
+        self._set_paused(False)
+
+    def _set_paused(self, paused: bool):
+        with self._lock:
+            self._paused = paused
+            if self._gate is not None:
+                self._call_in_loop(self._gate.clear if paused else self._gate.set)
+                self.state = "paused" if paused else "running"
+
+    def cancel(self):
+        """Annule le crawl (point de reprise écrit par le scraper) ; un job en attente ne démarre pas."""
+        self._cancelled.set()
+        with self._lock:
+            if self._task is not None:
+                self._call_in_loop(self._task.cancel)
+
+    def poll(self, limit: int = 500) -> List[Tuple[str, Any]]:
+        """Événements reçus depuis le dernier appel (au plus `limit`), sans attendre."""
+        events = []
+        while len(events) < limit:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin du crawl ; True si terminé (quel que soit l'état final)."""
+        return self._done.wait(timeout)
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return self.state == "paused"
+
+    def result(self):
+        """(results, summary) du crawl terminé ; relève l'erreur du crawl s'il a échoué."""
+        if self.error is not None:
+            raise self.error
+        return self._result
+
+
+def start_crawl(scraper, checkpoint=None) -> CrawlJob:
+    """Lance un crawl V2 en arrière-plan et l'enregistre (get_job) ; retour immédiat."""
+    job = CrawlJob(scraper, checkpoint=checkpoint)
+    with _jobs_lock:
+        _jobs[job.id] = job
+    return job.start()
+
+
+def get_job(job_id: str) -> Optional[CrawlJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def forget_job(job_id: str):
+    """Retire un job terminé et exploité du registre."""
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
+
+
+def active_jobs() -> List[CrawlJob]:
+    """Jobs en attente ou en cours, toutes sessions confondues."""
+    with _jobs_lock:
+        return [job for job in _jobs.values() if not job.finished]
+
+
+__all__ = [
+    "CrawlJob",
+    "active_jobs",
+    "forget_job",
+    "get_job",
+    "start_crawl",
+    "CRAWL_RUNNER_MAX_JOBS",
+    "JOB_STATES",
+]
@@ -0,0 +1,112 @@
+"""
+Mémoire des stratégies de fetch par host (cascade V1 des sites protégés).
+- Retient la dernière méthode gagnante par host : les URL suivantes commencent par elle.
+- Circuit breaker par (host, méthode) : après N échecs consécutifs, la méthode est
+  sautée pendant un cooldown, puis réessayée (half-open) : le premier échec rouvre le breaker
+  aussitôt, un succès le referme.
+Thread-safe (crawl V1 concurrent).
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Ordre de la cascade historique (du plus léger au plus lourd)
+CASCADE_METHODS = ("requests", "requests_html", "selenium_headless", "selenium_nonheadless")
+BREAKER_THRESHOLD = 2        # échecs consécutifs avant ouverture
+BREAKER_COOLDOWN = 300.0     # secondes pendant lesquelles la méthode est sautée
+
+
+class _Breaker:
+    __slots__ = ("failures", "open_until", "timeouts")
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.timeouts = 0
+
+
+class FetchStrategyMemory:
+    """Méthode gagnante + circuit breakers, par host."""
+
+    def __init__(
+        self,
+        methods: Tuple[str, ...] = CASCADE_METHODS,
+        threshold: int = BREAKER_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+    ):
+        self.methods = tuple(methods)
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._winners: Dict[str, str] = {}
+        self._breakers: Dict[Tuple[str, str], _Breaker] = {}
+        self._lock = threading.Lock()
+        self.skipped = 0  # tentatives évitées (breaker ouvert)
+
+    def _breaker(self, host: str, method: str) -> _Breaker:
+        key = (host, method)
+        if key not in self._breakers:
+            self._breakers[key] = _Breaker()
+        return self._breakers[key]
+
+    def plan(self, host: str) -> List[str]:
+        """
+        Méthodes à essayer pour une URL de ce host, dans l'ordre :
+        la gagnante d'abord, puis le reste de la cascade ; breakers ouverts exclus.
+        Si tout est ouvert, la méthode dont le cooldown expire en premier est gardée.
+        """
+        now = time.time()
+        with self._lock:
+            winner = self._winners.get(host)
+            ordered = ([winner] if winner else []) + [m for m in self.methods if m != winner]
+            allowed = [m for m in ordered if self._breaker(host, m).open_until <= now]
+            self.skipped += len(ordered) - len(allowed)
+            if not allowed:
+                allowed = [min(ordered, key=lambda m: self._breaker(host, m).open_until)]
+            return allowed
+
+    def record_success(self, host: str, method: str):
+        with self._lock:
+            breaker = self._breaker(host, method)
+            breaker.failures = 0
+            breaker.open_until = 0.0
+            self._winners[host] = method
+
+    def record_failure(self, host: str, method: str, timeout: bool = False) -> bool:
+        """Enregistre un échec. Retourne True si le breaker vient de s'ouvrir."""
+        with self._lock:
+            breaker = self._breaker(host, method)
+            breaker.failures += 1
+            if timeout:
+                breaker.timeouts += 1
+            if self._winners.get(host) == method:
+                del self._winners[host]
+            # failures n'est pas remis à zéro : après le cooldown (half-open), un seul échec rouvre
+            if breaker.failures >= self.threshold:
+                breaker.open_until = time.time() + self.cooldown
+                return True
+            return False
+
+    def winner(self, host: str) -> Optional[str]:
+        with self._lock:
+            return self._winners.get(host)
+
+    def snapshot(self) -> Dict:
+        """État lisible pour stats/UI : gagnante et méthodes en cooldown par host."""
+        now = time.time()
+        with self._lock:
+            hosts = {h for h, _ in self._breakers} | set(self._winners)
+            return {
+                host: {
+                    "winner": self._winners.get(host),
+                    "open": sorted(
+                        m for (h, m), b in self._breakers.items() if h == host and b.open_until > now
+                    ),
+                    "timeouts": {
+                        m: b.timeouts for (h, m), b in self._breakers.items() if h == host and b.timeouts
+                    },
+                }
+                for host in sorted(hosts)
+            }
+
+
+__all__ = ["FetchStrategyMemory", "CASCADE_METHODS", "BREAKER_THRESHOLD", "BREAKER_COOLDOWN"]
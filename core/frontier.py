@@ -0,0 +1,571 @@
+"""
+Structures compactes du crawl pour les très gros sites (frontier + ensemble des URLs vues).
+- Frontier : file FIFO d'URLs, deque en mémoire puis débordement sur fichier temporaire
+  au-delà de `memory_limit` (plus de liens perdus à 5 000 URLs en file).
+- PriorityFrontier : file best-first qui maximise la couverture des templates d'URL dans le
+  budget max_urls (patterns déjà bien échantillonnés relégués, pages peu profondes et
+  prioritaires du sitemap d'abord).
+- FrontierQueue : l'une ou l'autre file derrière l'API asyncio.Queue (workers V2).
+- Ensemble « visited » :
+    "compact" (défaut) : empreintes 64 bits (blake2b) triées dans un array('Q'), ~9 octets/URL,
+                         collision négligeable (~3e-8 pour 1 million d'URLs) ;
+    "bloom"            : filtre de Bloom extensible, ~3,6 octets/URL à 0,1 % de faux positifs
+                         (un faux positif = une URL jamais crawlée) ;
+    "exact"            : set() de chaînes (comportement historique, ~160 octets/URL).
+- CanonicalIndex : URLs des pages retenues rattachées à leur clé canonique (rel=canonical) ;
+  une URL alternative d'une page déjà crawlée n'est ni re-téléchargée ni gardée.
+Mesures mémoire par million d'URLs : scripts/bench_frontier.py.
+"""
+import asyncio
+import base64
+import heapq
+import itertools
+import math
+import os
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from hashlib import blake2b
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from services.jsonld_service import get_url_path_pattern
+
+FRONTIER_MEMORY_URLS = 5000        # URLs gardées en mémoire dans la file (au-delà : disque)
+FRONTIER_MAX_URLS = 5_000_000      # plafond absolu de la file (mémoire + disque)
+FRONTIER_SPILL_BATCH = 1024        # écritures disque groupées
+COMPACT_BUFFER = 65536             # empreintes récentes en set() avant fusion dans le tableau trié
+BLOOM_FP_RATE = 0.001              # taux de faux positifs par défaut (filtre de Bloom)
+BLOOM_INITIAL_CAPACITY = 100_000   # URLs de la première couche (capacité doublée ensuite)
+VISITED_MODES = ("compact", "bloom", "exact")
+FRONTIER_MODES = ("bfs", "priority")
+# Score best-first (plus petit = crawlé d'abord)
+PRIORITY_TAKEN_WEIGHT = 1.0        # par page déjà crawlée du même pattern d'URL
+PRIORITY_DEPTH_WEIGHT = 0.5        # par segment de path
+PRIORITY_SITEMAP_WEIGHT = 2.0      # × <priority> du sitemap (0 à 1, 0.5 si absente)
+SITEMAP_DEFAULT_PRIORITY = 0.5
+
+
+def url_hash(url: str) -> int:
+    """Empreinte 64 bits d'une URL."""
+    return int.from_bytes(blake2b(url.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+
+# ── Frontier ─────────────────────────────────────────────────────────────────
+
+
+class Frontier:
+    """
+    File FIFO d'URLs : deque en mémoire, débordement sur un fichier temporaire.
+    L'ordre FIFO est conservé (tête en mémoire, suite sur disque, rechargée par blocs).
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str] = (),
+        memory_limit: int = FRONTIER_MEMORY_URLS,
+        max_size: int = FRONTIER_MAX_URLS,
+    ):
+        self.memory_limit = max(1, memory_limit)
+        self.max_size = max_size
+        self._mem: deque = deque()
+        self._spill = None            # fichier temporaire (supprimé à la fermeture)
+        self._pending: List[bytes] = []  # écritures disque en attente
+        self._read_pos = 0
+        self._on_disk = 0             # URLs sur disque non relues (fichier + pending)
+        self.stats = {"spilled": 0, "dropped": 0, "max_size": 0}
+        self.extend(urls)
+
+    def __len__(self) -> int:
+        return len(self._mem) + self._on_disk
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @property
+    def full(self) -> bool:
+        return len(self) >= self.max_size
+
+    def accepts(self, url: str) -> bool:
+        """True si append(url) sera accepté."""
+        return not self.full
+
+    def note_taken(self, url: str):
+        """Page déjà crawlée (reprise) : sans effet sur une file FIFO."""
+
+    def append(self, url: str) -> bool:
+        """Ajoute en fin de file. Retourne False si le plafond max_size est atteint (URL ignorée)."""
+        if self.full:
+            self.stats["dropped"] += 1
+            return False
+        if self._on_disk == 0 and len(self._mem) < self.memory_limit:
+            self._mem.append(url)
+        else:
+            self._pending.append(url.encode("utf-8", "surrogatepass") + b"\n")
+            self._on_disk += 1
+            self.stats["spilled"] += 1
+            if len(self._pending) >= FRONTIER_SPILL_BATCH:
+                self._flush()
+        size = len(self)
+        if size > self.stats["max_size"]:
+            self.stats["max_size"] = size
+        return True
+
+    def extend(self, urls: Iterable[str]):
+        for url in urls:
+            self.append(url)
+
+    def popleft(self) -> str:
+        """Retire la tête de file (IndexError si vide)."""
+        if not self._mem and self._on_disk:
+            self._refill()
+        return self._mem.popleft()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix="hotaru-frontier-")
+        self._spill.seek(0, os.SEEK_END)
+        self._spill.write(b"".join(self._pending))
+        self._pending = []
+
+    def _refill(self):
+        """Recharge en mémoire jusqu'à memory_limit URLs depuis le disque."""
+        self._flush()
+        self._spill.seek(self._read_pos)
+        for _ in range(min(self.memory_limit, self._on_disk)):
+            line = self._spill.readline()
+            if not line:
+                break
+            self._mem.append(line[:-1].decode("utf-8", "surrogatepass"))
+            self._on_disk -= 1
+        self._read_pos = self._spill.tell()
+        if self._on_disk == 0:
+            # Tout est relu : le fichier repart de zéro (pas de croissance sans fin)
+            self._spill.seek(0)
+            self._spill.truncate()
+            self._read_pos = 0
+
+    def __iter__(self) -> Iterator[str]:
+        """Parcourt la file dans l'ordre, sans la consommer (points de reprise)."""
+        yield from list(self._mem)
+        if not self._on_disk:
+            return
+        self._flush()
+        self._spill.seek(self._read_pos)
+        for line in self._spill.read().splitlines():
+            yield line.decode("utf-8", "surrogatepass")
+
+    def close(self):
+        """Supprime le fichier de débordement."""
+        self._mem.clear()
+        self._pending = []
+        self._on_disk = 0
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+
+class PriorityFrontier:
+    """
+    Frontier best-first : maximise le nombre de templates d'URL (services.jsonld_service.
+    get_url_path_pattern, ex. /blog/{slug}) couverts avant que max_urls soit atteint.
+
+    Une file par pattern (URLs triées par profondeur puis <priority> du sitemap, FIFO à égalité) ;
+    le pattern servi ensuite est celui de plus petit score :
+        PRIORITY_TAKEN_WEIGHT × pages déjà prises du pattern
+        + PRIORITY_DEPTH_WEIGHT × profondeur − PRIORITY_SITEMAP_WEIGHT × priority
+    Un pattern déjà bien échantillonné recule donc derrière les templates encore inconnus.
+    Chaque pattern garde au plus `max_per_pattern` URLs en file (au-delà : ignorées, le budget
+    ne pourra de toute façon pas les consommer). En mémoire uniquement (pas de débordement disque).
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str] = (),
+        max_per_pattern: int = FRONTIER_MAX_URLS,
+        max_size: int = FRONTIER_MAX_URLS,
+        sitemap_priority: Optional[Dict[str, float]] = None,
+    ):
+        self.max_per_pattern = max(1, max_per_pattern)
+        self.max_size = max_size
+        self.sitemap_priority = dict(sitemap_priority or {})
+        self._buckets: Dict[str, list] = {}   # pattern → tas [(score URL, seq, url)]
+        self._taken: Dict[str, int] = {}      # pattern → pages sorties de la file
+        self._heap: list = []                 # [(score pattern, seq tête, pattern, version)]
+        self._version: Dict[str, int] = {}    # entrées périmées du tas ignorées au pop
+        self._seq = itertools.count()
+        self._size = 0
+        self.stats = {"spilled": 0, "dropped": 0, "max_size": 0}
+        self.extend(urls)
+
+    @staticmethod
+    def pattern(url: str) -> str:
+        return "/" + "/".join(get_url_path_pattern(url))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    @property
+    def full(self) -> bool:
+        return self._size >= self.max_size
+
+    def accepts(self, url: str) -> bool:
+        """True si append(url) sera accepté (plafond global et plafond du pattern)."""
+        if self.full:
+            return False
+        return len(self._buckets.get(self.pattern(url), ())) < self.max_per_pattern
+
+    def _url_score(self, url: str) -> float:
+        depth = len(get_url_path_pattern(url))
+        priority = self.sitemap_priority.get(url)
+        if priority is None:
+            priority = SITEMAP_DEFAULT_PRIORITY
+        return PRIORITY_DEPTH_WEIGHT * depth - PRIORITY_SITEMAP_WEIGHT * priority
+
+    def _schedule(self, pattern: str):
+        """(Re)place le pattern dans le tas global selon sa tête de file et ses pages déjà prises."""
+        head_score, head_seq, _ = self._buckets[pattern][0]
+        version = self._version.get(pattern, 0) + 1
+        self._version[pattern] = version
+        score = PRIORITY_TAKEN_WEIGHT * self._taken.get(pattern, 0) + head_score
+        heapq.heappush(self._heap, (score, head_seq, pattern, version))
+
+    def append(self, url: str) -> bool:
+        """Ajoute une URL. Retourne False si un plafond est atteint (URL ignorée)."""
+        if not self.accepts(url):
+            self.stats["dropped"] += 1
+            return False
+        pattern = self.pattern(url)
+        bucket = self._buckets.setdefault(pattern, [])
+        entry = (self._url_score(url), next(self._seq), url)
+        heapq.heappush(bucket, entry)
+        self._size += 1
+        if self._size > self.stats["max_size"]:
+            self.stats["max_size"] = self._size
+        if bucket[0] is entry:
+            self._schedule(pattern)
+        return True
+
+    def extend(self, urls: Iterable[str]):
+        for url in urls:
+            self.append(url)
+
+    def popleft(self) -> str:
+        """Retire la meilleure URL (IndexError si vide)."""
+        while self._heap:
+            _, _, pattern, version = heapq.heappop(self._heap)
+            if self._version.get(pattern) != version:
+                continue
+            bucket = self._buckets[pattern]
+            _, _, url = heapq.heappop(bucket)
+            self._size -= 1
+            self._count_taken(pattern)
+            if bucket:
+                self._schedule(pattern)
+            else:
+                del self._buckets[pattern]
+                self._version.pop(pattern, None)
+            return url
+        raise IndexError("pop from an empty frontier")
+
+    def _count_taken(self, pattern: str):
+        self._taken[pattern] = self._taken.get(pattern, 0) + 1
+
+    def note_taken(self, url: str):
+        """Page déjà crawlée (reprise) : comptée pour son pattern comme si elle sortait de la file."""
+        pattern = self.pattern(url)
+        self._count_taken(pattern)
+        if pattern in self._buckets:
+            self._schedule(pattern)
+
+    def __iter__(self) -> Iterator[str]:
+        """URLs en file, sans la consommer (points de reprise ; l'ordre est recalculé à la reprise)."""
+        for bucket in list(self._buckets.values()):
+            for _, _, url in sorted(bucket):
+                yield url
+
+    def close(self):
+        self._buckets.clear()
+        self._heap = []
+        self._version.clear()
+        self._size = 0
+
+
+class FrontierQueue(asyncio.Queue):
+    """asyncio.Queue adossée à un Frontier ou PriorityFrontier (mêmes get/put/join/task_done)."""
+
+    def __init__(
+        self,
+        memory_limit: int = FRONTIER_MEMORY_URLS,
+        max_size: int = FRONTIER_MAX_URLS,
+        frontier: Union[Frontier, PriorityFrontier, None] = None,
+    ):
+        self._memory_limit = memory_limit
+        self._max_size = max_size
+        self._given = frontier
+        super().__init__()
+
+    def _init(self, maxsize):
+        self._queue = self._given if self._given is not None else Frontier(
+            memory_limit=self._memory_limit, max_size=self._max_size
+        )
+
+    def _put(self, item):
+        self._queue.append(item)
+
+    def _get(self):
+        return self._queue.popleft()
+
+    @property
+    def frontier(self) -> Union[Frontier, PriorityFrontier]:
+        return self._queue
+
+
+# ── Ensembles d'URLs vues ────────────────────────────────────────────────────
+
+
+class CompactUrlSet:
+    """
+    Ensemble d'URLs stockées sous forme d'empreintes 64 bits.
+    Récentes dans un set(), fusionnées par lots dans un array('Q') trié (recherche dichotomique).
+    Pas d'itération sur les URLs (seules les empreintes sont gardées).
+    """
+
+    def __init__(self, urls: Iterable[str] = ()):
+        self._sorted = array("Q")
+        self._recent: set = set()
+        self.update(urls)
+
+    def _has(self, h: int) -> bool:
+        if h in self._recent:
+            return True
+        i = bisect_left(self._sorted, h)
+        return i < len(self._sorted) and self._sorted[i] == h
+
+    def __contains__(self, url: str) -> bool:
+        return self._has(url_hash(url))
+
+    def add(self, url: str):
+        h = url_hash(url)
+        if self._has(h):
+            return
+        self._recent.add(h)
+        if len(self._recent) >= max(COMPACT_BUFFER, len(self._sorted) >> 4):
+            self._merge()
+
+    def update(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
+
+    def _merge(self):
+        # Fusion en flux : pas de liste intermédiaire d'entiers Python (pic mémoire borné)
+        self._sorted = array("Q", heapq.merge(self._sorted, sorted(self._recent)))
+        self._recent = set()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._recent)
+
+    def clear(self):
+        self._sorted = array("Q")
+        self._recent = set()
+
+    def dump(self) -> Dict:
+        """État sérialisable JSON (points de reprise)."""
+        self._merge()
+        return {"mode": "compact", "hashes": base64.b64encode(self._sorted.tobytes()).decode("ascii")}
+
+    @classmethod
+    def load(cls, state: Dict) -> "CompactUrlSet":
+        obj = cls()
+        obj._sorted.frombytes(base64.b64decode(state["hashes"]))
+        return obj
+
+
+class BloomUrlSet:
+    """
+    Filtre de Bloom extensible (couches de capacité doublée, taux de faux positifs
+    divisé par deux à chaque couche : le taux global reste sous `fp_rate`).
+    Un faux positif fait passer une URL pour déjà vue : elle n'est pas crawlée.
+    """
+
+    def __init__(self, urls: Iterable[str] = (), fp_rate: float = BLOOM_FP_RATE, capacity: int = BLOOM_INITIAL_CAPACITY):
+        self.fp_rate = fp_rate
+        self._capacity = capacity
+        self._layers: List[Dict] = []
+        self._count = 0
+        self._add_layer()
+        self.update(urls)
+
+    def _add_layer(self):
+        i = len(self._layers)
+        capacity = self._capacity << i
+        p = self.fp_rate * 0.5 ** (i + 1)  # somme des couches ≤ fp_rate
+        m = max(64, int(math.ceil(-capacity * math.log(p) / (math.log(2) ** 2))))
+        k = max(1, int(round(m / capacity * math.log(2))))
+        self._layers.append({"bits": bytearray((m + 7) // 8), "m": m, "k": k, "capacity": capacity, "count": 0})
+
+    @staticmethod
+    def _hashes(url: str):
+        digest = blake2b(url.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    @staticmethod
+    def _in_layer(layer: Dict, h1: int, h2: int) -> bool:
+        bits, m = layer["bits"], layer["m"]
+        for i in range(layer["k"]):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        h1, h2 = self._hashes(url)
+        return any(self._in_layer(layer, h1, h2) for layer in self._layers)
+
+    def add(self, url: str):
+        h1, h2 = self._hashes(url)
+        if any(self._in_layer(layer, h1, h2) for layer in self._layers):
+            return
+        layer = self._layers[-1]
+        bits, m = layer["bits"], layer["m"]
+        for i in range(layer["k"]):
+            pos = (h1 + i * h2) % m
+            bits[pos >> 3] |= 1 << (pos & 7)
+        layer["count"] += 1
+        self._count += 1
+        if layer["count"] >= layer["capacity"]:
+            self._add_layer()
+
+    def update(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        self._layers = []
+        self._count = 0
+        self._add_layer()
+
+    def dump(self) -> Dict:
+        """État sérialisable JSON (points de reprise)."""
+        return {
+            "mode": "bloom",
+            "fp_rate": self.fp_rate,
+            "capacity": self._capacity,
+            "count": self._count,
+            "layers": [
+                {**{k: v for k, v in layer.items() if k != "bits"}, "bits": base64.b64encode(layer["bits"]).decode("ascii")}
+                for layer in self._layers
+            ],
+        }
+
+    @classmethod
+    def load(cls, state: Dict) -> "BloomUrlSet":
+        obj = cls(fp_rate=state["fp_rate"], capacity=state["capacity"])
+        obj._layers = [
+            {**{k: v for k, v in layer.items() if k != "bits"}, "bits": bytearray(base64.b64decode(layer["bits"]))}
+            for layer in state["layers"]
+        ]
+        obj._count = state["count"]
+        return obj
+
+
+VisitedSet = Union[set, CompactUrlSet, BloomUrlSet]
+
+
+class CanonicalIndex:
+    """
+    Clés canoniques des pages retenues (URL rel=canonical, sinon l'URL elle-même).
+    Une page A déclarant B comme canonique couvre B : B n'est plus téléchargée, et toute autre
+    URL déclarant B est écartée. Les URLs et clés restent en clair : au plus max_urls pages retenues.
+    """
+
+    def __init__(self):
+        self._owners: Dict[str, str] = {}   # clé canonique ou URL retenue → URL de la page retenue
+        self._lock = threading.Lock()
+
+    def covered_by(self, url: str) -> Optional[str]:
+        """URL de la page retenue qui couvre déjà `url` (autre que `url`), sinon None."""
+        with self._lock:
+            owner = self._owners.get(url)
+        return owner if owner and owner != url else None
+
+    def owner_of(self, url: str, canonical: str = "") -> Optional[str]:
+        """URL de la page déjà retenue pour la même clé canonique que `url` (doublon), sinon None ; n'enregistre rien."""
+        key = canonical or url
+        with self._lock:
+            owner = self._owners.get(key) or self._owners.get(url)
+        return owner if owner is not None and owner != url else None
+
+    def register(self, url: str, canonical: str = "") -> Optional[str]:
+        """
+        Enregistre une page retenue. Retourne l'URL de la page déjà retenue pour la même clé
+        canonique (la page `url` est alors un doublon à écarter), sinon None.
+        """
+        key = canonical or url
+        with self._lock:
+            owner = self._owners.get(key) or self._owners.get(url)
+            if owner is not None and owner != url:
+                return owner
+            self._owners[key] = url
+            self._owners[url] = url
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._owners.clear()
+
+    def __len__(self):
+        return len(self._owners)
+
+
+def make_visited(mode: str = "compact", fp_rate: float = BLOOM_FP_RATE) -> VisitedSet:
+    """Ensemble des URLs vues selon le mode ("compact", "bloom" ou "exact")."""
+    if mode == "bloom":
+        return BloomUrlSet(fp_rate=fp_rate)
+    if mode == "exact":
+        return set()
+    return CompactUrlSet()
+
+
+def dump_visited(visited: VisitedSet):
+    """État sérialisable JSON de l'ensemble (liste d'URLs pour un set())."""
+    if isinstance(visited, (CompactUrlSet, BloomUrlSet)):
+        return visited.dump()
+    return list(visited)
+
+
+def load_visited(state, mode: str = "compact", fp_rate: float = BLOOM_FP_RATE) -> VisitedSet:
+    """Reconstruit l'ensemble depuis dump_visited (ou une liste d'URLs d'un ancien point de reprise)."""
+    if isinstance(state, dict):
+        return BloomUrlSet.load(state) if state.get("mode") == "bloom" else CompactUrlSet.load(state)
+    visited = make_visited(mode, fp_rate)
+    visited.update(state or [])
+    return visited
+
+
+__all__ = [
+    "Frontier",
+    "PriorityFrontier",
+    "FrontierQueue",
+    "CompactUrlSet",
+    "BloomUrlSet",
+    "CanonicalIndex",
+    "make_visited",
+    "dump_visited",
+    "load_visited",
+    "url_hash",
+    "FRONTIER_MEMORY_URLS",
+    "FRONTIER_MAX_URLS",
+    "BLOOM_FP_RATE",
+    "VISITED_MODES",
+    "FRONTIER_MODES",
+]
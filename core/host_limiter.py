@@ -0,0 +1,255 @@
+"""
+Concurrence et débit adaptatifs par host, partagés par les deux moteurs (V1 threads, V2 asyncio).
+- Seau à jetons par host (débit en requêtes/s) + plafond de requêtes simultanées.
+- AIMD : chaque succès augmente doucement la concurrence et le débit ; un 429 ou un 5xx les
+  divise par deux, une erreur réseau divise la concurrence seule (au plus une fois par fenêtre :
+  une rafale d'erreurs ne fait pas tomber la concurrence à 1 d'un coup).
+- Latence moyenne qui dérive au-dessus de la référence du host : concurrence réduite avant l'erreur.
+- 429 / 503 : le host est mis en pause selon Retry-After (secondes ou date HTTP, plafonné),
+  sinon backoff exponentiel ; l'appelant peut réessayer l'URL (cf. LIMITER_MAX_RETRIES).
+- snapshot() : décisions par host, exposées dans stats["host_limits"] des scrapers.
+Thread-safe.
+"""
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+LIMITER_INITIAL_RATE = 10.0      # requêtes/s par host au départ
+LIMITER_MIN_RATE = 0.5
+LIMITER_MAX_RATE = 50.0
+LIMITER_RATE_STEP = 1.1          # débit × 1,1 par succès (plafonné à LIMITER_MAX_RATE)
+LIMITER_SLOW_LATENCY = 2.0       # latence moyenne (× latence de référence) au-delà de laquelle on réduit
+LIMITER_BACKOFF_BASE = 2.0       # secondes de pause après un 429 sans Retry-After (doublées ensuite)
+LIMITER_MAX_PAUSE = 120.0        # pause max d'un host (Retry-After compris)
+LIMITER_MAX_RETRIES = 2          # nouvelles tentatives d'une URL après 429 / 503
+LIMITER_POLL = 0.05              # secondes entre deux essais quand tous les slots du host sont pris
+THROTTLE_STATUS = (429, 503)
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """En-tête Retry-After → secondes d'attente (délai en secondes ou date HTTP) ; None si absent/illisible."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(text).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class HostLimiter:
+    """
+    Limiteur adaptatif par host.
+
+    Usage :
+        limiter.acquire(url)                  # threads (bloquant) ; await limiter.acquire_async(url) en asyncio
+        ... requête ...
+        retry = limiter.release(url, status=resp.status_code, latency=0.8, retry_after=resp.headers.get("Retry-After"))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        initial_concurrency: Optional[int] = None,
+        initial_rate: float = LIMITER_INITIAL_RATE,
+        min_rate: float = LIMITER_MIN_RATE,
+        max_rate: float = LIMITER_MAX_RATE,
+    ):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.initial_concurrency = min(
+            self.max_concurrency, max(1, initial_concurrency or (self.max_concurrency + 1) // 2)
+        )
+        self.initial_rate = min(max(initial_rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._hosts: Dict[str, Dict] = {}
+        self._cond = threading.Condition()
+
+    def _state(self, host: str) -> Dict:
+        state = self._hosts.get(host)
+        if state is None:
+            now = time.monotonic()
+            state = self._hosts[host] = {
+                "limit": float(self.initial_concurrency),
+                "rate": self.initial_rate,
+                "tokens": float(self.initial_concurrency),
+                "refilled": now,
+                "in_flight": 0,
+                "blocked_until": 0.0,
+                "cooldown_until": 0.0,
+                "streak": 0,             # échecs consécutifs (backoff exponentiel)
+                "latency": None,         # moyenne mobile (s)
+                "base_latency": None,    # plus faible moyenne observée (référence)
+                "requests": 0,
+                "ok": 0,
+                "throttled": 0,
+                "server_errors": 0,
+                "network_errors": 0,
+                "backoffs": 0,
+                "pauses": 0,
+                "pause_s": 0.0,
+                "wait_s": 0.0,
+                "peak_in_flight": 0,
+            }
+        return state
+
+    def _try_acquire(self, state: Dict, now: float) -> float:
+        """Réserve un slot si possible (retourne 0), sinon l'attente suggérée en secondes."""
+        burst = max(1.0, state["limit"])
+        state["tokens"] = min(burst, state["tokens"] + (now - state["refilled"]) * state["rate"])
+        state["refilled"] = now
+        if now < state["blocked_until"]:
+            return state["blocked_until"] - now
+        if state["in_flight"] >= int(state["limit"]):
+            return LIMITER_POLL
+        if state["tokens"] < 1.0:
+            return (1.0 - state["tokens"]) / state["rate"]
+        state["tokens"] -= 1.0
+        state["in_flight"] += 1
+        state["requests"] += 1
+        state["peak_in_flight"] = max(state["peak_in_flight"], state["in_flight"])
+        return 0.0
+
+    def acquire(self, url: str):
+        """Attend (bloquant) un slot du host de `url`."""
+        with self._cond:
+            state = self._state(_host(url))
+            started = None
+            while True:
+                wait = self._try_acquire(state, time.monotonic())
+                if wait <= 0:
+                    break
+                started = started or time.monotonic()
+                self._cond.wait(wait)
+            if started:
+                state["wait_s"] += time.monotonic() - started
+
+    async def acquire_async(self, url: str):
+        """Attend un slot du host de `url` sans bloquer la boucle asyncio."""
+        host = _host(url)
+        started = None
+        while True:
+            with self._cond:
+                state = self._state(host)
+                wait = self._try_acquire(state, time.monotonic())
+                if wait <= 0:
+                    if started:
+                        state["wait_s"] += time.monotonic() - started
+                    return
+            started = started or time.monotonic()
+            await asyncio.sleep(wait)
+
+    def release(
+        self,
+        url: str,
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        retry_after=None,
+        error: bool = False,
+    ) -> bool:
+        """
+        Libère le slot et ajuste le host selon la réponse.
+        status : code HTTP (None si inconnu) ; error : échec réseau / timeout.
+        Retourne True si le host a limité la requête (429 / 503) : l'URL peut être réessayée.
+        """
+        with self._cond:
+            state = self._state(_host(url))
+            state["in_flight"] = max(0, state["in_flight"] - 1)
+            now = time.monotonic()
+            throttled = status in THROTTLE_STATUS
+            if throttled or error or (status is not None and status >= 500):
+                state["streak"] += 1
+                if throttled:
+                    state["throttled"] += 1
+                elif error:
+                    state["network_errors"] += 1
+                else:
+                    state["server_errors"] += 1
+                if now >= state["cooldown_until"]:
+                    state["limit"] = max(1.0, state["limit"] / 2)
+                    if not error:
+                        state["rate"] = max(self.min_rate, state["rate"] / 2)
+                        state["tokens"] = min(state["tokens"], 1.0)
+                    state["backoffs"] += 1
+                    state["cooldown_until"] = now + max(1.0, state["latency"] or 0.0)
+                pause = parse_retry_after(retry_after)
+                if pause is None and throttled:
+                    pause = LIMITER_BACKOFF_BASE * 2 ** (state["streak"] - 1)
+                if pause:
+                    pause = min(pause, LIMITER_MAX_PAUSE)
+                    if now + pause > state["blocked_until"]:
+                        state["blocked_until"] = now + pause
+                        state["pauses"] += 1
+                        state["pause_s"] += pause
+            else:
+                state["streak"] = 0
+                state["ok"] += 1
+                if latency is not None:
+                    avg = latency if state["latency"] is None else 0.8 * state["latency"] + 0.2 * latency
+                    state["latency"] = avg
+                    state["base_latency"] = min(state["base_latency"] or avg, avg)
+                slow = (
+                    state["latency"] is not None
+                    and state["latency"] > LIMITER_SLOW_LATENCY * max(state["base_latency"], 0.05)
+                )
+                if slow:
+                    # Le serveur ralentit sous la charge : on retire des slots sans attendre l'erreur
+                    state["limit"] = max(1.0, state["limit"] - 1.0 / state["limit"])
+                else:
+                    state["limit"] = min(float(self.max_concurrency), state["limit"] + 1.0 / state["limit"])
+                    state["rate"] = min(self.max_rate, state["rate"] * LIMITER_RATE_STEP)
+            self._cond.notify_all()
+            return throttled
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Décisions par host : concurrence et débit courants, latence, erreurs, pauses."""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                host: {
+                    "concurrency": int(s["limit"]),
+                    "rate": round(s["rate"], 2),
+                    "latency_ms": round(s["latency"] * 1000) if s["latency"] is not None else None,
+                    "requests": s["requests"],
+                    "ok": s["ok"],
+                    "throttled": s["throttled"],
+                    "server_errors": s["server_errors"],
+                    "network_errors": s["network_errors"],
+                    "backoffs": s["backoffs"],
+                    "pauses": s["pauses"],
+                    "pause_s": round(s["pause_s"], 2),
+                    "wait_s": round(s["wait_s"], 2),
+                    "peak_in_flight": s["peak_in_flight"],
+                    "paused": now < s["blocked_until"],
+                }
+                for host, s in self._hosts.items()
+            }
+
+
+def make_host_limiter(host_limits, max_concurrency: int) -> Optional[HostLimiter]:
+    """Paramètre host_limits des scrapers : True (limiteur dédié), False/None (désactivé) ou HostLimiter partagé."""
+    if host_limits is True:
+        return HostLimiter(max_concurrency)
+    return host_limits or None
+
+
+__all__ = [
+    "HostLimiter",
+    "make_host_limiter",
+    "parse_retry_after",
+    "LIMITER_MAX_RETRIES",
+    "THROTTLE_STATUS",
+]
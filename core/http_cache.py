@@ -0,0 +1,300 @@
+"""
+Cache HTTP disque à revalidation conditionnelle (re-crawls hebdomadaires des mêmes sites).
+- Par URL : ETag, Last-Modified, corps compressé (zlib) et champs extraits (core.page_extractor).
+- Au re-crawl : If-None-Match / If-Modified-Since ; un 304 réutilise le corps et l'extraction stockés.
+- Taille bornée : éviction des entrées les moins récemment utilisées (SQLite, un seul fichier).
+- Toute erreur du cache (disque plein, lecture seule...) dégrade en fetch normal, jamais en échec de crawl.
+Variante "raw" : HTML HTTP (V1, fetch_page V1) ; "rendered" : HTML rendu navigateur (fetch_page V2).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from datetime import timezone
+from typing import Dict, Mapping, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from core.bounded_fetch import FETCH_MAX_BYTES, HTML_CONTENT_TYPES, bounded_get
+
+HTTP_CACHE_DIR = os.environ.get("HOTARU_HTTP_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "hotaru", "http"
+)
+HTTP_CACHE_MAX_BYTES = int(float(os.environ.get("HOTARU_HTTP_CACHE_MB", "200")) * 1024 * 1024)
+EVICT_TARGET_RATIO = 0.9    # après dépassement, on redescend à 90 % du plafond
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    variant TEXT NOT NULL,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    fields TEXT,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (variant, url)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+def http_date_to_iso(value: Optional[str]) -> str:
+    """En-tête HTTP-date (Last-Modified) → ISO 8601 UTC ("" si absent ou illisible)."""
+    if not value:
+        return ""
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return ""
+    if dt is None:
+        return ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+
+def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+    """En-têtes de revalidation pour une entrée du cache (vide si pas d'entrée)."""
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+class HttpCache:
+    """
+    Cache HTTP conditionnel thread-safe.
+
+    Usage :
+        cache = HttpCache()
+        resp = cache.get(session, url, timeout=15)   # requests.Response (resp.from_cache si 304)
+        fields = resp.cached_fields or extract_page_fields(resp.content)
+        cache.store_fields(url, fields)
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.directory = directory or HTTP_CACHE_DIR
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {"revalidated": 0, "stored": 0, "misses": 0, "evicted": 0, "errors": 0}
+        os.makedirs(self.directory, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(self.directory, "http_cache.sqlite3"), timeout=30, check_same_thread=False
+        )
+        self._db.executescript(_SCHEMA)
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    # ── Accès aux entrées ────────────────────────────────────────────────────
+
+    def lookup(self, url: str, variant: str = "raw") -> Optional[Dict]:
+        """Entrée stockée : {"etag", "last_modified", "headers", "body" (bytes), "fields"} ou None."""
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT etag, last_modified, headers, body, fields FROM entries WHERE variant = ? AND url = ?",
+                    (variant, url),
+                ).fetchone()
+            if row is None:
+                return None
+            return {
+                "etag": row[0],
+                "last_modified": row[1],
+                "headers": json.loads(row[2]),
+                "body": zlib.decompress(row[3]),
+                "fields": json.loads(row[4]) if row[4] else None,
+            }
+        except (sqlite3.Error, zlib.error, ValueError):
+            self._count("errors")
+            return None
+
+    def store(self, url: str, body: bytes, headers: Mapping, variant: str = "raw") -> bool:
+        """Stocke un corps 200 si le serveur fournit un validateur (ETag ou Last-Modified)."""
+        headers = CaseInsensitiveDict(headers or {})
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+        kept = {name: headers[name] for name in _KEPT_HEADERS if headers.get(name)}
+        blob = zlib.compress(body or b"", 6)
+        size = len(blob)
+        if size > self.max_bytes:
+            return False
+        try:
+            with self._lock:
+                previous = self._db.execute(
+                    "SELECT size FROM entries WHERE variant = ? AND url = ?", (variant, url)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?)",
+                    (variant, url, etag, last_modified, json.dumps(kept), blob, size, time.time()),
+                )
+                self._db.commit()
+                self._total += size - (previous[0] if previous else 0)
+                self.stats["stored"] += 1
+                if self._total > self.max_bytes:
+                    self._evict()
+            return True
+        except sqlite3.Error:
+            self._count("errors")
+            return False
+
+    def store_fields(self, url: str, fields: Dict, variant: str = "raw"):
+        """Attache les champs extraits à l'entrée (réutilisés tels quels sur 304)."""
+        try:
+            data = json.dumps(fields, ensure_ascii=False)
+            with self._lock:
+                cur = self._db.execute(
+                    "UPDATE entries SET fields = ?, size = size + ? WHERE variant = ? AND url = ? AND fields IS NULL",
+                    (data, len(data), variant, url),
+                )
+                self._db.commit()
+                if cur.rowcount:
+                    self._total += len(data)
+        except (sqlite3.Error, TypeError, ValueError):
+            self._count("errors")
+
+    def touch(self, url: str, variant: str = "raw"):
+        """Marque l'entrée comme utilisée (ordre LRU)."""
+        try:
+            with self._lock:
+                self._db.execute(
+                    "UPDATE entries SET accessed = ? WHERE variant = ? AND url = ?", (time.time(), variant, url)
+                )
+                self._db.commit()
+        except sqlite3.Error:
+            self._count("errors")
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées (appelé sous self._lock)."""
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        rows = self._db.execute("SELECT variant, url, size FROM entries ORDER BY accessed").fetchall()
+        evicted = []
+        for variant, url, size in rows:
+            if self._total <= target:
+                break
+            evicted.append((variant, url))
+            self._total -= size
+        self._db.executemany("DELETE FROM entries WHERE variant = ? AND url = ?", evicted)
+        self._db.commit()
+        self.stats["evicted"] += len(evicted)
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._total = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total
+
+    # ── Fetch conditionnel ───────────────────────────────────────────────────
+
+    @staticmethod
+    def _as_response(url: str, entry: Dict) -> requests.Response:
+        """Reconstruit une réponse 200 à partir d'une entrée (304 revalidé)."""
+        resp = requests.models.Response()
+        resp.status_code = 200
+        resp._content = entry["body"]
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = url
+        resp.from_cache = True
+        resp.cached_fields = entry["fields"]
+        return resp
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        variant: str = "raw",
+        max_bytes: int = FETCH_MAX_BYTES,
+        accept: Optional[Tuple[str, ...]] = HTML_CONTENT_TYPES,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        GET conditionnel via `session`. Sur 304, retourne la réponse stockée (from_cache=True,
+        cached_fields = champs extraits si connus) ; sur 200, met le corps en cache.
+        Téléchargement borné (cf. core.bounded_fetch) : ResponseRejected si non HTML ou trop gros.
+        """
+        entry = self.lookup(url, variant)
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(conditional_headers(entry))
+        resp = bounded_get(session, url, max_bytes=max_bytes, accept=accept, headers=headers, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self._count("revalidated")
+            self.touch(url, variant)
+            return self._as_response(url, entry)
+        self._count("misses")
+        resp.from_cache = False
+        resp.cached_fields = None
+        if resp.status_code == 200:
+            self.store(url, resp.content, resp.headers, variant)
+        return resp
+
+    def revalidate(self, session: requests.Session, url: str, variant: str = "raw", **kwargs) -> Optional[Dict]:
+        """
+        Vérifie seulement si l'entrée est encore fraîche (corps non téléchargé si elle ne l'est pas).
+        Retourne l'entrée sur 304, None sinon. Utilisé quand le corps vient d'ailleurs (rendu navigateur).
+        """
+        entry = self.lookup(url, variant)
+        if entry is None:
+            return None
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(conditional_headers(entry))
+        try:
+            with session.get(url, headers=headers, stream=True, **kwargs) as resp:
+                fresh = resp.status_code == 304
+        except requests.RequestException:
+            return None
+        if not fresh:
+            self._count("misses")
+            return None
+        self._count("revalidated")
+        self.touch(url, variant)
+        return entry
+
+
+_shared_cache: Optional[HttpCache] = None
+_shared_failed = False
+_shared_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Cache partagé du process (None si désactivé via HOTARU_HTTP_CACHE=0 ou disque indisponible)."""
+    global _shared_cache, _shared_failed
+    if os.environ.get("HOTARU_HTTP_CACHE", "1") == "0":
+        return None
+    with _shared_lock:
+        if _shared_cache is None and not _shared_failed:
+            try:
+                _shared_cache = HttpCache()
+            except (OSError, sqlite3.Error):
+                _shared_failed = True
+        return _shared_cache
+
+
+__all__ = [
+    "HttpCache",
+    "get_http_cache",
+    "conditional_headers",
+    "http_date_to_iso",
+    "HTTP_CACHE_DIR",
+    "HTTP_CACHE_MAX_BYTES",
+]
@@ -0,0 +1,187 @@
+"""
+Re-crawl incrémental à partir d'un crawl précédent (sauvegarde unifiée ou résultats en session).
+- Le frontier est amorcé avec les URLs du crawl précédent.
+- Une page n'est re-téléchargée que si elle a pu changer : lastmod du sitemap postérieur au
+  crawl précédent, ou validateurs HTTP (ETag / Last-Modified) qui ne répondent plus 304.
+- Les pages inchangées reprennent leur enregistrement précédent ("incremental": "unchanged").
+- Seuls les enregistrements complets (HTML et liens) sont repris : ceux d'une sauvegarde allégée
+  (app.py, ni HTML ni liens, JSON-LD résumé) sont re-téléchargés, sinon clustering, graphe de liens
+  et score GEO porteraient sur des pages vides. Compte dans le rapport (carry_skipped).
+- Rapport final : nouvelles / modifiées / inchangées / supprimées / non vérifiées.
+"""
+import datetime
+import hashlib
+import json
+from email.utils import format_datetime
+from typing import Dict, Iterable, List, Optional
+
+from core.http_cache import conditional_headers
+from core.sitemaps import SITEMAP_TIMEOUT, fetch_sitemap_entries
+
+# Champs comparés quand l'enregistrement précédent n'a pas de content_hash (anciennes sauvegardes)
+_LEGACY_COMPARE_KEYS = ("title", "h1", "description", "h2_count", "has_structured_data")
+
+
+def content_hash(page: Dict) -> str:
+    """Empreinte du contenu utile d'une page (insensible aux jetons/horodatages du HTML brut)."""
+    payload = [
+        page.get("title") or "",
+        page.get("h1") or "",
+        page.get("description") or "",
+        page.get("h2_count") or 0,
+        page.get("lists_count") or 0,
+        sorted(page.get("links") or []),
+        page.get("json_ld") or [],
+    ]
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def is_light_record(page: Dict) -> bool:
+    """True si l'enregistrement n'a ni HTML ni liens (sauvegarde allégée) : inutilisable tel quel."""
+    has_html = bool(page.get("html_ref") or page.get("html_content"))
+    return not has_html or "links" not in page
+
+
+def _parse_date(value) -> Optional[datetime.datetime]:
+    """ISO 8601 (sitemap, last_modified) ou "YYYY-MM-DD HH:MM" (created_at des sauvegardes) → datetime UTC."""
+    if not value:
+        return None
+    text = str(value).strip().replace("Z", "+00:00")
+    for parse in (datetime.datetime.fromisoformat, lambda t: datetime.datetime.strptime(t, "%Y-%m-%d %H:%M")):
+        try:
+            dt = parse(text)
+            break
+        except ValueError:
+            continue
+    else:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.astimezone(datetime.timezone.utc)
+
+
+def fetch_sitemap_lastmod(session, base_url: str, timeout: int = SITEMAP_TIMEOUT) -> Dict[str, str]:
+    """{url: lastmod} depuis les sitemaps du site (cf. core.sitemaps) ; {} si pas de sitemap."""
+    return {
+        url: entry["lastmod"]
+        for url, entry in fetch_sitemap_entries(session, base_url, timeout).items()
+        if entry["lastmod"]
+    }
+
+
+class IncrementalBaseline:
+    """Crawl précédent indexé par URL + décisions de re-fetch + rapport de différences."""
+
+    def __init__(
+        self,
+        pages: Iterable[Dict],
+        crawled_at: Optional[str] = None,
+        sitemap_lastmod: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            pages: pages du crawl précédent (dicts page complets ou allégés d'une sauvegarde)
+            crawled_at: date du crawl précédent (ISO ou "YYYY-MM-DD HH:MM") ; requise pour le sitemap
+            sitemap_lastmod: {url: lastmod} (cf. fetch_sitemap_lastmod)
+        """
+        self.records: Dict[str, Dict] = {}
+        for page in pages or []:
+            if isinstance(page, dict) and page.get("url"):
+                self.records[page["url"]] = page
+        self.crawled_at = _parse_date(crawled_at)
+        self.sitemap_lastmod = dict(sitemap_lastmod or {})
+        self._seen: Dict[str, str] = {}    # url → statut des pages du crawl en cours (cf. track)
+        self._carried = 0
+        # Enregistrements allégés : jamais repris, toujours re-téléchargés (cf. can_carry)
+        self.light_urls = {url for url, page in self.records.items() if is_light_record(page)}
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self.records)
+
+    def can_carry(self, url: str) -> bool:
+        """True si l'enregistrement précédent de l'URL est complet et peut être repris tel quel."""
+        return url in self.records and url not in self.light_urls
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        If-None-Match / If-Modified-Since depuis l'ETag et le Last-Modified enregistrés.
+        Aucun pour un enregistrement allégé : la page doit être re-téléchargée en entier.
+        """
+        if not self.can_carry(url):
+            return {}
+        record = self.records[url]
+        last_modified = _parse_date(record.get("last_modified"))
+        return conditional_headers({
+            "etag": record.get("etag"),
+            "last_modified": format_datetime(last_modified, usegmt=True) if last_modified else None,
+        })
+
+    def unchanged_by_sitemap(self, url: str) -> bool:
+        """True si le sitemap date la page d'avant le crawl précédent (pas de re-fetch)."""
+        if not self.can_carry(url) or self.crawled_at is None:
+            return False
+        lastmod = _parse_date(self.sitemap_lastmod.get(url))
+        return lastmod is not None and lastmod <= self.crawled_at
+
+    def carry_forward(self, url: str) -> Dict:
+        """Enregistrement précédent (complet, cf. can_carry) repris tel quel (page inchangée)."""
+        page = dict(self.records[url])
+        page.setdefault("json_ld", [])
+        page["incremental"] = "unchanged"
+        page["carried_forward"] = True
+        return page
+
+    def classify(self, page: Dict) -> str:
+        """"new", "changed" ou "unchanged" par rapport au crawl précédent."""
+        previous = self.records.get(page.get("url"))
+        if previous is None:
+            return "new"
+        if page.get("carried_forward"):
+            return "unchanged"
+        if previous.get("content_hash") and page.get("content_hash"):
+            return "unchanged" if previous["content_hash"] == page["content_hash"] else "changed"
+        same = all(previous.get(k) == page.get(k) for k in _LEGACY_COMPARE_KEYS if k in previous)
+        return "unchanged" if same else "changed"
+
+    def track(self, page: Dict) -> str:
+        """Classe une page du crawl en cours dès sa production (page["incremental"]) et la retient pour report."""
+        status = self.classify(page)
+        page["incremental"] = status
+        url = page["url"]
+        if url not in self._seen:
+            self._seen[url] = status
+            self._carried += 1 if page.get("carried_forward") else 0
+        return status
+
+    def report(self, results: Optional[List[Dict]] = None, failed_urls: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Rapport du re-crawl. results : pages à classer en plus de celles déjà passées par track
+        (None en crawl streaming). failed_urls : URLs tentées sans page (404, 410, erreur) ;
+        les URLs précédentes jamais tentées (budget max_urls) sont "not_checked".
+
+        Returns:
+            {"new": [url], "changed": [url], "unchanged": [url], "removed": [url],
+             "not_checked": [url], "refetched": int, "carried_forward": int,
+             "carry_skipped": {"light_record": int}}  (pages re-téléchargées car enregistrement allégé)
+        """
+        for page in results or []:
+            self.track(page)
+        report = {"new": [], "changed": [], "unchanged": [], "removed": [], "not_checked": []}
+        for url, status in self._seen.items():
+            report[status].append(url)
+        failed = set(failed_urls or [])
+        for url in self.records:
+            if url in self._seen:
+                continue
+            report["removed" if url in failed else "not_checked"].append(url)
+        report["refetched"] = len(self._seen) - self._carried
+        report["carried_forward"] = self._carried
+        report["carry_skipped"] = {"light_record": sum(1 for url in self._seen if url in self.light_urls)}
+        return report
+
+__all__ = ["IncrementalBaseline", "content_hash", "fetch_sitemap_entries", "fetch_sitemap_lastmod", "is_light_record"]
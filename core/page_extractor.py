@@ -0,0 +1,184 @@
+"""
+Extraction des champs d'une page HTML en une seule passe lxml (V1, V2, hybride).
+- Un parsing lxml (C) au lieu de html.parser + un find_all par champ.
+- Un seul parcours de l'arbre, filtré par tag côté C : titre, H1, meta description,
+  liens <a href>, H2, listes, JSON-LD, et de quoi construire le fallback HTML V2.
+- Sémantique alignée sur l'ancienne extraction BeautifulSoup (premier titre, premier H1,
+  meta name="description", scripts dont le type contient "ld+json").
+- URL canonique déclarée (<link rel="canonical">, brute : résolue par le scraper).
+- Empreinte SimHash du texte visible ("simhash", core/simhash.py) : quasi-doublons repérés au crawl.
+"""
+import json
+from typing import Dict, List, Optional, Union
+
+from bs4 import UnicodeDammit
+from lxml import etree
+
+from core.simhash import simhash
+
+# Tags collectés pendant le parcours (le filtrage se fait dans lxml, pas en Python)
+_TAGS = ("title", "h1", "meta", "a", "h2", "ul", "ol", "script", "p", "img", "link")
+# Limites du fallback HTML (identiques à core.page_record.html_fallback)
+FALLBACK_H2 = 5
+FALLBACK_PARAGRAPHS = 2
+FALLBACK_LISTS = 3
+FALLBACK_LIST_ITEMS = 10
+FALLBACK_IMAGES = 5
+
+# Tags dont le texte n'est pas visible (exclus de l'empreinte SimHash)
+_HIDDEN_TAGS = frozenset(("script", "style", "noscript", "template"))
+
+_PARSER = etree.HTMLParser(encoding="utf-8", recover=True, remove_comments=True, no_network=True)
+
+
+def decode_html(content: Union[bytes, str]) -> str:
+    """Décode un corps HTTP (bytes) avec la détection d'encodage de BeautifulSoup (BOM, meta charset, heuristique)."""
+    if isinstance(content, str):
+        return content
+    if not content:
+        return ""
+    return UnicodeDammit(content, is_html=True).unicode_markup or ""
+
+
+def _strip_join(el) -> str:
+    """Équivalent de Tag.get_text(strip=True) : chaque nœud texte strippé, concaténés."""
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _parse_jsonld(raw: Optional[str]) -> Optional[object]:
+    if not raw or not raw.strip():
+        return None
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def _visible_text(root) -> str:
+    """Texte du <body> (à défaut du document) sans scripts ni styles."""
+    body = root.find("body")
+    parts = []
+    for el in (body if body is not None else root).iter():
+        if isinstance(el.tag, str) and el.tag not in _HIDDEN_TAGS and el.text:
+            parts.append(el.text)
+        if el.tail and el is not body:
+            parts.append(el.tail)
+    return " ".join(parts)
+
+
+def _empty_fields() -> Dict:
+    return {
+        "title": "",
+        "h1": "",
+        "description": "",
+        "has_meta_description": False,
+        "links": [],
+        "data_href_links": [],
+        "json_ld": [],
+        "h2_count": 0,
+        "lists_count": 0,
+        "h2_texts": [],
+        "paragraphs": [],
+        "list_items": [],
+        "images": [],
+        "canonical": "",
+        "simhash": None,
+    }
+
+
+def extract_page_fields(html: Union[bytes, str], data_href: bool = False) -> Dict:
+    """
+    Parse le HTML une fois et retourne tous les champs utiles au dict page.
+
+    Args:
+        html: HTML (str, ou bytes d'une réponse HTTP : décodé via decode_html)
+        data_href: collecter aussi les attributs data-href (liens SPA, utilisé par V2)
+
+    Returns:
+        {"title", "h1", "description", "has_meta_description", "links", "data_href_links",
+         "json_ld", "h2_count", "lists_count", "h2_texts", "paragraphs", "list_items", "images", "canonical", "simhash"}
+    """
+    fields = _empty_fields()
+    html = decode_html(html)
+    if not html.strip():
+        return fields
+    try:
+        root = etree.fromstring(html.encode("utf-8", "surrogatepass"), _PARSER)
+    except (etree.XMLSyntaxError, ValueError):
+        root = None
+    if root is None:
+        return fields
+
+    title_el = h1_el = meta_el = None
+    links = fields["links"]
+    json_ld = fields["json_ld"]
+    h2_els: List = []
+    p_els: List = []
+    list_els: List = []
+    images = fields["images"]
+    h2_count = lists_count = 0
+
+    for el in root.iter(*_TAGS):
+        tag = el.tag
+        if tag == "a":
+            href = el.get("href")
+            if href is not None:
+                links.append(href)
+        elif tag == "script":
+            if "ld+json" in (el.get("type") or "").lower():
+                block = _parse_jsonld(el.text)
+                if block is not None:
+                    json_ld.append(block)
+        elif tag == "h2":
+            h2_count += 1
+            if len(h2_els) < FALLBACK_H2:
+                h2_els.append(el)
+        elif tag == "ul" or tag == "ol":
+            lists_count += 1
+            if len(list_els) < FALLBACK_LISTS:
+                list_els.append(el)
+        elif tag == "p":
+            if len(p_els) < FALLBACK_PARAGRAPHS:
+                p_els.append(el)
+        elif tag == "img":
+            if len(images) < FALLBACK_IMAGES:
+                images.append({"src": el.get("src", ""), "alt": el.get("alt", "")})
+        elif tag == "meta":
+            if meta_el is None and el.get("name") == "description":
+                meta_el = el
+        elif tag == "h1":
+            if h1_el is None:
+                h1_el = el
+        elif tag == "title":
+            if title_el is None:
+                title_el = el
+        elif tag == "link":
+            if not fields["canonical"] and "canonical" in (el.get("rel") or "").lower().split():
+                fields["canonical"] = (el.get("href") or "").strip()
+
+    if title_el is not None:
+        fields["title"] = _strip_join(title_el)
+    if h1_el is not None:
+        fields["h1"] = "".join(h1_el.itertext()).strip()
+    if meta_el is not None:
+        fields["has_meta_description"] = True
+        fields["description"] = (meta_el.get("content") or "").strip()
+    fields["h2_count"] = h2_count
+    fields["lists_count"] = lists_count
+    fields["h2_texts"] = [_strip_join(h2) for h2 in h2_els]
+    fields["paragraphs"] = [_strip_join(p) for p in p_els]
+    items = []
+    for lst in list_els:
+        for i, li in enumerate(lst.iter("li")):
+            if i >= FALLBACK_LIST_ITEMS:
+                break
+            items.append(_strip_join(li))
+    fields["list_items"] = items
+    if data_href:
+        hrefs = (value.strip() for value in root.xpath("//@data-href"))
+        fields["data_href_links"] = [h for h in hrefs if h and not h.startswith("#")]
+    fields["simhash"] = simhash(_visible_text(root))
+    return fields
+
+
+__all__ = ["extract_page_fields", "decode_html"]
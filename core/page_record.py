@@ -0,0 +1,322 @@
+"""
+Enregistrement page du crawl V2 construit hors de la boucle asyncio.
+- extract_page_record : fonction pure (HTML rendu + liens / markdown / résultat JS du CrawlResult
+  → page compacte). Tout le travail CPU y est regroupé : passe lxml, fusion des cinq sources de
+  liens, filtrage, JSON-LD (lxml puis regex), fallback HTML, SimHash, empreinte de contenu.
+- parse_pool("thread") (défaut des scrapers) : pool de threads partagé par les crawls, lxml relâche
+  le GIL pendant l'analyse ; un gros HTML n'arrête plus les autres onglets du navigateur.
+- parse_pool("process") : pool de processus (GIL contourné, gain sur machine multi-cœurs). Processus
+  démarrés en "spawn" : ils ré-importent le script principal, qui doit être protégé par
+  `if __name__ == "__main__":` (c'est le cas de `streamlit run`). Pool cassé : repli sur les threads.
+Seules les entrées et la page compacte traversent le pool.
+- HTML complet compressé dans le pool aussi (inputs["compress"], core/page_store.py) : la boucle
+  ne fait que ranger le blob.
+- Module léger (pas d'import de Crawl4AI) : démarrage rapide des processus du pool.
+Mesures (concurrence 5 / 10 / 20) : scripts/bench_parse_offload.py.
+"""
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse, urlunparse
+
+from core.incremental import content_hash
+from core.link_extractor import LinkExtractor
+from core.page_extractor import extract_page_fields
+from core.page_store import HTML_PREVIEW_CHARS, compress_html
+
+PARSE_OFFLOAD_MODES = ("process", "thread")
+PARSE_POOL_WORKERS = int(os.environ.get("HOTARU_PARSE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+_JSONLD_RE = re.compile(r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def normalize_url(url: str) -> str:
+    """Normalise une URL pour éviter les doublons (fragment et paramètres retirés, chemin en minuscules)."""
+    url = url.split("#")[0].split("?")[0]
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/") or "/"
+    path = path.lower()
+    return urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        path, "", "", ""
+    ))
+
+
+def clean_title(title: str, h1: str, url: str) -> str:
+    """Titre court de la page : H1 ou <title> débarrassé du nom du site, sinon dernier segment d'URL."""
+    domain_name = urlparse(url).netloc.split(".")[0].lower()
+
+    def is_useful(text):
+        if not text or len(text) < 3:
+            return False
+        text_clean = text.lower().replace(" ", "").replace("-", "")
+        if domain_name in text_clean and len(text_clean) < len(domain_name) + 5:
+            return False
+        return True
+
+    text = h1 if (h1 and len(h1) > 10) else (title if (title and len(title) > 5) else "")
+
+    if text:
+        separators = [" - ", " | ", " : ", " — ", " – ", " · "]
+        for sep in separators:
+            if sep in text:
+                parts = [p.strip() for p in text.split(sep)]
+                useful_parts = [p for p in parts if is_useful(p)]
+                if useful_parts:
+                    text = max(useful_parts, key=len)
+                break
+
+    if not is_useful(text):
+        path = urlparse(url).path
+        segments = [s for s in path.split("/") if s and s not in ["fr", "en", "de", "es", "www"]]
+        text = segments[-1].replace("-", " ").replace("_", " ").title() if segments else "Accueil"
+
+    text = text.strip()
+    return text[:40] + ".." if len(text) > 40 else text
+
+
+def extract_jsonld_regex(html: str) -> List[Dict]:
+    """
+    Extraction JSON-LD robuste depuis HTML brut via regex.
+    Complément à l'extraction lxml pour les cas edge (HTML trop cassé pour le parseur).
+    """
+    out = []
+    for raw in _JSONLD_RE.findall(html):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            out.append(json.loads(raw))
+        except (json.JSONDecodeError, TypeError):
+            continue
+    return out
+
+
+def merge_jsonld(list_a: List, list_b: List = None) -> List:
+    """Fusionne deux listes JSON-LD sans doublons."""
+    list_b = list_b or []
+    seen = set()
+    merged = []
+    for block in list_a + list_b:
+        if block is None:
+            continue
+        try:
+            canonical = json.dumps(block, sort_keys=True)
+            if canonical in seen:
+                continue
+            seen.add(canonical)
+            merged.append(block)
+        except (TypeError, ValueError):
+            continue
+    return merged
+
+
+def html_fallback(fields: Dict, url: str) -> Dict:
+    """
+    Fallback pour sites SANS JSON-LD.
+    Extrait une structure généralisée depuis HTML : headings, listes, éléments clés.
+    Retourne un dict compatible avec JSON-LD pour uniformité.
+    `fields` : champs de core.page_extractor.extract_page_fields (déjà parsés).
+    """
+    fallback = {
+        "@context": "https://schema.org",
+        "@type": "WebPage",
+        "url": url,
+        "mainEntity": {}
+    }
+
+    # ─ H1 (main title)
+    if fields["h1"]:
+        fallback["mainEntity"]["name"] = fields["h1"][:150]
+
+    # ─ Description (meta + premiers paragraphes)
+    if fields["has_meta_description"]:
+        fallback["description"] = fields["description"][:300]
+    elif fields["paragraphs"]:
+        fallback["description"] = " ".join(fields["paragraphs"])[:300]
+
+    # ─ H2s (sections principales)
+    if fields["h2_texts"]:
+        fallback["mainEntity"]["sections"] = [h2[:100] for h2 in fields["h2_texts"]]
+
+    # ─ Listes (ul/ol → items)
+    if fields["list_items"]:
+        fallback["mainEntity"]["items"] = [item[:100] for item in fields["list_items"][:10]]
+
+    # ─ Images principales (alt text)
+    if fields["images"]:
+        fallback["image"] = []
+        for img in fields["images"]:
+            alt = img["alt"]
+            src = img["src"]
+            if alt or src:
+                fallback["image"].append({
+                    "url": src,
+                    "description": alt[:150] if alt else None
+                })
+
+    return fallback
+
+
+def resolve_canonical(url: str, href: str, domain_set, exclude_patterns=()) -> str:
+    """URL rel=canonical normalisée ; "" si absente, exclue ou hors des domaines du crawl."""
+    if not href:
+        return ""
+    full_url = urljoin(url, href)
+    if urlparse(full_url).netloc.lower() not in domain_set:
+        return ""
+    if any(pattern in full_url.lower() for pattern in exclude_patterns):
+        return ""
+    return normalize_url(full_url)
+
+
+def extract_page_record(url: str, inputs: Dict, domain_set, exclude_patterns) -> Dict:
+    """
+    Page compacte depuis les entrées d'un CrawlResult (cf. HotaruScraperV2._page_inputs) :
+    {"html", "crawl4ai_links", "markdown", "js_result", "compress"}.
+    Retourne {"page": dict, "links_filtered": int, "links_discovered": int, "logs": [str], "html_blob"} ;
+    la page ne contient ni markdown ni en-têtes (ajoutés côté boucle). html_blob : (clé, blob) de
+    compress_html si inputs["compress"], sinon None.
+    """
+    logs = []
+    html_content = inputs["html"]
+    fields = extract_page_fields(html_content, data_href=True)
+
+    h1 = fields["h1"]
+    final_title = clean_title(fields["title"], h1, url)
+    normalized_current = normalize_url(url)
+
+    # ── Liens internes : toutes les sources fusionnées (LinkExtractor) ─────────
+    crawl4ai_links = inputs["crawl4ai_links"]
+    soup_links = fields["links"]
+    data_href_links = fields["data_href_links"]
+    markdown_links = LinkExtractor.extract_from_markdown(inputs["markdown"])
+    js_links = LinkExtractor.extract_from_js_result(inputs["js_result"])
+    raw_links_set = LinkExtractor.merge_sources(
+        crawl4ai_links=crawl4ai_links,
+        soup_links=soup_links,
+        data_href_links=data_href_links,
+        js_links=js_links,
+        markdown_links=markdown_links,
+    )
+
+    sources_found = []
+    if crawl4ai_links:
+        sources_found.append(f"Crawl4AI({len(crawl4ai_links)})")
+    if soup_links:
+        sources_found.append(f"Soup({len(soup_links)})")
+    if data_href_links:
+        sources_found.append(f"data-href({len(data_href_links)})")
+    if js_links:
+        sources_found.append(f"JS({len(js_links)})")
+    if markdown_links:
+        sources_found.append(f"Markdown({len(markdown_links)})")
+    if sources_found:
+        logs.append(f"    Sources: {', '.join(sources_found)}")
+
+    valid_links, filtered_count = LinkExtractor.filter_by_domain(
+        list(raw_links_set), domain_set, url, exclude_patterns,
+    )
+    unique_links = []
+    for link in valid_links:
+        clean_link = normalize_url(link)
+        if clean_link != normalized_current:
+            unique_links.append(clean_link)
+    unique_links = list(set(unique_links))
+
+    if not unique_links and raw_links_set:
+        logs.append(f"⚠️  {len(raw_links_set)} lien(s) trouvé(s) mais aucun du domaine!")
+    elif not unique_links:
+        logs.append(f"⚠️  AUCUN lien découvert")
+        logs.append(f"    HTML: {len(html_content)} bytes, Domaine: {urlparse(url).netloc.lower()}")
+
+    # ── JSON-LD (double extraction fusionnée) ────────────────────────────────
+    # (la regex ne sert que si lxml n'a rien trouvé : mêmes balises sinon)
+    json_ld_parsed = fields["json_ld"]
+    json_ld_raw = [] if json_ld_parsed else extract_jsonld_regex(html_content)
+    json_ld_data = merge_jsonld(json_ld_parsed, json_ld_raw)
+
+    # ── FALLBACK pour sites SANS JSON-LD ──────────────────────────────────────
+    fallback_used = False
+    if not json_ld_data:
+        json_ld_data = [html_fallback(fields, url)]  # Enrober dans liste pour compatibilité
+        fallback_used = True
+        logs.append(f"  💡 Fallback HTML activé (pas de JSON-LD trouvé)")
+
+    page = {
+        "url": url,
+        "title": final_title,
+        "links": unique_links,
+        "description": fields["description"],
+        "h1": h1,
+        "response_time": 0.0,                 # Crawl4AI ne donne pas de response_time direct
+        "html_content": html_content[:HTML_PREVIEW_CHARS],
+        "html_full_size": len(html_content),
+        "last_modified": "",                  # en-tête Last-Modified, renseigné côté boucle
+        "has_structured_data": bool(json_ld_data),
+        "json_ld": json_ld_data,
+        "fallback_used": fallback_used,
+        "h2_count": fields["h2_count"],
+        "lists_count": fields["lists_count"],
+        "simhash": fields["simhash"],
+        "canonical": resolve_canonical(url, fields["canonical"], domain_set, exclude_patterns),
+    }
+    # Empreinte du contenu (re-crawl incrémental : pages modifiées vs inchangées)
+    page["content_hash"] = content_hash(page)
+    return {
+        "page": page,
+        "links_filtered": filtered_count,
+        "links_discovered": len(unique_links),
+        "logs": logs,
+        "html_blob": compress_html(html_content) if inputs.get("compress") else None,
+    }
+
+
+def parse_pool(mode: Optional[str]) -> Optional[Executor]:
+    """
+    Pool partagé pour extract_page_record ("process" ou "thread"), créé au premier appel ;
+    None : extraction dans la boucle. Processus démarrés en "spawn" (pas de fork d'un
+    processus qui fait tourner des threads et un navigateur).
+    """
+    if mode not in PARSE_OFFLOAD_MODES:
+        return None
+    with _pools_lock:
+        pool = _pools.get(mode)
+        if pool is None:
+            if mode == "process":
+                pool = ProcessPoolExecutor(
+                    max_workers=PARSE_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                pool = ThreadPoolExecutor(max_workers=PARSE_POOL_WORKERS, thread_name_prefix="hotaru-parse")
+            _pools[mode] = pool
+        return pool
+
+
+def discard_parse_pool(mode: str):
+    """Retire un pool inutilisable (BrokenProcessPool) : le prochain appel en recrée un."""
+    with _pools_lock:
+        pool = _pools.pop(mode, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = [
+    "clean_title",
+    "discard_parse_pool",
+    "extract_jsonld_regex",
+    "extract_page_record",
+    "html_fallback",
+    "merge_jsonld",
+    "normalize_url",
+    "parse_pool",
+    "resolve_canonical",
+    "PARSE_OFFLOAD_MODES",
+    "PARSE_POOL_WORKERS",
+]
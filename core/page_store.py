@@ -0,0 +1,296 @@
+"""
+HTML complet des pages crawlées, compressé, hors des enregistrements (V1, hybride, V2).
+Les pages gardent un aperçu (html_content, HTML_PREVIEW_CHARS caractères) et une poignée
+html_ref (empreinte du HTML, sérialisable : points de reprise, sessions) ; page_html(page) rend le
+HTML complet à la demande. Structure DOM, clustering et score GEO portent sur la page entière
+sans garder des Mo de HTML en clair par page.
+- Compression zstd si le paquet `zstandard` est installé, sinon zlib (préfixe de codec dans le blob).
+- compress_html est pure : le crawl V2 compresse dans son pool d'extraction (core/page_record.py),
+  la boucle asyncio ne fait que ranger le blob.
+- Clé = empreinte blake2b du HTML : deux pages identiques (ou un re-crawl inchangé) partagent un blob.
+- Mémoire bornée (PAGE_STORE_MEMORY_MB) : au-delà, les blobs les plus anciens débordent sur un fichier
+  temporaire (supprimé à la fermeture) ; au-delà de PAGE_STORE_DISK_MB, ils sont abandonnés et
+  page_html retombe sur l'aperçu (journalisé, page marquée html_truncated).
+- Portée (scope) : chaque crawl range ses blobs sous son identifiant ; release(scope) libère ceux
+  qu'aucune autre portée ne retient (résultats remplacés en session, crawl annulé).
+- Les points de reprise (core/checkpoint.py) copient les blobs des pages qu'ils sauvegardent :
+  un crawl repris après redémarrage retrouve le HTML complet.
+HOTARU_PAGE_STORE=0 : store désactivé (HTML complet gardé dans html_content, comportement V1 historique).
+"""
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import zstandard
+except ImportError:  # dépendance optionnelle : zlib suffit
+    zstandard = None
+
+PAGE_STORE_MEMORY_MB = float(os.environ.get("HOTARU_PAGE_STORE_MB", "256"))
+PAGE_STORE_DISK_MB = float(os.environ.get("HOTARU_PAGE_STORE_DISK_MB", "4096"))
+HTML_PREVIEW_CHARS = 5120        # aperçu gardé dans la page (html_content)
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 3
+_DECODED_CACHE = 8               # derniers HTML décompressés gardés (score GEO : plusieurs lectures par page)
+logger = logging.getLogger(__name__)
+_shared_store: Optional["PageStore"] = None
+_shared_lock = threading.Lock()
+
+
+def compress_html(html: str) -> Tuple[str, bytes]:
+    """(clé, blob compressé) ; fonction pure, utilisable dans un processus du pool d'extraction."""
+    raw = html.encode("utf-8", errors="replace")
+    key = blake2b(raw, digest_size=16).hexdigest()
+    if zstandard is not None:
+        return key, b"s" + zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+    return key, b"z" + zlib.compress(raw, _ZLIB_LEVEL)
+
+
+def decompress_html(blob: bytes) -> str:
+    codec, payload = blob[:1], blob[1:]
+    if codec == b"s":
+        if zstandard is None:
+            raise ValueError("blob zstd : paquet zstandard absent")
+        raw = zstandard.ZstdDecompressor().decompress(payload)
+    else:
+        raw = zlib.decompress(payload)
+    return raw.decode("utf-8", errors="replace")
+
+
+class PageStore:
+    """
+    Blobs HTML compressés par clé, en mémoire puis sur disque. Thread-safe.
+
+    Usage :
+        key = store.put(html, scope)   # ou store.put_blob(*compress_html(html), scope=scope)
+        html = store.get(key)          # None si inconnu, abandonné ou libéré
+        store.release(scope)           # fin de vie des pages du crawl
+    """
+
+    def __init__(self, memory_mb: float = PAGE_STORE_MEMORY_MB, disk_mb: float = PAGE_STORE_DISK_MB):
+        self.memory_limit = int(memory_mb * 1024 * 1024)
+        self.disk_limit = int(disk_mb * 1024 * 1024)
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._disk: Dict[str, Tuple[int, int]] = {}      # clé → (offset, longueur) dans le fichier de débord
+        self._spill = None
+        self._decoded: "OrderedDict[str, str]" = OrderedDict()
+        self._owners: Dict[str, Set[str]] = {}           # clé → portées qui retiennent le blob
+        self._scopes: Dict[str, Set[str]] = {}           # portée → clés
+        self._reported: Set[str] = set()                 # clés manquantes déjà journalisées
+        self._lock = threading.Lock()
+        self.stats = {
+            "pages": 0,
+            "html_bytes": 0,
+            "stored_bytes": 0,
+            "memory_bytes": 0,
+            "disk_bytes": 0,
+            "deduplicated": 0,
+            "spilled": 0,
+            "dropped": 0,
+            "released": 0,
+            "misses": 0,
+        }
+
+    def put(self, html: str, scope: Optional[str] = None) -> str:
+        key, blob = compress_html(html)
+        return self.put_blob(key, blob, len(html), scope)
+
+    def put_blob(self, key: str, blob: bytes, html_size: int = 0, scope: Optional[str] = None) -> str:
+        """Range un blob déjà compressé (compress_html) sous `scope` ; retourne sa clé."""
+        with self._lock:
+            self._retain(key, scope)
+            if key in self._memory or key in self._disk:
+                self.stats["deduplicated"] += 1
+                return key
+            self._reported.discard(key)
+            self._memory[key] = blob
+            self.stats["pages"] += 1
+            self.stats["html_bytes"] += html_size
+            self.stats["stored_bytes"] += len(blob)
+            self.stats["memory_bytes"] += len(blob)
+            while self.stats["memory_bytes"] > self.memory_limit and len(self._memory) > 1:
+                self._spill_oldest()
+        return key
+
+    def _retain(self, key: str, scope: Optional[str]):
+        if scope is not None:
+            self._owners.setdefault(key, set()).add(scope)
+            self._scopes.setdefault(scope, set()).add(key)
+
+    def retain(self, keys: Iterable[str], scope: str):
+        """Ajoute `scope` aux portées qui retiennent ces blobs (pages reprises d'un crawl précédent)."""
+        with self._lock:
+            for key in keys:
+                if key and (key in self._memory or key in self._disk):
+                    self._retain(key, scope)
+
+    def release(self, scope: Optional[str]):
+        """Libère les blobs de `scope` qu'aucune autre portée ne retient."""
+        if scope is None:
+            return
+        with self._lock:
+            for key in self._scopes.pop(scope, ()):
+                owners = self._owners.get(key)
+                if owners is None:
+                    continue
+                owners.discard(scope)
+                if owners:
+                    continue
+                del self._owners[key]
+                self._decoded.pop(key, None)
+                blob = self._memory.pop(key, None)
+                if blob is not None:
+                    self.stats["memory_bytes"] -= len(blob)
+                elif key in self._disk:
+                    _, length = self._disk.pop(key)
+                    self.stats["disk_bytes"] -= length
+                else:
+                    continue
+                self.stats["released"] += 1
+            if not self._disk and self._spill is not None:
+                # Plus aucun blob sur disque : le fichier de débord repart de zéro
+                self._spill.close()
+                self._spill = None
+
+    def _spill_oldest(self):
+        key, blob = self._memory.popitem(last=False)
+        self.stats["memory_bytes"] -= len(blob)
+        if self.stats["disk_bytes"] + len(blob) > self.disk_limit:
+            self.stats["dropped"] += 1
+            return
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(prefix="hotaru-pages-")
+        self._spill.seek(0, os.SEEK_END)
+        offset = self._spill.tell()
+        self._spill.write(blob)
+        self._disk[key] = (offset, len(blob))
+        self.stats["disk_bytes"] += len(blob)
+        self.stats["spilled"] += 1
+
+    def _read_blob(self, key: str) -> Optional[bytes]:
+        blob = self._memory.get(key)
+        if blob is None and key in self._disk:
+            offset, length = self._disk[key]
+            self._spill.seek(offset)
+            blob = self._spill.read(length)
+        return blob
+
+    def get_blob(self, key: Optional[str]) -> Optional[bytes]:
+        """Blob compressé d'une clé (copie vers un point de reprise), None si inconnu."""
+        if not key:
+            return None
+        with self._lock:
+            return self._read_blob(key)
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        if not key:
+            return None
+        with self._lock:
+            html = self._decoded.get(key)
+            if html is not None:
+                self._decoded.move_to_end(key)
+                return html
+            blob = self._read_blob(key)
+            if blob is None:
+                self.stats["misses"] += 1
+                if key not in self._reported:
+                    self._reported.add(key)
+                    logger.warning("PageStore : HTML %s absent (abandonné ou libéré), aperçu tronqué utilisé", key)
+                return None
+        html = decompress_html(blob)
+        with self._lock:
+            self._decoded[key] = html
+            while len(self._decoded) > _DECODED_CACHE:
+                self._decoded.popitem(last=False)
+        return html
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory) + len(self._disk)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._disk.clear()
+            self._decoded.clear()
+            self._owners.clear()
+            self._scopes.clear()
+            self._reported.clear()
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+            for name in self.stats:
+                self.stats[name] = 0
+
+
+def get_page_store() -> Optional[PageStore]:
+    """Store partagé du processus (None si désactivé via HOTARU_PAGE_STORE=0)."""
+    global _shared_store
+    if os.environ.get("HOTARU_PAGE_STORE", "1") == "0":
+        return None
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = PageStore()
+        return _shared_store
+
+
+def attach_html(
+    page: Dict,
+    html: str,
+    store: Optional[PageStore] = None,
+    blob: Optional[Tuple[str, bytes]] = None,
+    scope: Optional[str] = None,
+) -> Dict:
+    """
+    Range le HTML complet d'une page dans le store : html_ref (clé), html_full_size, aperçu dans
+    html_content. `blob` : (clé, blob) déjà calculés par compress_html ; `scope` : portée du crawl
+    (cf. PageStore.release). Sans store, HTML gardé en clair.
+    """
+    store = store if store is not None else get_page_store()
+    page["html_full_size"] = len(html)
+    if store is None:
+        page["html_content"] = html
+        return page
+    key = store.put_blob(*blob, len(html), scope) if blob is not None else store.put(html, scope)
+    page["html_content"] = html[:HTML_PREVIEW_CHARS]
+    page["html_ref"] = key
+    return page
+
+
+def page_html(page: Dict, store: Optional[PageStore] = None) -> str:
+    """
+    HTML complet d'une page (store), sinon html_content (aperçu, ou HTML complet des anciens enregistrements).
+    Blob introuvable (abandonné, libéré, processus redémarré) : page marquée html_truncated=True.
+    """
+    if not isinstance(page, dict):
+        return ""
+    key = page.get("html_ref")
+    if key:
+        store = store if store is not None else get_page_store()
+        html = store.get(key) if store is not None else None
+        if html is not None:
+            return html
+        page["html_truncated"] = True
+    return page.get("html_content") or ""
+
+
+__all__ = [
+    "PageStore",
+    "attach_html",
+    "compress_html",
+    "decompress_html",
+    "get_page_store",
+    "page_html",
+    "HTML_PREVIEW_CHARS",
+    "PAGE_STORE_DISK_MB",
+    "PAGE_STORE_MEMORY_MB",
+]
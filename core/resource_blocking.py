@@ -0,0 +1,214 @@
+"""
+Blocage des ressources inutiles à l'audit pendant le rendu Playwright (crawl V2).
+L'audit n'exploite que le DOM, les liens, le JSON-LD et le texte : images, vidéos, polices et
+traceurs publicitaires / analytics sont interceptés (page.route) et abandonnés avant téléchargement.
+- Profils (BLOCK_PROFILES) : "media" (images, audio/vidéo, polices + traceurs, défaut du crawl V2),
+  "strict" (+ feuilles de style, sous-titres, manifestes), "trackers" (traceurs seuls) ; None : rien.
+- Un ResourceBlocker par crawl (profil, domaines supplémentaires de l'audit, compteurs) ; il voyage
+  dans CrawlerRunConfig.shared_data : un même navigateur (core/browser_pool.py) sert des crawls aux
+  profils différents. install_resource_blocking(crawler) branche le hook Crawl4AI une fois par navigateur.
+- Octets économisés : une requête abandonnée n'est jamais téléchargée, sa taille est estimée d'après
+  un poids moyen par type de ressource (TYPICAL_BYTES, ordre de grandeur du web actuel).
+googletagmanager.com n'est pas bloqué : des sites y injectent leur JSON-LD.
+"""
+import itertools
+import threading
+import weakref
+from collections import Counter
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+SHARED_DATA_KEY = "hotaru_resource_blocker"
+_MEDIA_TYPES = frozenset({"image", "media", "font"})
+BLOCK_PROFILES = {
+    "media": (_MEDIA_TYPES, True),
+    "strict": (_MEDIA_TYPES | {"stylesheet", "texttrack", "manifest"}, True),
+    "trackers": (frozenset(), True),
+}
+# Domaines publicitaires / analytics (sous-domaines compris)
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "analytics.google.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "facebook.com/tr",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "bat.bing.com",
+    "snap.licdn.com",
+    "analytics.tiktok.com",
+    "ads.linkedin.com",
+    "nr-data.net",
+    "js-agent.newrelic.com",
+)
+# Poids moyen d'une requête abandonnée (octets), par type de ressource Playwright
+TYPICAL_BYTES = {
+    "image": 45_000,
+    "media": 500_000,
+    "font": 35_000,
+    "stylesheet": 20_000,
+    "texttrack": 5_000,
+    "manifest": 2_000,
+    "script": 25_000,
+    "xhr": 3_000,
+    "fetch": 3_000,
+    "other": 3_000,
+}
+_blockers: "weakref.WeakValueDictionary[str, ResourceBlocker]" = weakref.WeakValueDictionary()
+_ids = itertools.count(1)
+
+
+def _matches_domain(url: str, domains: Iterable[str]) -> bool:
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().split(":")[0]
+    target = host + parsed.path.lower()
+    for domain in domains:
+        if "/" in domain:
+            if target.startswith(domain) or ("." + domain) in target:
+                return True
+        elif host == domain or host.endswith("." + domain):
+            return True
+    return False
+
+
+class ResourceBlocker:
+    """
+    Profil de blocage d'un crawl et ses compteurs. Thread-safe (routes exécutées dans la boucle
+    du navigateur, snapshot lu par le crawl).
+
+    Usage :
+        blocker = ResourceBlocker("media", extra_domains=["widget.example"])
+        CrawlerRunConfig(..., shared_data=blocker.shared_data())
+        stats["resource_blocking"] = blocker.snapshot()
+    """
+
+    def __init__(self, profile: str = "media", extra_domains: Optional[Iterable[str]] = None):
+        if profile not in BLOCK_PROFILES:
+            raise ValueError(f"Profil de blocage inconnu : {profile} (attendu : {', '.join(BLOCK_PROFILES)})")
+        self.profile = profile
+        self.types, block_trackers = BLOCK_PROFILES[profile]
+        extra = tuple(d.lower().strip() for d in (extra_domains or ()) if d and d.strip())
+        self.domains = (TRACKER_DOMAINS if block_trackers else ()) + extra
+        self.id = f"blocker-{next(_ids)}"
+        self._lock = threading.Lock()
+        self.reset()
+        _blockers[self.id] = self
+
+    def reset(self):
+        with self._lock:
+            self._blocked = Counter()
+            self._trackers = 0
+            self._bytes_saved = 0
+            self._pages = 0
+
+    def shared_data(self) -> Dict[str, str]:
+        """À passer à CrawlerRunConfig(shared_data=...) (identifiant seul : la config peut être copiée)."""
+        return {SHARED_DATA_KEY: self.id}
+
+    def verdict(self, resource_type: str, url: str) -> Optional[str]:
+        """Motif du blocage ("tracker" ou le type de ressource), None si la requête passe."""
+        if resource_type == "document":
+            return None  # page (ou iframe) : jamais bloquée
+        if self.domains and _matches_domain(url, self.domains):
+            return "tracker"
+        if resource_type in self.types:
+            return resource_type
+        return None
+
+    def record(self, reason: str, resource_type: str):
+        with self._lock:
+            self._blocked[resource_type] += 1
+            if reason == "tracker":
+                self._trackers += 1
+            self._bytes_saved += TYPICAL_BYTES.get(resource_type, TYPICAL_BYTES["other"])
+
+    async def handle_route(self, route):
+        """Handler page.route("**/*") : abandonne les requêtes bloquées, laisse passer les autres."""
+        request = route.request
+        try:
+            reason = self.verdict(request.resource_type, request.url)
+            if reason is None:
+                await route.fallback()
+                return
+            self.record(reason, request.resource_type)
+            await route.abort("blockedbyclient")
+        except Exception:
+            pass  # page déjà fermée
+
+    def page_opened(self):
+        with self._lock:
+            self._pages += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            blocked = sum(self._blocked.values())
+            return {
+                "profile": self.profile,
+                "pages": self._pages,
+                "blocked": blocked,
+                "blocked_by_type": dict(self._blocked),
+                "blocked_trackers": self._trackers,
+                "bytes_saved": self._bytes_saved,
+                "bytes_saved_per_page": self._bytes_saved // self._pages if self._pages else 0,
+            }
+
+
+def blocker_for(config) -> Optional[ResourceBlocker]:
+    """ResourceBlocker désigné par CrawlerRunConfig.shared_data (None : pas de blocage)."""
+    shared = getattr(config, "shared_data", None) or {}
+    blocker_id = shared.get(SHARED_DATA_KEY) if isinstance(shared, dict) else None
+    return _blockers.get(blocker_id) if blocker_id else None
+
+
+async def _on_page_context_created(page, context=None, config=None, **kwargs):
+    """Hook Crawl4AI : route d'interception sur chaque nouvelle page d'un crawl avec profil."""
+    blocker = blocker_for(config)
+    if blocker is not None:
+        blocker.page_opened()
+        await page.route("**/*", blocker.handle_route)
+    return page
+
+
+def install_resource_blocking(crawler):
+    """Branche le hook sur un AsyncWebCrawler (sans effet sur les arun sans ResourceBlocker)."""
+    strategy = getattr(crawler, "crawler_strategy", None)
+    if strategy is not None and hasattr(strategy, "set_hook"):
+        strategy.set_hook("on_page_context_created", _on_page_context_created)
+    return crawler
+
+
+def make_resource_blocker(profile, extra_domains=None) -> Optional[ResourceBlocker]:
+    """None / False : pas de blocage ; True : profil "media" ; nom de profil ; ou ResourceBlocker déjà construit."""
+    if isinstance(profile, ResourceBlocker):
+        return profile
+    if not profile:
+        return None
+    return ResourceBlocker("media" if profile is True else profile, extra_domains)
+
+
+__all__ = [
+    "ResourceBlocker",
+    "blocker_for",
+    "install_resource_blocking",
+    "make_resource_blocker",
+    "BLOCK_PROFILES",
+    "SHARED_DATA_KEY",
+    "TRACKER_DOMAINS",
+    "TYPICAL_BYTES",
+]
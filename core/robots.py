@@ -0,0 +1,215 @@
+"""
+robots.txt partagé par un audit : lu une fois par host, réutilisé par le crawl et le panneau
+d'accessibilité IA (views/audit_geo.check_ai_accessibility).
+- Règles RFC 9309 : groupe du user-agent le plus spécifique (sinon "*"), règle la plus longue
+  gagnante, Allow prioritaire à longueur égale, jokers "*" et "$".
+- robots.txt absent (4xx, comme Google) ou injoignable (5xx, réseau : choix volontaire, un robots.txt
+  instable ne doit pas vider l'audit) : tout est autorisé.
+- Crawl-delay : CrawlDelayScheduler espace les requêtes vers un même host (plafonné à
+  ROBOTS_MAX_CRAWL_DELAY pour qu'un audit reste borné dans le temps).
+"""
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+ROBOTS_TIMEOUT = 5
+ROBOTS_USER_AGENT = "hotaru"     # jeton comparé aux lignes User-agent (sinon groupe "*")
+ROBOTS_MAX_CRAWL_DELAY = 10.0    # secondes max entre deux requêtes vers un même host
+ROBOTS_MAX_BYTES = 512 * 1024    # au-delà, le reste du fichier est ignoré (limite RFC 9309 : 500 Kio)
+_BROWSER_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url if "://" in url else "https://" + url)
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+
+def _rule_regex(path: str):
+    """Motif robots.txt → regex ancrée au début du chemin ("*" = n'importe quoi, "$" final = fin)."""
+    anchored = path.endswith("$")
+    body = re.escape(path[:-1] if anchored else path).replace(r"\*", ".*")
+    return re.compile(body + ("$" if anchored else ""))
+
+
+class RobotsRules:
+    """robots.txt analysé : groupes par user-agent, Crawl-delay, Sitemap."""
+
+    def __init__(self, content: str = "", status: int = 200):
+        self.content = content or ""
+        self.status = status
+        self.sitemaps: List[str] = []
+        # user-agent (minuscules) → {"rules": [(longueur, allow, regex)], "delay": float|None}
+        self._groups: Dict[str, Dict] = {}
+        if status == 200:
+            self._parse(self.content[:ROBOTS_MAX_BYTES])
+
+    @property
+    def found(self) -> bool:
+        return self.status == 200
+
+    def _parse(self, content: str):
+        agents: List[str] = []
+        in_rules = False
+        for raw in content.splitlines():
+            line = raw.split("#", 1)[0].strip()
+            key, sep, value = line.partition(":")
+            if not sep:
+                continue
+            key, value = key.strip().lower(), value.strip()
+            if key == "sitemap":
+                if value:
+                    self.sitemaps.append(value)
+                continue
+            if key == "user-agent":
+                if in_rules:
+                    agents, in_rules = [], False
+                agents.append(value.lower())
+                for agent in agents:
+                    self._groups.setdefault(agent, {"rules": [], "delay": None})
+                continue
+            if not agents:
+                continue
+            in_rules = True
+            for agent in agents:
+                group = self._groups[agent]
+                if key in ("allow", "disallow"):
+                    if value:  # "Disallow:" vide = tout autorisé
+                        group["rules"].append((len(value), key == "allow", _rule_regex(value)))
+                elif key == "crawl-delay":
+                    try:
+                        group["delay"] = max(0.0, float(value))
+                    except ValueError:
+                        pass
+
+    def _group(self, user_agent: str) -> Optional[Dict]:
+        ua = user_agent.lower()
+        matches = [agent for agent in self._groups if agent and agent != "*" and agent in ua]
+        if matches:
+            return self._groups[max(matches, key=len)]
+        return self._groups.get("*")
+
+    def allowed(self, url: str, user_agent: str = ROBOTS_USER_AGENT) -> bool:
+        group = self._group(user_agent)
+        if not group or not group["rules"]:
+            return True
+        parsed = urlparse(url)
+        path = (parsed.path or "/") + ("?" + parsed.query if parsed.query else "")
+        best: Tuple[int, bool] = (-1, True)
+        for length, allow, regex in group["rules"]:
+            if regex.match(path) and (length, allow) > best:
+                best = (length, allow)
+        return best[1]
+
+    def crawl_delay(self, user_agent: str = ROBOTS_USER_AGENT) -> Optional[float]:
+        group = self._group(user_agent)
+        return group["delay"] if group else None
+
+
+class RobotsCache:
+    """
+    robots.txt par origine (schéma + host), téléchargé une seule fois (thread-safe).
+    Partagé entre le crawl et les analyses de l'audit : run_unified_site_analysis en crée un par audit.
+    """
+
+    def __init__(self, session=None, user_agent: str = ROBOTS_USER_AGENT, timeout: int = ROBOTS_TIMEOUT):
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": _BROWSER_UA})
+        self.session = session
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._rules: Dict[str, RobotsRules] = {}
+        self._lock = threading.Lock()
+        self._origin_locks: Dict[str, threading.Lock] = {}
+        self.stats = {"fetched": 0}
+
+    def rules(self, url: str) -> RobotsRules:
+        """Règles de l'origine de `url` (téléchargées au premier appel)."""
+        origin = _origin(url)
+        rules = self._rules.get(origin)
+        if rules is not None:
+            return rules
+        with self._lock:
+            origin_lock = self._origin_locks.setdefault(origin, threading.Lock())
+        with origin_lock:
+            rules = self._rules.get(origin)
+            if rules is None:
+                rules = self._fetch(origin)
+                self._rules[origin] = rules
+        return rules
+
+    def _fetch(self, origin: str) -> RobotsRules:
+        self.stats["fetched"] += 1
+        try:
+            resp = self.session.get(origin + "/robots.txt", timeout=self.timeout)
+        except Exception:
+            return RobotsRules(status=0)
+        return RobotsRules(resp.text if resp.status_code == 200 else "", resp.status_code)
+
+    def allowed(self, url: str) -> bool:
+        return self.rules(url).allowed(url, self.user_agent)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        return self.rules(url).crawl_delay(self.user_agent)
+
+    def sitemaps(self, url: str) -> List[str]:
+        return list(self.rules(url).sitemaps)
+
+
+class CrawlDelayScheduler:
+    """
+    Espacement des requêtes par host selon le Crawl-delay de robots.txt.
+    reserve(url) réserve le prochain créneau du host et retourne l'attente en secondes :
+    time.sleep (threads V1) ou asyncio.sleep (workers V2) côté appelant.
+    """
+
+    def __init__(self, robots: RobotsCache, max_delay: float = ROBOTS_MAX_CRAWL_DELAY):
+        self.robots = robots
+        self.max_delay = max_delay
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats = {"waits": 0, "wait_s": 0.0, "delays": {}}
+
+    def reserve(self, url: str) -> float:
+        delay = self.robots.crawl_delay(url)
+        if not delay:
+            return 0.0
+        delay = min(delay, self.max_delay)
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            self.stats["delays"][host] = delay
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + delay
+            wait = slot - now
+            if wait > 0:
+                self.stats["waits"] += 1
+                self.stats["wait_s"] = round(self.stats["wait_s"] + wait, 3)
+        return wait
+
+    def wait(self, url: str):
+        """Attente bloquante jusqu'au créneau du host (threads)."""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+
+def make_robots(robots, session=None) -> Optional[RobotsCache]:
+    """Paramètre robots des scrapers : True (cache dédié), False/None (robots.txt ignoré) ou RobotsCache partagé."""
+    if robots is True:
+        return RobotsCache(session=session)
+    return robots or None
+
+
+__all__ = [
+    "RobotsCache",
+    "RobotsRules",
+    "CrawlDelayScheduler",
+    "make_robots",
+    "ROBOTS_MAX_CRAWL_DELAY",
+    "ROBOTS_USER_AGENT",
+]
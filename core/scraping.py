@@ -2,39 +2,97 @@
 SMART SCRAPER UNIVERSEL (core/scraping.py)
 - Sites normaux : requests rapide.
 - Sites protégés (ex. BMW) : use_selenium=True ou cascade timeout (requests → requests-html → Selenium non-headless).
+  La méthode gagnante est mémorisée par host, les méthodes en échec répété passent en cooldown.
 - Proxy optionnel (requests + Selenium).
-- JSON-LD : extraction double (soup + DOM Selenium) fusionnée sans doublons.
+- Extraction des champs en une passe lxml (core/page_extractor.py).
+- Re-crawl incrémental (baseline=IncrementalBaseline) : frontier amorcé par le crawl précédent,
+  pages inchangées reprises sans re-téléchargement, rapport nouvelles/modifiées/supprimées.
+- Cache HTTP disque conditionnel (core/http_cache.py) : un 304 réutilise corps et extraction ;
+  last_modified rempli depuis l'en-tête Last-Modified.
+- JSON-LD : extraction double (HTML + DOM Selenium) fusionnée sans doublons.
+- Mode concurrent (workers > 1) : pool de threads sur le frontier, sortie identique au séquentiel.
+- robots.txt respecté (core/robots.py) : URLs interdites écartées avant le frontier, Crawl-delay
+  appliqué par host ; cache robots partageable avec le reste de l'audit.
+- Concurrence et débit adaptatifs par host (core/host_limiter.py) : backoff sur 429/5xx,
+  Retry-After respecté, URL limitée réessayée ; décisions dans stats["host_limits"].
+- Téléchargements bornés (core/bounded_fetch.py) : Content-Type vérifié avant le corps, non-HTML
+  écarté sans téléchargement, corps coupé au-delà de max_page_bytes.
+- Quasi-doublons (SimHash du texte, core/simhash.py) : near_duplicates="flag" marque la page
+  (near_duplicate_of), "drop" l'écarte sans consommer le budget ni suivre ses liens.
+- rel=canonical : URL canonique (même domaine) relevée sur chaque page ("canonical") ; une URL
+  dont la canonique est déjà retenue n'est ni gardée ni re-téléchargée (duplicate_log : (url, raison)).
+- sitemap_seed=True : frontier amorcé par les sitemaps (robots.txt, index développés en parallèle,
+  core/sitemaps.py) ; lastmod du sitemap reporté sur les pages ("sitemap_lastmod").
+- frontier="priority" : crawl best-first qui couvre un maximum de templates d'URL dans max_urls
+  (core/frontier.py PriorityFrontier) au lieu du BFS historique.
+- En mode Selenium, pages rendues par un pool de drivers Chrome recyclés (core/selenium_pool.py).
 - Utilisé par audit, GEO, et tous les modules.
 """
 import requests
 
 # Constantes (timeout requests, filtres URL)
 REQUEST_TIMEOUT = 15
+MAX_QUEUE_LINKS_V1 = 5000   # URLs du frontier gardées en mémoire (au-delà : débordement disque)
 EXCLUDE_PATTERNS_V1 = (
     ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".zip",
     ".doc", ".docx", "tel:", "mailto:", "javascript:", "void(0)",
 )
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin, urlunparse
 import time
 import re
 import json
+import asyncio
+import threading
+import uuid
+from collections import deque
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
 from core.selenium_utils import create_chrome_driver, get_chrome_options
+from core.selenium_pool import DriverPool, DRIVER_MAX_PAGES
+from core.fetch_strategy import FetchStrategyMemory
+from core.page_extractor import extract_page_fields, decode_html
+from core.http_cache import get_http_cache, http_date_to_iso
+from core.incremental import content_hash
+from core.page_store import attach_html, get_page_store
+from core.sitemaps import fetch_sitemap_entries
+from core.robots import CrawlDelayScheduler, make_robots
+from core.host_limiter import LIMITER_MAX_RETRIES, make_host_limiter
+from core.bounded_fetch import FETCH_MAX_BYTES, ResponseRejected, bounded_get
+from core.simhash import NEAR_DUPLICATE_MODES, NearDuplicateIndex
+from core.checkpoint import CrawlCheckpoint
+from core.frontier import CanonicalIndex, Frontier, PriorityFrontier, make_visited, load_visited, BLOOM_FP_RATE
 
 
 class SmartScraper:
-    def __init__(self, start_urls, max_urls=500, use_selenium=False, selenium_mode=None, log_callback=None, proxy=None, extra_domains=None):
+    def __init__(self, start_urls, max_urls=500, use_selenium=False, selenium_mode=None, log_callback=None, proxy=None, extra_domains=None, workers=1, http_cache=True, baseline=None, checkpoint=None, visited_mode="compact", visited_fp_rate=BLOOM_FP_RATE, frontier="bfs", sitemap_seed=False, robots=True, host_limits=True, max_page_bytes=FETCH_MAX_BYTES, near_duplicates="flag"):
         """
         Args:
             selenium_mode: "light" pour eager loading + wait JSON-LD, None sinon
             proxy: "http://ip:port" ou "http://user:pass@ip:port" pour requests et Selenium
             extra_domains: liste d'URLs ou domaines rattachés (site multi-domaines)
+            workers: nombre de pages récupérées en parallèle (mode requests). 1 = séquentiel
+            http_cache: True = cache disque conditionnel partagé (ETag/Last-Modified), False = désactivé,
+                ou instance HttpCache dédiée
+            baseline: IncrementalBaseline du crawl précédent (re-crawl incrémental, core/incremental.py)
+            checkpoint: CrawlCheckpoint ou chemin de fichier : points de reprise périodiques (cf. resume)
+            visited_mode: URLs vues en "compact" (empreintes 64 bits), "bloom" (filtre de Bloom,
+                faux positifs à visited_fp_rate) ou "exact" (set de chaînes), cf. core/frontier.py
+            frontier: "bfs" (largeur d'abord, historique) ou "priority" (best-first : templates d'URL
+                peu échantillonnés, pages peu profondes et <priority> sitemap élevée d'abord)
+            sitemap_seed: True = URLs des sitemaps (robots.txt / sitemap.xml) ajoutées au frontier
+                après les URLs de départ : pages profondes atteintes sans parcourir les liens
+            robots: True = robots.txt respecté (Disallow, Crawl-delay), False = ignoré,
+                ou RobotsCache partagé avec l'audit (robots.txt lu une seule fois)
+            host_limits: True = concurrence/débit adaptatifs par host (plafond : workers),
+                False = désactivé, ou HostLimiter partagé (cf. core/host_limiter.py)
+            max_page_bytes: taille max d'une page décompressée (octets) ; au-delà, page écartée
+            near_duplicates: "flag" = quasi-doublons marqués (near_duplicate_of), "drop" = écartés
+                (journalisés dans duplicate_log, hors budget max_urls), None = pas de détection
         """
         # Support ancien format (string unique) et nouveau (liste)
         if isinstance(start_urls, str):
@@ -58,13 +116,42 @@ class SmartScraper:
         self.start_urls = [self.normalize_url(url) for url in start_urls]
         self.base_url = self.start_urls[0]
         self.max_urls = max_urls
-        self.visited = set()
+        self.visited_mode = visited_mode
+        self.visited_fp_rate = visited_fp_rate
+        self.visited = make_visited(visited_mode, visited_fp_rate)
+        self.frontier_mode = frontier
+        self.sitemap_seed = sitemap_seed
+        self._sitemap_entries = None  # sitemap lu une fois par crawl (priority, lastmod)
+        self._templates = set()       # patterns d'URL des pages retenues (stats["templates_crawled"])
+        self._pattern_groups = set()  # groupes analyze_patterns des pages retenues (crawl_summary sans results)
+        self.near_duplicates = near_duplicates if near_duplicates in NEAR_DUPLICATE_MODES else None
+        self._near_dups = NearDuplicateIndex() if self.near_duplicates else None
+        self._canonicals = CanonicalIndex()  # clés rel=canonical des pages retenues
         self.results = []
         self.use_selenium = use_selenium
         self.selenium_mode = selenium_mode
         self.driver = None
+        self._driver_pool = None
+        # Méthode gagnante + circuit breakers par host (cascade sites protégés)
+        self._strategy = FetchStrategyMemory()
         self.log_callback = log_callback
         self.proxy = proxy
+        self.workers = max(1, int(workers or 1))
+        self.max_page_bytes = max_page_bytes
+        self._stats_lock = threading.Lock()
+        # Cache HTTP conditionnel (re-crawls : 304 → corps et extraction réutilisés)
+        self._http_cache = get_http_cache() if http_cache is True else (http_cache or None)
+        # HTML complet compressé hors des pages (core/page_store.py) : html_ref + aperçu html_content,
+        # blobs rangés sous la portée du crawl (libérés par page_store.release(page_scope))
+        self._page_store = get_page_store()
+        self.page_scope = uuid.uuid4().hex
+        # Re-crawl incrémental : pages inchangées reprises du crawl précédent
+        self._baseline = baseline
+        self._failed_urls = []
+        # Points de reprise (crawls longs) : frontier restauré par resume()
+        self._checkpoint = CrawlCheckpoint.coerce(checkpoint)
+        self._resume_frontier = None
+        self._resumed_pages = 0
 
         # Vérifier que toutes les URLs de départ sont du même domaine
         for url in self.start_urls:
@@ -79,6 +166,16 @@ class SmartScraper:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept-Language": "fr-FR,fr;q=0.9",
         })
+        # Pool de connexions dimensionné pour les workers (urllib3 = 10 par défaut)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max(10, self.workers))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # robots.txt : filtrage avant le frontier + espacement Crawl-delay par host
+        self._robots = make_robots(robots, self.session)
+        self._crawl_delay = CrawlDelayScheduler(self._robots) if self._robots is not None else None
+        # Concurrence/débit par host : statut et Retry-After de la dernière réponse, par thread
+        self._host_limiter = make_host_limiter(host_limits, self.workers)
+        self._last_response = threading.local()
 
         # Compteurs
         self.stats = {
@@ -89,6 +186,17 @@ class SmartScraper:
             "links_duplicate": 0,
             "errors": 0,
             "queue_full_blocks": 0,
+            "frontier_spilled": 0,
+            "frontier_peak": 0,
+            "templates_crawled": 0,
+            "sitemap_urls": 0,
+            "sitemap_seeded": 0,
+            "robots_blocked": 0,
+            "throttle_retries": 0,
+            "rejected_non_html": 0,
+            "rejected_too_large": 0,
+            "near_duplicates": 0,
+            "canonical_duplicates": 0,
             "start_urls_count": len(self.start_urls),
             "protected_sites_detected": 0,
             "advanced_solutions_used": 0,
@@ -96,6 +204,10 @@ class SmartScraper:
             "selenium_headless_successes": 0,
             "selenium_nonheadless_successes": 0,
             "proxy_used": self.proxy or "Aucun",
+            "workers": self.workers,
+            "http_cache_hits": 0,
+            "incremental_skipped": 0,
+            "incremental_not_modified": 0,
         }
 
         self.filtered_log = []
@@ -110,6 +222,8 @@ class SmartScraper:
         for i, url in enumerate(self.start_urls, 1):
             self._log(f"   {i}. {url}")
         self._log(f"Proxy : {self.proxy if self.proxy else 'Aucun'}")
+        if self.workers > 1:
+            self._log(f"Workers : {self.workers} pages en parallèle")
 
         if use_selenium:
             self._log("Mode Selenium activé")
@@ -123,6 +237,16 @@ class SmartScraper:
             if self.driver is None:
                 self._log("Selenium échoué → Fallback requests")
                 self.use_selenium = False
+            elif self.workers > 1:
+                # Le driver initial amorce le pool ; les autres sont créés à la demande
+                self._driver_pool = DriverPool(
+                    size=self.workers,
+                    proxy=self.proxy,
+                    max_pages_per_driver=DRIVER_MAX_PAGES,
+                    log_callback=self._log,
+                    seed_driver=self.driver,
+                )
+                self._log(f"Pool Selenium : {self.workers} drivers max, recyclage toutes les {DRIVER_MAX_PAGES} pages")
 
     def normalize_url(self, url):
         """Normalise une URL pour éviter les doublons."""
@@ -141,6 +265,11 @@ class SmartScraper:
         if self.log_callback:
             self.log_callback(message)
 
+    def _inc_stat(self, key, n=1):
+        """Incrémente un compteur de self.stats (thread-safe, appelé depuis les workers)."""
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
     def _init_selenium(self):
         """Initialise Selenium - Compatible Streamlit Cloud."""
         try:
@@ -213,22 +342,6 @@ class SmartScraper:
         text = text.strip()
         return text[:40] + ".." if len(text) > 40 else text
 
-    def _extract_jsonld_from_soup(self, soup):
-        """Extraction JSON-LD classique depuis les balises <script type=\"application/ld+json\"> du HTML."""
-        out = []
-        for script in soup.find_all("script"):
-            t = (script.get("type") or "").lower()
-            if "ld+json" not in t:
-                continue
-            try:
-                raw = script.string or script.get_text(strip=True) or ""
-                if not raw.strip():
-                    continue
-                out.append(json.loads(raw))
-            except (json.JSONDecodeError, TypeError):
-                continue
-        return out
-
     def _merge_jsonld_no_duplicates(self, list_a, list_b=None):
         """Fusionne deux listes de blocs JSON-LD et supprime les doublons (comparaison canonique)."""
         list_b = list_b or []
@@ -247,20 +360,16 @@ class SmartScraper:
                 continue
         return merged
 
-    def _build_page_result(self, url, soup, html_content, response_time, raw_links=None, json_ld_data=None):
-        """Construit le dict de résultat standard à partir de HTML/soup."""
+    def _build_page_result(self, url, fields, html_content, response_time, raw_links=None, json_ld_data=None, last_modified=""):
+        """Construit le dict de résultat standard à partir des champs extraits (core.page_extractor)."""
         if raw_links is None:
-            raw_links = [a["href"] for a in soup.find_all("a", href=True)]
+            raw_links = fields["links"]
         if json_ld_data is None:
-            json_ld_data = self._extract_jsonld_from_soup(soup)
+            json_ld_data = fields["json_ld"]
 
-        raw_title = (soup.title.get_text(strip=True) if soup.title else "") or ""
-        h1 = soup.find("h1").get_text().strip() if soup.find("h1") else ""
-        final_title = self.clean_title(raw_title, h1, url)
-        meta_desc = ""
-        meta_tag = soup.find("meta", attrs={"name": "description"})
-        if meta_tag and meta_tag.get("content"):
-            meta_desc = meta_tag["content"].strip()
+        h1 = fields["h1"]
+        final_title = self.clean_title(fields["title"], h1, url)
+        meta_desc = fields["description"]
 
         normalized_current = self.normalize_url(url)
         links = []
@@ -277,11 +386,11 @@ class SmartScraper:
                 if clean_link != normalized_current:
                     links.append(clean_link)
             else:
-                self.stats["links_filtered"] += 1
+                self._inc_stat("links_filtered")
         unique_links = list(set(links))
-        self.stats["links_discovered"] += len(unique_links)
+        self._inc_stat("links_discovered", len(unique_links))
 
-        return {
+        page = {
             "url": url,
             "title": final_title,
             "links": unique_links,
@@ -289,59 +398,158 @@ class SmartScraper:
             "h1": h1,
             "response_time": response_time,
             "html_content": html_content,
-            "last_modified": "",
+            "last_modified": last_modified,
             "has_structured_data": bool(json_ld_data),
             "json_ld": json_ld_data,
-            "h2_count": len(soup.find_all("h2")),
-            "lists_count": len(soup.find_all(["ul", "ol"])),
+            "h2_count": fields["h2_count"],
+            "lists_count": fields["lists_count"],
+            "simhash": fields.get("simhash"),
+            "canonical": self._resolve_canonical(url, fields.get("canonical")),
         }
+        attach_html(page, html_content, self._page_store, scope=self.page_scope)
+        page["content_hash"] = content_hash(page)
+        return page
+
+    def _http_get(self, url):
+        """
+        GET requests (proxy, cache conditionnel). La réponse porte from_cache / cached_fields si revalidée.
+        En re-crawl incrémental, les validateurs du crawl précédent sont envoyés (304 possible sans cache local).
+        """
+        request_proxies = {}
+        if self.proxy:
+            request_proxies = {"http": self.proxy, "https": self.proxy}
+        headers = self._baseline.conditional_headers(url) if self._baseline is not None else {}
+        self._last_response.outcome = {"error": True}
+        try:
+            if self._http_cache is None:
+                resp = bounded_get(
+                    self.session, url, max_bytes=self.max_page_bytes,
+                    timeout=REQUEST_TIMEOUT, proxies=request_proxies, headers=headers,
+                )
+                resp.from_cache, resp.cached_fields = False, None
+            else:
+                resp = self._http_cache.get(
+                    self.session, url, max_bytes=self.max_page_bytes,
+                    timeout=REQUEST_TIMEOUT, proxies=request_proxies, headers=headers,
+                )
+                if resp.from_cache:
+                    self._inc_stat("http_cache_hits")
+        except ResponseRejected as e:
+            self._last_response.outcome = {"status": e.status}
+            non_html = e.reason == "content_type"
+            self._inc_stat("rejected_non_html" if non_html else "rejected_too_large")
+            self.filtered_log.append((url, f"{'non HTML' if non_html else 'trop volumineuse'} ({e.detail})"))
+            self._log(f"   Écartée : {e}")
+            raise
+        elapsed = getattr(resp, "elapsed", None)
+        self._last_response.outcome = {
+            "status": resp.status_code,
+            "retry_after": resp.headers.get("Retry-After"),
+            "latency": elapsed.total_seconds() if elapsed is not None else None,
+        }
+        return resp
+
+    def _not_modified_page(self, url, resp):
+        """Page inchangée (304 sur les validateurs du crawl précédent) : enregistrement précédent, sinon None."""
+        if resp.status_code != 304 or self._baseline is None or not self._baseline.can_carry(url):
+            return None
+        self._inc_stat("incremental_not_modified")
+        self._log("   304 : inchangée depuis le crawl précédent")
+        return self._baseline.carry_forward(url)
+
+    def _page_fields(self, url, resp, html_content):
+        """Champs extraits : ceux du cache si la page n'a pas changé (304), sinon extraction lxml."""
+        if resp.cached_fields is not None:
+            return resp.cached_fields
+        fields = extract_page_fields(html_content)
+        if self._http_cache is not None:
+            self._http_cache.store_fields(url, fields)
+        return fields
 
     def _get_with_requests(self, url):
         """Méthode A : requests classique. Retourne le dict résultat ou lève Timeout/RequestException."""
         start_time = time.time()
         self._log(f" [Requests] {url}")
-        request_proxies = {}
         if self.proxy:
-            request_proxies = {"http": self.proxy, "https": self.proxy}
             self._log(f"   Proxy : {self.proxy}")
-        resp = self.session.get(url, timeout=REQUEST_TIMEOUT, proxies=request_proxies)
+        resp = self._http_get(url)
         response_time = time.time() - start_time
+        carried = self._not_modified_page(url, resp)
+        if carried is not None:
+            return carried
         if resp.status_code != 200:
             self._log(f"   HTTP {resp.status_code}")
-            self.stats["errors"] += 1
+            self._inc_stat("errors")
             raise requests.exceptions.HTTPError(f"HTTP {resp.status_code}")
-        soup = BeautifulSoup(resp.content, "html.parser")
-        html_content = str(soup)
-        raw_links = [a["href"] for a in soup.find_all("a", href=True)]
-        self._log(f"   {len(html_content)} chars")
-        return self._build_page_result(url, soup, html_content, response_time, raw_links=raw_links)
+        html_content = decode_html(resp.content)
+        fields = self._page_fields(url, resp, html_content)
+        self._log(f"   {len(html_content)} chars{' (304, cache)' if resp.from_cache else ''}")
+        page = self._build_page_result(
+            url, fields, html_content, response_time,
+            last_modified=http_date_to_iso(resp.headers.get("Last-Modified")),
+        )
+        page["etag"] = resp.headers.get("ETag", "")
+        return page
 
     def _get_with_requests_html(self, url):
         """
         Méthode B : requests-html (JavaScript rendu).
         Idéal pour CloudFlare et sites protégés.
-        Retourne dict avec html_content, soup, raw_links, response_time pour _build_page_result.
+        Retourne dict avec html_content, fields, raw_links, response_time pour _build_page_result.
         """
-        try:
-            from requests_html import HTMLSession
-        except ImportError:
-            raise RuntimeError("requests-html non installé. pip install requests-html")
-
         start_time = time.time()
-        session = HTMLSession()
-        resp = session.get(url, timeout=REQUEST_TIMEOUT)
-        resp.html.render()
+        session = self._new_html_session()
+        try:
+            resp = session.get(url, timeout=REQUEST_TIMEOUT)
+            resp.html.render()
+            html = resp.html.html
+        finally:
+            try:
+                session.close()
+            except Exception:
+                pass
         response_time = time.time() - start_time
-        html = resp.html.html
-        soup = BeautifulSoup(html, "html.parser")
-        raw_links = [a.get("href", "") for a in soup.find_all("a", href=True)]
+        fields = extract_page_fields(html)
         return {
             "html_content": html,
-            "soup": soup,
-            "raw_links": raw_links,
+            "fields": fields,
+            "raw_links": fields["links"],
             "response_time": response_time,
         }
 
+    def _new_html_session(self):
+        """
+        Crée une HTMLSession utilisable hors du thread principal (workers, thread Streamlit) :
+        boucle asyncio propre au thread et Chromium lancé sans handlers de signaux
+        (signal.signal n'est autorisé que dans le thread principal).
+        """
+        try:
+            from requests_html import HTMLSession
+        except ImportError:
+            raise RuntimeError("requests-html non installé. pip install requests-html")
+
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+        session = HTMLSession()
+        if threading.current_thread() is not threading.main_thread():
+            import pyppeteer
+            session.loop = loop
+            session._browser = loop.run_until_complete(pyppeteer.launch(
+                ignoreHTTPSErrors=not session.verify,
+                headless=True,
+                args=["--no-sandbox"],
+                handleSIGINT=False,
+                handleSIGTERM=False,
+                handleSIGHUP=False,
+            ))
+        return session
+
     def _create_headless_driver(self):
         """Crée un driver Chrome headless (utilise la factory centralisée)."""
         return create_chrome_driver(
@@ -366,12 +574,11 @@ class SmartScraper:
             time.sleep(3)
             html = driver.page_source
             response_time = time.time() - start_time
-            soup = BeautifulSoup(html, "html.parser")
-            raw_links = [a.get("href", "") for a in soup.find_all("a", href=True)]
+            fields = extract_page_fields(html)
             return {
                 "html_content": html,
-                "soup": soup,
-                "raw_links": raw_links,
+                "fields": fields,
+                "raw_links": fields["links"],
                 "response_time": response_time,
             }
         finally:
@@ -396,12 +603,11 @@ class SmartScraper:
             time.sleep(10)
             html = driver.page_source
             response_time = time.time() - start_time
-            soup = BeautifulSoup(html, "html.parser")
-            raw_links = [a.get("href", "") for a in soup.find_all("a", href=True)]
+            fields = extract_page_fields(html)
             return {
                 "html_content": html,
-                "soup": soup,
-                "raw_links": raw_links,
+                "fields": fields,
+                "raw_links": fields["links"],
                 "response_time": response_time,
             }
         finally:
@@ -414,261 +620,315 @@ class SmartScraper:
             return True
         return isinstance(e, (requests.exceptions.Timeout, TimeoutError))
 
-    def get_page_details(self, url):
-        """Scrape une page. Cascade automatique vers solutions avancées si timeout (sites protégés type BMW)."""
-        try:
-            start_time = time.time()
-            json_ld_from_js = []
+    def _render_with_selenium(self, driver, url, start_time, accept_cookies=True):
+        """
+        Rendu d'une page avec un driver Selenium (driver unique ou emprunté au pool).
+        Retourne dict html_content, fields, raw_links, json_ld_from_js, response_time.
+        accept_cookies=False : bannière déjà acceptée dans cette session navigateur.
+        """
+        self._log(f" [Selenium] {url}")
+        driver.get(url)
 
-            # ========== MODE SELENIUM (déjà initialisé au démarrage) ==========
-            if self.use_selenium and self.driver:
-                try:
-                    self._log(f" [Selenium] {url}")
-                    self.driver.get(url)
-
-                    wait_time = 5  # Réduit pour accélérer (était 10)
-                    if getattr(self, "selenium_mode", None) == "light":
-                        try:
-                            WebDriverWait(self.driver, wait_time).until(
-                                EC.presence_of_element_located((
-                                    By.XPATH,
-                                    "//script[@type='application/ld+json']",
-                                ))
-                            )
-                            elapsed = time.time() - start_time
-                            self._log(f"   JSON-LD injecté après {elapsed:.2f}s")
-                        except Exception:
-                            elapsed = time.time() - start_time
-                            self._log(f"    JSON-LD non détecté après {elapsed:.2f}s")
-                    else:
-                        WebDriverWait(self.driver, wait_time).until(
-                            EC.presence_of_element_located((By.TAG_NAME, "body"))
-                        )
-                        self._log("   Attente JSON-LD...")
-                        try:
-                            WebDriverWait(self.driver, wait_time).until(
-                                lambda d: d.execute_script(
-                                    'return document.querySelectorAll(\'script[type*="ld+json" i]\').length > 0'
-                                )
-                            )
-                            self._log("   JSON-LD dans DOM")
-                        except Exception:
-                            self._log("    Timeout JSON-LD")
-                        time.sleep(0.5)
-
-                    # Cookies (clic Accepter si présent) — court délai
-                    try:
-                        self.driver.execute_script(
-                            """
-                            const buttons = document.querySelectorAll('button, a, div[role="button"]');
-                            buttons.forEach(btn => {
-                                const text = (btn.innerText || '').toLowerCase();
-                                if (text.includes('accepter') || text.includes('accept all')) {
-                                    btn.click();
-                                }
-                            });
-                            """
-                        )
-                        time.sleep(0.3)
-                    except Exception:
-                        pass
-
-                    # Scroll minimal (sites qui injectent contenu au scroll) — réduit pour vitesse
-                    try:
-                        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(0.3)
-                        self.driver.execute_script("window.scrollTo(0, 0);")
-                        time.sleep(0.2)
-                    except Exception:
-                        pass
-
-                    # EXTRACTION JSON-LD
-                    try:
-                        self._log("    Extraction JSON-LD...")
-                        
-                        script_count = self.driver.execute_script(
-                            'return document.querySelectorAll(\'script[type*="ld+json" i]\').length'
-                        )
-                        self._log(f"    {script_count} script(s) JSON-LD")
-                        
-                        json_ld_from_js = self.driver.execute_script(
-                            """
-                            const scripts = document.querySelectorAll('script[type*="ld+json" i]');
-                            return Array.from(scripts).map((s, idx) => {
-                                try {
-                                    const content = s.textContent || s.innerText || '';
-                                    if (!content.trim()) return null;
-                                    return JSON.parse(content);
-                                } catch (err) {
-                                    console.error('Script', idx, 'erreur:', err.message);
-                                    return null;
-                                }
-                            }).filter(x => x !== null);
-                            """
-                        )
-                        
-                        if json_ld_from_js:
-                            self._log(f"   {len(json_ld_from_js)} bloc(s) extrait(s)")
-                            for i, block in enumerate(json_ld_from_js):
-                                block_type = block.get('@type', 'Unknown') if isinstance(block, dict) else f'Array[{len(block)}]'
-                                self._log(f"      • Bloc {i+1}: {block_type}")
-                        else:
-                            self._log("    Aucun bloc extrait")
-                            
-                    except Exception as e:
-                        self._log(f"    Erreur extraction : {e}")
-                        json_ld_from_js = []
-
-                    js_links = self.driver.execute_script(
-                        "return Array.from(document.querySelectorAll('a[href]')).map(a => a.href);"
+        wait_time = 5  # Réduit pour accélérer (était 10)
+        if getattr(self, "selenium_mode", None) == "light":
+            try:
+                WebDriverWait(driver, wait_time).until(
+                    EC.presence_of_element_located((
+                        By.XPATH,
+                        "//script[@type='application/ld+json']",
+                    ))
+                )
+                elapsed = time.time() - start_time
+                self._log(f"   JSON-LD injecté après {elapsed:.2f}s")
+            except Exception:
+                elapsed = time.time() - start_time
+                self._log(f"    JSON-LD non détecté après {elapsed:.2f}s")
+        else:
+            WebDriverWait(driver, wait_time).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+            self._log("   Attente JSON-LD...")
+            try:
+                WebDriverWait(driver, wait_time).until(
+                    lambda d: d.execute_script(
+                        'return document.querySelectorAll(\'script[type*="ld+json" i]\').length > 0'
                     )
+                )
+                self._log("   JSON-LD dans DOM")
+            except Exception:
+                self._log("    Timeout JSON-LD")
+            time.sleep(0.5)
 
-                    html_content = self.driver.page_source
-                    soup = BeautifulSoup(html_content, "html.parser")
-                    response_time = time.time() - start_time
-                    raw_links = js_links or []
+        # Cookies (clic Accepter si présent) — court délai
+        if accept_cookies:
+            try:
+                driver.execute_script(
+                    """
+                    const buttons = document.querySelectorAll('button, a, div[role="button"]');
+                    buttons.forEach(btn => {
+                        const text = (btn.innerText || '').toLowerCase();
+                        if (text.includes('accepter') || text.includes('accept all')) {
+                            btn.click();
+                        }
+                    });
+                    """
+                )
+                time.sleep(0.3)
+            except Exception:
+                pass
 
-                except Exception as se:
-                    self._log(f"Erreur Selenium : {se}")
-                    raise
+        # Scroll minimal (sites qui injectent contenu au scroll) — réduit pour vitesse
+        try:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(0.3)
+            driver.execute_script("window.scrollTo(0, 0);")
+            time.sleep(0.2)
+        except Exception:
+            pass
+
+        # EXTRACTION JSON-LD
+        try:
+            self._log("    Extraction JSON-LD...")
 
-            # ========== MODE REQUESTS (priorité) ou CASCADE si timeout ==========
+            script_count = driver.execute_script(
+                'return document.querySelectorAll(\'script[type*="ld+json" i]\').length'
+            )
+            self._log(f"    {script_count} script(s) JSON-LD")
+
+            json_ld_from_js = driver.execute_script(
+                """
+                const scripts = document.querySelectorAll('script[type*="ld+json" i]');
+                return Array.from(scripts).map((s, idx) => {
+                    try {
+                        const content = s.textContent || s.innerText || '';
+                        if (!content.trim()) return null;
+                        return JSON.parse(content);
+                    } catch (err) {
+                        console.error('Script', idx, 'erreur:', err.message);
+                        return null;
+                    }
+                }).filter(x => x !== null);
+                """
+            )
+
+            if json_ld_from_js:
+                self._log(f"   {len(json_ld_from_js)} bloc(s) extrait(s)")
+                for i, block in enumerate(json_ld_from_js):
+                    block_type = block.get('@type', 'Unknown') if isinstance(block, dict) else f'Array[{len(block)}]'
+                    self._log(f"      • Bloc {i+1}: {block_type}")
             else:
-                # ESSAI 1 : requests normal
-                try:
-                    return self._get_with_requests(url)
-                except Exception as e1:
-                    if not self._is_timeout_error(e1):
-                        self.stats["errors"] += 1
-                        self._log(f"Erreur requests : {e1}")
-                        return None
-                    self.stats["protected_sites_detected"] += 1
-                    self.stats["advanced_solutions_used"] += 1
-                    self._log("Site protégé détecté (timeout) → Basculement solution avancée")
-                    self._log(f"Timeout détecté : {e1}")
-                    self._log("Basculement vers solution avancée...")
+                self._log("    Aucun bloc extrait")
 
-                # ESSAI 2 : requests-html (JavaScript rendu)
-                try:
-                    raw = self._get_with_requests_html(url)
-                    self.stats["requests_html_successes"] += 1
-                    self._log("requests-html fonctionne")
-                    return self._build_page_result(
-                        url,
-                        raw["soup"],
-                        raw["html_content"],
-                        raw["response_time"],
-                        raw_links=raw["raw_links"],
-                    )
-                except Exception as e2:
-                    self._log(f"requests-html échoué : {e2}")
-                    self._log("Essai suivant...")
+        except Exception as e:
+            self._log(f"    Erreur extraction : {e}")
+            json_ld_from_js = []
 
-                # ESSAI 3 : Selenium headless (fonctionne sur Streamlit Cloud)
-                try:
-                    raw = self._get_with_selenium_headless(url)
-                    self.stats["selenium_headless_successes"] += 1
-                    self._log("Selenium headless fonctionne")
-                    return self._build_page_result(
+        js_links = driver.execute_script(
+            "return Array.from(document.querySelectorAll('a[href]')).map(a => a.href);"
+        )
+
+        html_content = driver.page_source
+        fields = extract_page_fields(html_content)
+        response_time = time.time() - start_time
+        raw_links = js_links or []
+        return {
+            "html_content": html_content,
+            "fields": fields,
+            "raw_links": raw_links,
+            "json_ld_from_js": json_ld_from_js,
+            "response_time": response_time,
+        }
+
+    def _get_with_cascade(self, url):
+        """
+        Cascade requests → requests-html → Selenium headless → Selenium non-headless.
+        La mémoire par host (self._strategy) fait démarrer à la dernière méthode gagnante
+        et saute les méthodes en échec répété (circuit breaker avec cooldown).
+        """
+        host = urlparse(url).netloc.lower()
+        advanced = {
+            "requests_html": (self._get_with_requests_html, "requests_html_successes", "requests-html"),
+            "selenium_headless": (self._get_with_selenium_headless, "selenium_headless_successes", "Selenium headless"),
+            "selenium_nonheadless": (self._get_with_selenium_nonheadless, "selenium_nonheadless_successes", "Selenium non-headless"),
+        }
+        plan = self._strategy.plan(host)
+        if plan[0] != "requests":
+            self._log(f"   Stratégie mémorisée pour {host} : {plan[0]}")
+
+        for method in plan:
+            try:
+                if method == "requests":
+                    result = self._get_with_requests(url)
+                else:
+                    fetcher, success_key, label = advanced[method]
+                    raw = fetcher(url)
+                    result = self._build_page_result(
                         url,
-                        raw["soup"],
+                        raw["fields"],
                         raw["html_content"],
                         raw["response_time"],
                         raw_links=raw["raw_links"],
                     )
-                except Exception as e3:
-                    self._log(f"Selenium headless échoué : {e3}")
+                    self._inc_stat(success_key)
+                    self._log(f"{label} fonctionne")
+            except ResponseRejected:
+                return None  # PDF, image, fichier énorme : pas une page, aucune autre méthode à essayer
+            except Exception as e:
+                is_timeout = self._is_timeout_error(e)
+                if method == "requests" and not is_timeout:
+                    # Erreur HTTP « normale » (404, 500...) : pas un site protégé
+                    self._inc_stat("errors")
+                    self._log(f"Erreur requests : {e}")
+                    return None
+                if self._strategy.record_failure(host, method, timeout=is_timeout):
+                    self._log(f"   {method} coupé pour {host} (échecs répétés, cooldown)")
+                if method == "requests":
+                    self._inc_stat("protected_sites_detected")
+                    self._inc_stat("advanced_solutions_used")
+                    self._log("Site protégé détecté (timeout) → Basculement solution avancée")
+                    self._log(f"Timeout détecté : {e}")
+                else:
+                    self._log(f"{advanced[method][2]} échoué : {e}")
                     self._log("Essai suivant...")
+                continue
+            self._strategy.record_success(host, method)
+            return result
 
-                # ESSAI 4 : Selenium non-headless (dernier recours, souvent KO sur serveur)
-                try:
-                    raw = self._get_with_selenium_nonheadless(url)
-                    self.stats["selenium_nonheadless_successes"] += 1
-                    self._log("Selenium non-headless fonctionne")
-                    return self._build_page_result(
-                        url,
-                        raw["soup"],
-                        raw["html_content"],
-                        raw["response_time"],
-                        raw_links=raw["raw_links"],
-                    )
-                except Exception as e4:
-                    self._log(f"Selenium non-headless échoué : {e4}")
+        # Abandon
+        self._log(f"Impossible d'accéder à {url}")
+        self._inc_stat("errors")
+        return None
 
-                # ESSAI 5 : Abandon
-                self._log(f"Impossible d'accéder à {url}")
-                self.stats["errors"] += 1
-                return None
+    def get_page_details(self, url):
+        """Scrape une page. Cascade automatique vers solutions avancées si timeout (sites protégés type BMW)."""
+        try:
+            start_time = time.time()
 
-            # ========== EXTRACTION DONNÉES (après bloc Selenium) ==========
-            raw_title = (soup.title.get_text(strip=True) if soup.title else "") or ""
-            h1 = soup.find("h1").get_text().strip() if soup.find("h1") else ""
-            final_title = self.clean_title(raw_title, h1, url)
-
-            meta_desc = ""
-            meta_tag = soup.find("meta", attrs={"name": "description"})
-            if meta_tag and meta_tag.get("content"):
-                meta_desc = meta_tag["content"].strip()
-
-            links = []
-            normalized_current = self.normalize_url(url)
-            for href in raw_links:
-                if not href:
-                    continue
-                full_url = urljoin(url, href)
-                netloc = urlparse(full_url).netloc.lower()
-                if (
-                    netloc in self._domain_set
-                    and self.is_valid_url(full_url)
-                ):
-                    clean_link = self.normalize_url(full_url)
-                    if clean_link != normalized_current:
-                        links.append(clean_link)
-                else:
-                    self.stats["links_filtered"] += 1
-            unique_links = list(set(links))
-            self.stats["links_discovered"] += len(unique_links)
+            # ========== MODE SELENIUM (déjà initialisé au démarrage) ==========
+            if self.use_selenium and (self.driver or self._driver_pool is not None):
+                try:
+                    if self._driver_pool is not None:
+                        with self._driver_pool.acquire() as slot:
+                            raw = self._render_with_selenium(
+                                slot.driver, url, start_time, accept_cookies=not slot.cookies_accepted
+                            )
+                            slot.cookies_accepted = True
+                    else:
+                        raw = self._render_with_selenium(self.driver, url, start_time)
+                except Exception as se:
+                    self._log(f"Erreur Selenium : {se}")
+                    raise
 
-            # Fusion des deux méthodes d'extraction JSON-LD (soup + Selenium DOM si utilisé)
-            json_ld_classic = self._extract_jsonld_from_soup(soup)
-            json_ld_data = self._merge_jsonld_no_duplicates(json_ld_classic, json_ld_from_js)
+            # ========== MODE REQUESTS (priorité) ou CASCADE si timeout ==========
+            else:
+                return self._get_with_cascade(url)
 
-            return {
-                "url": url,
-                "title": final_title,
-                "links": unique_links,
-                "description": meta_desc,
-                "h1": h1,
-                "response_time": response_time,
-                "html_content": html_content,
-                "last_modified": "",
-                "has_structured_data": bool(json_ld_data),
-                "json_ld": json_ld_data,
-                "h2_count": len(soup.find_all("h2")),
-                "lists_count": len(soup.find_all(["ul", "ol"])),
-            }
+            # ========== EXTRACTION DONNÉES (après bloc Selenium) ==========
+            # Fusion des deux méthodes d'extraction JSON-LD (HTML + Selenium DOM)
+            json_ld_data = self._merge_jsonld_no_duplicates(raw["fields"]["json_ld"], raw["json_ld_from_js"])
+            return self._build_page_result(
+                url,
+                raw["fields"],
+                raw["html_content"],
+                raw["response_time"],
+                raw_links=raw["raw_links"],
+                json_ld_data=json_ld_data,
+            )
 
         except Exception as e:
-            self.stats["errors"] += 1
+            self._inc_stat("errors")
             self._log(f"Erreur critique : {e}")
             return None
 
-    def run_analysis(self, progress_callback=None, log_callback=None):
-        """Lance l'analyse."""
-        if log_callback:
-            self.log_callback = log_callback
-
-        queue = list(self.start_urls)
-        self.visited.update(self.start_urls)
-        crawled_count = 0
-
-        print(f"\n{'='*80}")
-        print(f"CRAWL: {self.max_urls} pages")
-        print(f"{'='*80}\n")
+    def _fetch_page(self, url):
+        """
+        get_page_details, sauf page datée par le sitemap d'avant le crawl précédent (re-crawl incrémental)
+        ou URL déjà couverte par la canonique d'une page retenue (None, journalisée par _commit_page).
+        """
+        if self._canonicals.covered_by(url):
+            return None
+        if self._baseline is not None and self._baseline.unchanged_by_sitemap(url):
+            self._inc_stat("incremental_skipped")
+            return self._baseline.carry_forward(url)
+        if self._crawl_delay is not None:
+            self._crawl_delay.wait(url)
+        if self._host_limiter is None:
+            return self.get_page_details(url)
+        for attempt in range(LIMITER_MAX_RETRIES + 1):
+            self._host_limiter.acquire(url)
+            self._last_response.outcome = {}
+            started = time.time()
+            try:
+                data = self.get_page_details(url)
+            finally:
+                outcome = self._last_response.outcome
+                throttled = self._host_limiter.release(
+                    url,
+                    status=outcome.get("status"),
+                    latency=outcome.get("latency") or time.time() - started,
+                    retry_after=outcome.get("retry_after"),
+                    error=outcome.get("error", False),
+                )
+            if data or not throttled or attempt == LIMITER_MAX_RETRIES:
+                return data
+            self._inc_stat("throttle_retries")
+            self._log(f"   HTTP {outcome.get('status')} : nouvel essai après la pause du host")
+        return data
+
+    def _commit_page(self, data, queue, url=None):
+        """Intègre une page crawlée : nouveaux liens dans le frontier. Retourne True si page retenue."""
+        if not data:
+            owner = self._canonicals.covered_by(url) if url else None
+            if owner:
+                self._canonical_duplicate(url, owner)
+                return False
+            self._inc_stat("pages_skipped")
+            if url:
+                self._failed_urls.append(url)
+                if self._checkpoint is not None:
+                    self._checkpoint.add_failed(url)
+            return False
+        owner = self._canonicals.owner_of(data["url"], data.get("canonical"))
+        if owner:
+            self._canonical_duplicate(data["url"], owner)
+            return False
+        if self._near_duplicate(data):
+            return False
+        # Canonique enregistrée seulement pour une page retenue (pas pour un quasi-doublon écarté)
+        self._canonicals.register(data["url"], data.get("canonical"))
+        if data.get("canonical"):
+            self.visited.add(data["canonical"])  # cible canonique couverte : jamais mise en file
+
+        self._inc_stat("pages_crawled")
+        self._track_template(data["url"])
+        self._attach_sitemap_lastmod(data)
+        if self._baseline is not None:
+            self._baseline.track(data)
+        if data.get("carried_forward") and self._page_store is not None:
+            self._page_store.retain([data.get("html_ref")], self.page_scope)
+        if self._checkpoint is not None:
+            self._checkpoint.add_page(data)
+
+        for link in data["links"]:
+            if link in self.visited:
+                self._inc_stat("links_duplicate")
+            elif not self._robots_allowed(link):
+                self.visited.add(link)  # journalisée une seule fois
+            elif not queue.accepts(link):
+                self._inc_stat("queue_full_blocks")
+            else:
+                self.visited.add(link)
+                queue.append(link)
+        return True
 
+    def _crawl_sequential(self, queue, progress_callback=None):
+        """Crawl BFS une page à la fois (mode historique, utilisé avec le driver Selenium unique). Générateur de pages."""
+        crawled_count = self._resumed_pages
+        current_url = None  # URL en cours : remise dans le frontier si le crawl est interrompu
+        finished = False
         try:
             while queue and crawled_count < self.max_urls:
-                current_url = queue.pop(0)
+                current_url = queue.popleft()
                 percent = min(crawled_count / self.max_urls, 0.99)
 
                 if progress_callback:
@@ -677,23 +937,133 @@ class SmartScraper:
                         percent,
                     )
 
-                data = self.get_page_details(current_url)
+                data = self._fetch_page(current_url)
 
-                if data:
-                    self.results.append(data)
+                committed = self._commit_page(data, queue, current_url)
+                current_url = None
+                self._save_checkpoint(lambda: queue)
+                if committed:
                     crawled_count += 1
-                    self.stats["pages_crawled"] += 1
-
-                    for link in data["links"]:
-                        if link in self.visited:
-                            self.stats["links_duplicate"] += 1
-                        elif len(queue) < 5000:
-                            self.visited.add(link)
-                            queue.append(link)
-                else:
-                    self.stats["pages_skipped"] += 1
+                    yield data
+            finished = True
+        finally:
+            self._save_checkpoint(lambda: ([current_url] if current_url else []) + list(queue), force=True, done=finished)
+
+    def _crawl_concurrent(self, queue, progress_callback=None):
+        """
+        Crawl BFS avec `workers` threads partageant le frontier.
+        Les pages sont récupérées en parallèle mais intégrées dans l'ordre de sortie du frontier :
+        résultats, visited et queue évoluent exactement comme en séquentiel (ordre déterministe).
+        Le nombre de pages en vol est borné par max_urls : pas de fetch au-delà du budget.
+        Générateur : chaque page est produite au moment de son intégration.
+        """
+        in_flight = deque()  # (url, future) dans l'ordre de soumission
+        crawled_count = self._resumed_pages
+        finished = False
+        # Tampon de pages terminées en attente d'intégration (tête de file lente)
+        max_buffered = self.workers * 4
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hotaru-crawl") as pool:
+            try:
+                while (queue or in_flight) and crawled_count < self.max_urls:
+                    running = sum(1 for _, f in in_flight if not f.done())
+                    while (
+                        queue
+                        and running < self.workers
+                        and len(in_flight) < max_buffered
+                        and crawled_count + len(in_flight) < self.max_urls
+                    ):
+                        url = queue.popleft()
+                        in_flight.append((url, pool.submit(self._fetch_page, url)))
+                        running += 1
+
+                    _, head_future = in_flight[0]
+                    if not head_future.done():
+                        wait([f for _, f in in_flight if not f.done()], return_when=FIRST_COMPLETED)
+                        continue
+
+                    head_url, _ = in_flight.popleft()
+                    data = head_future.result()
+                    committed = self._commit_page(data, queue, head_url)
+                    self._save_checkpoint(lambda: [u for u, _ in in_flight] + list(queue))
+                    if committed:
+                        crawled_count += 1
+
+                    if progress_callback:
+                        progress_callback(
+                            f"{crawled_count}/{self.max_urls} | Queue: {len(queue)} | En cours: {len(in_flight)}",
+                            min(crawled_count / self.max_urls, 0.99),
+                        )
+                    if committed:
+                        yield data
+                finished = True
+            finally:
+                for _, f in in_flight:
+                    f.cancel()
+                self._save_checkpoint(
+                    lambda: [u for u, _ in in_flight] + list(queue), force=True, done=finished
+                )
+
+    def iter_pages(self, progress_callback=None, keep_results=False):
+        """
+        Crawl en flux : chaque page (dict identique à run_analysis) est produite dès son intégration,
+        dans le même ordre que run_analysis. Le crawl avance au rythme du consommateur
+        (scoring GEO, features de clustering, écriture DB...).
+
+        Args:
+            progress_callback: callback(message, pourcentage)
+            keep_results: conserver aussi les pages dans self.results (par défaut non : mémoire bornée)
+
+        Usage :
+            for page in scraper.iter_pages():
+                ...
+            summary = scraper.crawl_summary()
+        """
+        queue = self._new_frontier()
+        if self._resume_frontier is not None:
+            for page in self.results:
+                queue.note_taken(page["url"])
+            queue.extend(self._resume_frontier)
+            self._resume_frontier = None
+        else:
+            queue.extend(self.start_urls)
+            self.visited.update(self.start_urls)
+            if self._baseline is not None:
+                queue.extend(self._seed_from_baseline())
+            if self.sitemap_seed:
+                self._seed_from_sitemap(queue.accepts, queue.append)
+            if self._checkpoint is not None:
+                self._checkpoint.reset()
+
+        print(f"\n{'='*80}")
+        print(f"CRAWL: {self.max_urls} pages")
+        print(f"{'='*80}\n")
+
+        if self.workers > 1 and (not self.use_selenium or self._driver_pool is not None):
+            pages = self._crawl_concurrent(queue, progress_callback)
+        else:
+            pages = self._crawl_sequential(queue, progress_callback)
+        try:
+            for page in pages:
+                if keep_results:
+                    self.results.append(page)
+                yield page
 
         finally:
+            pages.close()  # point de reprise final écrit avant la fermeture du frontier
+            self.stats["frontier_spilled"] = queue.stats["spilled"]
+            self.stats["frontier_peak"] = queue.stats["max_size"]
+            queue.close()
+            self.stats["fetch_strategies"] = self._strategy.snapshot()
+            self.stats["strategy_skips"] = self._strategy.skipped
+            if self._crawl_delay is not None:
+                self.stats["crawl_delay"] = dict(self._crawl_delay.stats)
+            if self._host_limiter is not None:
+                self.stats["host_limits"] = self._host_limiter.snapshot()
+            if self._driver_pool is not None:
+                self._driver_pool.close()
+                self.stats.update({f"selenium_{k}": v for k, v in self._driver_pool.stats.items()})
+                self._log("Pool Selenium fermé")
             if self.driver:
                 try:
                     self.driver.quit()
@@ -703,33 +1073,196 @@ class SmartScraper:
 
         print(f"\nTERMINÉ: {self.stats['pages_crawled']} pages\n")
 
+    def crawl_summary(self, patterns=None):
+        """
+        Résumé du crawl (second élément du retour de run_analysis), disponible après iter_pages même avec
+        keep_results=False : sans `patterns`, le nombre de groupes vient des pages retenues au fil du crawl.
+        """
+        summary = {
+            "total_urls": self.stats["pages_crawled"],
+            "patterns": len(patterns) if patterns is not None else len(self._pattern_groups),
+            "stats": self.stats,
+            "filtered_log": self.filtered_log,
+            "duplicate_log": self.duplicate_log,
+        }
+        if self._baseline is not None:
+            summary["incremental"] = self._baseline.report(failed_urls=self._failed_urls)
+        return summary
+
+    def run_analysis(self, progress_callback=None, log_callback=None):
+        """Lance l'analyse (toutes les pages en mémoire, cf. iter_pages pour le flux)."""
+        if log_callback:
+            self.log_callback = log_callback
+
+        for _ in self.iter_pages(progress_callback, keep_results=True):
+            pass
+
         patterns = self.analyze_patterns(self.results)
 
         if progress_callback:
             progress_callback(f"Terminé: {self.stats['pages_crawled']}", 1.0)
 
-        return self.results, {
-            "total_urls": len(self.results),
-            "patterns": len(patterns),
-            "stats": self.stats,
-            "filtered_log": self.filtered_log,
-            "duplicate_log": self.duplicate_log,
-        }
+        return self.results, self.crawl_summary(patterns)
+
+    def resume(self, checkpoint, progress_callback=None, log_callback=None):
+        """
+        Reprend un crawl interrompu depuis un point de reprise (CrawlCheckpoint ou chemin) :
+        pages déjà crawlées, visited, frontier et stats sont restaurés, puis le crawl continue.
+        Sans point de reprise exploitable, crawl complet. Retour identique à run_analysis.
+        Les pages restaurées sont dans self.results (iter_pages ne produit que les nouvelles).
+        """
+        self._checkpoint = CrawlCheckpoint.coerce(checkpoint)
+        state = self._checkpoint.load() if self._checkpoint is not None else None
+        if state:
+            self._restore_checkpoint(state)
+        return self.run_analysis(progress_callback=progress_callback, log_callback=log_callback)
+
+    def _restore_checkpoint(self, state):
+        self._checkpoint.restore_html(state, self.page_scope)
+        self.results = list(state["pages"])
+        self.visited = load_visited(state["visited"], self.visited_mode, self.visited_fp_rate)
+        self.stats.update(state["stats"])
+        self.stats["pages_crawled"] = len(self.results)
+        self._failed_urls = list(state["failed"])
+        self._resumed_pages = len(self.results)
+        self._resume_frontier = list(state["frontier"])
+        for page in self.results:
+            self._track_template(page["url"])
+            if self._near_dups is not None and not page.get("near_duplicate_of"):
+                self._near_dups.add(page["url"], page.get("simhash"))
+            self._canonicals.register(page["url"], page.get("canonical"))
+            if self._baseline is not None:
+                self._baseline.track(page)
+        self._log(
+            f"Reprise : {self._resumed_pages} page(s) déjà crawlée(s), "
+            f"{len(self._resume_frontier)} URL(s) dans le frontier"
+        )
+
+    def _save_checkpoint(self, frontier, force=False, done=False):
+        """Point de reprise si dû (ou forcé) ; `frontier` : callable → URLs restant à crawler."""
+        if self._checkpoint is not None and (force or self._checkpoint.due()):
+            self._checkpoint.save(frontier(), self.visited, self.stats, done=done)
+
+    def _new_frontier(self):
+        """
+        Frontier du crawl : FIFO à débordement disque (bfs) ou best-first par template (priority, en mémoire).
+        <priority> du sitemap pris en compte seulement si les sitemaps sont lus de toute façon (sitemap_seed).
+        """
+        if self.frontier_mode == "priority":
+            sitemap = self._sitemap() if self.sitemap_seed else {}
+            priorities = {url: e["priority"] for url, e in sitemap.items() if e["priority"] is not None}
+            return PriorityFrontier(max_per_pattern=self.max_urls, sitemap_priority=priorities)
+        return Frontier(memory_limit=MAX_QUEUE_LINKS_V1)
+
+    def _track_template(self, url):
+        """Compte le template d'URL d'une page retenue (couverture comparable en bfs et priority) et son groupe."""
+        self._templates.add(PriorityFrontier.pattern(url))
+        self._pattern_groups.add(self._pattern_group(url))
+        self.stats["templates_crawled"] = len(self._templates)
+
+    def _sitemap(self):
+        """Entrées des sitemaps {url normalisée: {"lastmod", "priority"}}, lues une seule fois."""
+        if self._sitemap_entries is None:
+            self._sitemap_entries = {
+                self.normalize_url(url): entry
+                for url, entry in fetch_sitemap_entries(self.session, self.base_url, robots=self._robots).items()
+            }
+            self.stats["sitemap_urls"] = len(self._sitemap_entries)
+        return self._sitemap_entries
+
+    def _seed_from_sitemap(self, accepts, push):
+        """URLs des sitemaps (domaines du crawl, filtres d'URL) ajoutées au frontier via push."""
+        seeded = 0
+        for url in self._sitemap():
+            if url in self.visited or urlparse(url).netloc.lower() not in self._domain_set:
+                continue
+            if not self.is_valid_url(url) or not self._robots_allowed(url) or not accepts(url):
+                continue
+            self.visited.add(url)
+            push(url)
+            seeded += 1
+        self.stats["sitemap_seeded"] = seeded
+        self._log(f"Sitemap : {seeded} URL(s) ajoutée(s) au frontier ({self.stats['sitemap_urls']} dans les sitemaps)")
+
+    def _near_duplicate(self, page):
+        """
+        Repère un quasi-doublon d'une page déjà retenue (SimHash) : marqué near_duplicate_of.
+        En mode "drop", True : page écartée (duplicate_log), ni comptée ni suivie.
+        """
+        if self._near_dups is None:
+            return False
+        original = self._near_dups.match(page["url"], page.get("simhash"))
+        if original is None:
+            return False
+        self._inc_stat("near_duplicates")
+        page["near_duplicate_of"] = original
+        if self.near_duplicates != "drop":
+            return False
+        self.duplicate_log.append((page["url"], f"quasi-doublon : {original}"))
+        self._log(f"   Quasi-doublon de {original} : écartée")
+        return True
+
+    def _resolve_canonical(self, url, href):
+        """URL rel=canonical normalisée ; "" si absente, invalide ou hors des domaines du crawl."""
+        if not href:
+            return ""
+        full_url = urljoin(url, href)
+        if urlparse(full_url).netloc.lower() not in self._domain_set or not self.is_valid_url(full_url):
+            return ""
+        return self.normalize_url(full_url)
+
+    def _canonical_duplicate(self, url, owner):
+        """URL écartée : sa canonique est déjà couverte par la page retenue `owner`."""
+        self._inc_stat("canonical_duplicates")
+        self.duplicate_log.append((url, f"canonical : {owner}"))
+        self._log(f"   Canonique déjà couverte par {owner} : écartée")
+
+    def _robots_allowed(self, url):
+        """False si robots.txt interdit l'URL (journalisée dans filtered_log, jamais mise en file)."""
+        if self._robots is None or self._robots.allowed(url):
+            return True
+        self._inc_stat("robots_blocked")
+        self.filtered_log.append((url, "robots.txt"))
+        return False
+
+    def _attach_sitemap_lastmod(self, page):
+        """lastmod du sitemap reporté sur la page (si les sitemaps ont été lus pour ce crawl)."""
+        entry = self._sitemap_entries.get(page["url"]) if self._sitemap_entries else None
+        if entry and entry["lastmod"]:
+            page["sitemap_lastmod"] = entry["lastmod"]
+
+    def _seed_from_baseline(self):
+        """URLs du crawl précédent (domaines du crawl) ajoutées au frontier ; lastmod du sitemap chargé si utile."""
+        seeds = []
+        for url in self._baseline.urls:
+            if url in self.visited or urlparse(url).netloc.lower() not in self._domain_set:
+                continue
+            if self._robots_allowed(url):
+                self.visited.add(url)
+                seeds.append(url)
+        if self._baseline.crawled_at is not None and not self._baseline.sitemap_lastmod:
+            self._baseline.sitemap_lastmod = {url: e["lastmod"] for url, e in self._sitemap().items() if e["lastmod"]}
+        self._log(
+            f"Re-crawl incrémental : {len(seeds)} URL(s) du crawl précédent, "
+            f"{len(self._baseline.sitemap_lastmod)} lastmod sitemap"
+        )
+        return seeds
+
+    @staticmethod
+    def _pattern_group(url):
+        """Groupe d'une URL pour analyze_patterns : premier segment du chemin (hors langue), ou Accueil."""
+        segments = [s for s in urlparse(url).path.split("/") if s]
+        if not segments:
+            return "Accueil"
+        if segments[0] in ["fr", "en", "de", "es"] and len(segments) > 1:
+            return segments[1]
+        return segments[0]
 
     def analyze_patterns(self, pages):
         """Analyse les patterns d'URL."""
         groups = {}
         for p in pages:
-            path = urlparse(p["url"]).path
-            segments = [s for s in path.split("/") if s]
-
-            if len(segments) > 0:
-                group_key = segments[0]
-                if group_key in ["fr", "en", "de", "es"] and len(segments) > 1:
-                    group_key = segments[1]
-            else:
-                group_key = "Accueil"
-
+            group_key = self._pattern_group(p["url"])
             if group_key not in groups:
                 groups[group_key] = {"count": 0, "samples": [], "name": group_key}
 
@@ -743,14 +1276,15 @@ class SmartScraper:
 
 
 def fetch_page(url: str, timeout: int = 15) -> str:
-    """Récupère le HTML d'une seule page."""
+    """Récupère le HTML d'une seule page (ResponseRejected si non HTML ou plus de FETCH_MAX_BYTES)."""
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
     session = requests.Session()
     session.headers.update({
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     })
-    r = session.get(url, timeout=timeout)
+    cache = get_http_cache()
+    r = cache.get(session, url, timeout=timeout) if cache else bounded_get(session, url, timeout=timeout)
     r.raise_for_status()
     r.encoding = r.apparent_encoding or "utf-8"
     return r.text
\ No newline at end of file
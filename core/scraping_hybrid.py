@@ -0,0 +1,315 @@
+"""
+HOTARU SCRAPER HYBRIDE (core/scraping_hybrid.py)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Moteur : HTTP poolé (requests, workers concurrents) + navigateur headless à la demande.
+
+- Chaque URL est d'abord récupérée en HTTP simple (vitesse V1 concurrente).
+- Si le HTML semble construit côté client (corps vide, framework JS, ni liens ni JSON-LD)
+  ou si le serveur bloque (403, page de challenge anti-bot, timeout), la page est rendue dans un navigateur
+  Playwright partagé (Crawl4AI, navigateurs chauds de core/browser_pool.py), à défaut Selenium headless.
+- 429/503 sans challenge : le serveur nous ralentit, pas de navigateur (plus lourd) ; la page passe par
+  le backoff du host et Retry-After (core/host_limiter.py) puis est retentée, comme en V1.
+- Même interface et même dict résultat que V1/V2 (+ clé "rendered_by" : "http" | "browser").
+"""
+import asyncio
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from core.page_extractor import extract_page_fields
+from core.http_cache import http_date_to_iso
+from core.bounded_fetch import FETCH_MAX_BYTES, ResponseRejected
+from core.browser_pool import get_browser_pool
+from core.frontier import BLOOM_FP_RATE
+from core.scraping import SmartScraper
+from core.spa_detection import looks_client_rendered
+
+HYBRID_WORKERS = 8
+BROWSER_CONCURRENCY = 4
+BROWSER_PAGE_TIMEOUT_MS = 30000
+# Code HTTP typique d'un anti-bot : le navigateur a plus de chances de passer
+ESCALATE_STATUS = (403,)
+# Débit limité par le serveur : backoff du host (HostLimiter), sauf page de challenge anti-bot
+THROTTLE_STATUS = (429, 503)
+_RE_CHALLENGE = re.compile(
+    r"cf-browser-verification|/cdn-cgi/challenge-platform|cf_chl_|captcha-delivery\.com|_Incapsula_Resource|px-captcha",
+    re.IGNORECASE,
+)
+
+
+class BrowserRenderer:
+    """
+    Navigateur Playwright (Crawl4AI) unique, piloté depuis les threads de crawl.
+    Pool de navigateurs du processus actif : pages rendues sur un navigateur chaud (rien à lancer
+    ni à fermer) ; sinon une boucle asyncio dédiée tourne dans son propre thread. render() est
+    bloquant et thread-safe, le nombre de pages rendues simultanément est borné.
+    """
+
+    def __init__(self, proxy: Optional[str] = None, max_concurrent: int = BROWSER_CONCURRENCY):
+        self.proxy = proxy
+        self.max_concurrent = max_concurrent
+        self._loop = None
+        self._thread = None
+        self._crawler = None
+        self._run_config = None
+        self._semaphore = None
+        self._pool = None
+        self._browser_config = None
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+
+    def start(self):
+        """Démarre la boucle et le navigateur (lève si Crawl4AI/Playwright indisponible)."""
+        from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+
+        browser_kwargs = dict(headless=True, verbose=False)
+        if self.proxy:
+            browser_kwargs["proxy"] = {"server": self.proxy}
+        self._run_config = CrawlerRunConfig(
+            cache_mode=CacheMode.BYPASS,
+            page_timeout=BROWSER_PAGE_TIMEOUT_MS,
+            delay_before_return_html=2.0,
+            scan_full_page=True,
+            scroll_delay=0.3,
+            magic=True,
+            remove_overlay_elements=True,
+            exclude_external_links=False,
+        )
+        self._browser_config = BrowserConfig(**browser_kwargs)
+        pool = get_browser_pool()
+        if pool is not None:
+            pool.warm(self._browser_config)
+            self._pool = pool
+            return
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="hotaru-browser", daemon=True)
+        self._thread.start()
+
+        async def _open():
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            crawler = AsyncWebCrawler(config=self._browser_config)
+            await crawler.start()
+            return crawler
+
+        try:
+            self._crawler = asyncio.run_coroutine_threadsafe(_open(), self._loop).result(timeout=120)
+        except Exception:
+            self.close()
+            raise
+
+    async def _render(self, url: str) -> Optional[str]:
+        async with self._semaphore:
+            result = await self._crawler.arun(url=url, config=self._run_config)
+        if result and result.success:
+            return result.html or ""
+        return None
+
+    def render(self, url: str) -> Optional[str]:
+        """HTML rendu de l'URL, ou None si le rendu échoue."""
+        if self._pool is not None:
+            with self._slots:
+                result = self._pool.run(
+                    url, config=self._run_config, browser_config=self._browser_config,
+                    timeout=BROWSER_PAGE_TIMEOUT_MS / 1000 * 3,
+                )
+            if result and result.success:
+                return result.html or ""
+            return None
+        future = asyncio.run_coroutine_threadsafe(self._render(url), self._loop)
+        return future.result(timeout=BROWSER_PAGE_TIMEOUT_MS / 1000 * 3)
+
+    def close(self):
+        """Ferme le navigateur puis arrête la boucle (navigateur du pool : rendu au pool, laissé ouvert)."""
+        self._pool = None
+        if self._loop is None:
+            return
+        if self._crawler is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._crawler.close(), self._loop).result(timeout=30)
+            except Exception:
+                pass
+            self._crawler = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+
+class HybridScraper(SmartScraper):
+    """
+    HTTP d'abord, navigateur seulement si nécessaire.
+    Hérite du crawl concurrent de SmartScraper (frontier, visited, stats, ordre déterministe).
+    """
+
+    def __init__(
+        self,
+        start_urls,
+        max_urls=500,
+        use_selenium=False,       # Ignoré (escalade automatique)
+        selenium_mode=None,       # Ignoré
+        log_callback=None,
+        proxy=None,
+        extra_domains=None,
+        workers=HYBRID_WORKERS,
+        browser_concurrency=BROWSER_CONCURRENCY,
+        http_cache=True,
+        baseline=None,
+        checkpoint=None,
+        visited_mode="compact",
+        visited_fp_rate=BLOOM_FP_RATE,
+        frontier="bfs",
+        sitemap_seed=False,
+        robots=True,
+        host_limits=True,
+        max_page_bytes=FETCH_MAX_BYTES,
+        near_duplicates="flag",
+    ):
+        super().__init__(
+            start_urls,
+            max_urls=max_urls,
+            use_selenium=False,
+            log_callback=log_callback,
+            proxy=proxy,
+            extra_domains=extra_domains,
+            workers=workers,
+            http_cache=http_cache,
+            baseline=baseline,
+            checkpoint=checkpoint,
+            visited_mode=visited_mode,
+            visited_fp_rate=visited_fp_rate,
+            frontier=frontier,
+            sitemap_seed=sitemap_seed,
+            robots=robots,
+            host_limits=host_limits,
+            max_page_bytes=max_page_bytes,
+            near_duplicates=near_duplicates,
+        )
+        self.browser_concurrency = browser_concurrency
+        self._renderer = None
+        self._renderer_lock = threading.Lock()
+        self._renderer_failed = False
+        self.stats.update({
+            "engine": "Hybride (HTTP + navigateur à la demande)",
+            "http_pages": 0,
+            "browser_escalations": 0,
+            "browser_failures": 0,
+        })
+
+    # ── Navigateur (démarré à la première escalade) ─────────────────────────
+
+    def _get_renderer(self) -> Optional[BrowserRenderer]:
+        with self._renderer_lock:
+            if self._renderer is None and not self._renderer_failed:
+                try:
+                    self._log("   Démarrage navigateur headless (Crawl4AI)...")
+                    renderer = BrowserRenderer(proxy=self.proxy, max_concurrent=self.browser_concurrency)
+                    renderer.start()
+                    self._renderer = renderer
+                except Exception as e:
+                    self._log(f"   Navigateur Crawl4AI indisponible ({str(e)[:120]}) → Selenium headless")
+                    self._renderer_failed = True
+            return self._renderer
+
+    def _render_in_browser(self, url: str) -> Optional[str]:
+        """HTML rendu par Crawl4AI, à défaut Selenium headless ; None si tout échoue."""
+        renderer = self._get_renderer()
+        try:
+            if renderer is not None:
+                return renderer.render(url)
+            return self._get_with_selenium_headless(url)["html_content"]
+        except Exception as e:
+            self._log(f"   Rendu navigateur échoué : {str(e)[:200]}")
+            return None
+
+    def close(self):
+        """Ferme le navigateur partagé s'il a été démarré."""
+        with self._renderer_lock:
+            if self._renderer is not None:
+                self._renderer.close()
+                self._renderer = None
+
+    # ── Fetch d'une page ─────────────────────────────────────────────────────
+
+    def _page_from_html(
+        self, url: str, html: str, response_time: float, rendered_by: str, fields=None, last_modified: str = ""
+    ) -> Dict:
+        if fields is None:
+            fields = extract_page_fields(html)
+        page = self._build_page_result(url, fields, html, response_time, last_modified=last_modified)
+        page["rendered_by"] = rendered_by
+        return page
+
+    def get_page_details(self, url):
+        """HTTP puis, si la page est rendue côté client ou bloquée, navigateur headless."""
+        start_time = time.time()
+        html = ""
+        reason = None
+        resp = None
+        try:
+            self._log(f" [HTTP] {url}")
+            resp = self._http_get(url)
+            carried = self._not_modified_page(url, resp)
+            if carried is not None:
+                return carried
+            if resp.status_code in ESCALATE_STATUS:
+                reason = f"HTTP {resp.status_code}"
+            elif resp.status_code in THROTTLE_STATUS:
+                if not _RE_CHALLENGE.search(resp.text or ""):
+                    # Pas d'escalade : _fetch_page retente après la pause du host (Retry-After)
+                    self._log(f"   HTTP {resp.status_code} : débit limité par le serveur")
+                    return None
+                reason = f"HTTP {resp.status_code} (challenge anti-bot)"
+            elif resp.status_code != 200:
+                self._log(f"   HTTP {resp.status_code}")
+                self._inc_stat("errors")
+                return None
+            else:
+                if "charset" not in resp.headers.get("Content-Type", "").lower():
+                    resp.encoding = resp.apparent_encoding or "utf-8"
+                html = resp.text
+                check = looks_client_rendered(html)
+                if check["client_rendered"]:
+                    reason = "; ".join(check["reasons"])
+        except ResponseRejected:
+            return None  # non HTML ou trop volumineuse : le navigateur n'y changerait rien
+        except Exception as e:
+            if not self._is_timeout_error(e):
+                self._inc_stat("errors")
+                self._log(f"Erreur requests : {e}")
+                return None
+            reason = "timeout HTTP"
+
+        last_modified = http_date_to_iso(resp.headers.get("Last-Modified")) if resp is not None else ""
+        if reason is None:
+            self._inc_stat("http_pages")
+            fields = self._page_fields(url, resp, html)
+            page = self._page_from_html(url, html, time.time() - start_time, "http", fields, last_modified)
+            page["etag"] = resp.headers.get("ETag", "")
+            return page
+
+        self._inc_stat("browser_escalations")
+        self._log(f"   → Navigateur ({reason})")
+        rendered = self._render_in_browser(url)
+        if rendered:
+            return self._page_from_html(url, rendered, time.time() - start_time, "browser")
+
+        self._inc_stat("browser_failures")
+        if html:
+            # Le HTML serveur reste meilleur que rien (pages au contenu réellement court)
+            self._inc_stat("http_pages")
+            return self._page_from_html(url, html, time.time() - start_time, "http", last_modified=last_modified)
+        self._inc_stat("errors")
+        return None
+
+    def iter_pages(self, progress_callback=None, keep_results=False):
+        """Même interface que V1/V2 (run_analysis s'appuie dessus) ; ferme le navigateur en fin de crawl."""
+        try:
+            yield from super().iter_pages(progress_callback=progress_callback, keep_results=keep_results)
+        finally:
+            self.close()
+
+
+__all__ = ["HybridScraper", "BrowserRenderer", "HYBRID_WORKERS"]
@@ -5,12 +5,26 @@ Moteur : Crawl4AI (Playwright async) → x5 à x10 plus rapide que V1
 Logique métier : 100% préservée (JSON-LD, patterns, titles, normalization)
 
 Nouveautés vs V1 :
-  ✅ Crawl parallèle async (20-50 pages simultanées)
+  ✅ Crawl parallèle async (20-50 pages simultanées, fenêtre glissante)
   ✅ Markdown LLM-ready natif (fit_markdown sans nav/footer/ads)
   ✅ Extraction structurée CSS/XPath sans LLM
-  ✅ Cache persistant entre sessions
+  ✅ Cache persistant entre sessions (emplacement, TTL par domaine, plafond : core/crawl_cache.py)
   ✅ Anti-détection natif (Playwright + stealth)
   ✅ Crash recovery (resume_state sur long crawls)
+  ✅ Rendu adaptatif par host (statique → rendu léger, SPA → rendu complet)
+  ✅ robots.txt respecté (Disallow avant le frontier, Crawl-delay par host, core/robots.py)
+  ✅ Concurrence et débit adaptatifs par host (backoff 429/5xx, Retry-After, core/host_limiter.py)
+  ✅ Réponses non HTML ou trop volumineuses écartées (core/bounded_fetch.py)
+  ✅ Quasi-doublons repérés par SimHash (near_duplicates="flag" / "drop", core/simhash.py)
+  ✅ rel=canonical respecté : URL dont la canonique est déjà retenue ni gardée ni re-crawlée
+  ✅ Exécution en arrière-plan avec pause / annulation (core/crawl_runner.py)
+  ✅ Extraction HTML hors de la boucle asyncio (pool de threads ou de processus, core/page_record.py)
+  ✅ Navigateurs chauds partagés par les crawls et fetch_page (core/browser_pool.py)
+  ✅ Images, vidéos, polices et traceurs bloqués au rendu (block_resources, core/resource_blocking.py)
+  ✅ HTML complet compressé hors des pages (html_ref, core/page_store.py) au lieu d'une troncature à 5 Ko
+  ✅ Amorçage optionnel par les sitemaps (sitemap_seed=True, core/sitemaps.py)
+  ✅ Frontier best-first optionnel (frontier="priority") : un maximum de templates d'URL
+     couverts dans max_urls
   ✅ Interface identique à V1 (même run_analysis, même dict résultat)
 
 Compatibilité :
@@ -21,20 +35,33 @@ Compatibilité :
 """
 
 import asyncio
-import json
+from concurrent.futures import BrokenExecutor
 import time
-import re
-from urllib.parse import urlparse, urljoin, urlunparse
-from typing import Optional, List, Dict, Any, Callable
-from core.link_extractor import LinkExtractor
+import uuid
+from urllib.parse import urlparse
+from typing import Optional, List, Dict, Any, Callable, Iterator, AsyncIterator
+from core.spa_detection import compare_raw_vs_rendered, looks_client_rendered
 
 # ── Crawl4AI ────────────────────────────────────────────────────────────────
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, BrowserConfig, CacheMode
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
 
-# ── Parsing classique (pour JSON-LD soup + titres) ───────────────────────────
-from bs4 import BeautifulSoup
+# ── Parsing (extraction une passe lxml : titres, liens, JSON-LD) ─────────────
+from core import page_record
+from core.http_cache import get_http_cache, http_date_to_iso
+from core.checkpoint import CrawlCheckpoint
+from core.frontier import CanonicalIndex, Frontier, FrontierQueue, PriorityFrontier, make_visited, load_visited, BLOOM_FP_RATE
+from core.sitemaps import fetch_sitemap_entries
+from core.robots import CrawlDelayScheduler, make_robots
+from core.host_limiter import LIMITER_MAX_RETRIES, make_host_limiter
+from core.simhash import NEAR_DUPLICATE_MODES, NearDuplicateIndex
+from core.browser_pool import get_browser_pool
+from core.page_store import attach_html, get_page_store
+from core.crawl_cache import make_crawl_cache
+from core.resource_blocking import install_resource_blocking, make_resource_blocker
+from core.bounded_fetch import FETCH_MAX_BYTES, ResponseRejected, accepted_content_type, bounded_get, check_headers
 import requests
+from requests.structures import CaseInsensitiveDict
 
 # Constantes partagées (évite listes recréées à chaque instance)
 EXCLUDE_PATTERNS = (
@@ -42,7 +69,11 @@ EXCLUDE_PATTERNS = (
     ".doc", ".docx", "tel:", "mailto:", "javascript:", "void(0)",
 )
 PAGE_TIMEOUT_MS = 30000
-MAX_QUEUE_LINKS = 5000
+MAX_QUEUE_LINKS = 5000   # URLs du frontier gardées en mémoire (au-delà : débordement disque)
+RENDER_MODES = ("adaptive", "full", "light")
+RENDER_PROBE_PAGES = 3        # pages sondées (brut vs rendu) avant de classer un host
+RENDER_SUSPECT_PAGES = 3      # pages légères d'allure SPA avant de repasser un host "static" en complet
+RAW_PROBE_TIMEOUT = 10
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -63,9 +94,23 @@ class HotaruScraperV2:
         selenium_mode: str = None,        # Ignoré (Playwright natif)
         log_callback: Callable = None,
         proxy: Optional[str] = None,
-        cache: bool = True,               # NOUVEAU : cache entre sessions
+        cache=True,                       # pages rendues en cache entre sessions : True, False ou CrawlCache (core/crawl_cache.py)
         concurrency: int = 10,            # NOUVEAU : pages en parallèle
         extra_domains: Optional[List[str]] = None,  # Domaines rattachés (site multi-domaines)
+        render_mode: str = "adaptive",    # "adaptive" (par host), "full" (toujours JS lourd), "light"
+        checkpoint=None,                  # CrawlCheckpoint ou chemin : points de reprise (cf. resume)
+        visited_mode: str = "compact",    # URLs vues : "compact" (empreintes), "bloom", "exact" (core/frontier.py)
+        visited_fp_rate: float = BLOOM_FP_RATE,  # faux positifs tolérés en mode "bloom"
+        frontier: str = "bfs",            # "bfs" (largeur d'abord) ou "priority" (couverture des templates)
+        sitemap_seed: bool = False,       # frontier amorcé par les sitemaps (robots.txt / sitemap.xml)
+        robots=True,                      # True : robots.txt respecté, False : ignoré, ou RobotsCache partagé
+        host_limits=True,                 # True : concurrence/débit adaptatifs par host, False : désactivé, ou HostLimiter
+        max_page_bytes: int = FETCH_MAX_BYTES,  # taille max d'une page (octets) ; au-delà, page écartée
+        near_duplicates: Optional[str] = "flag",  # quasi-doublons : "flag" (marqués), "drop" (écartés), None
+        parse_offload: Optional[str] = "thread",  # extraction HTML hors boucle : "thread", "process" ou None
+        shared_browser: bool = True,      # navigateurs chauds du processus (core/browser_pool.py) ; False : Chromium dédié
+        block_resources="media",          # ressources bloquées au rendu : "media", "strict", "trackers" ou None
+        blocked_domains: Optional[List[str]] = None,  # domaines bloqués en plus des traceurs connus (par audit)
     ):
         # ── Normalisation des URLs d'entrée ──────────────────────────────────
         if isinstance(start_urls, str):
@@ -93,12 +138,48 @@ class HotaruScraperV2:
         self.max_urls = max_urls
         self.log_callback = log_callback
         self.proxy = proxy
-        self.cache = cache
+        self.cache = bool(cache)
+        # Cache disque géré (TTL par domaine, plafond) ; None avec cache=True : cache interne de Crawl4AI
+        self._crawl_cache = make_crawl_cache(cache)
         self.concurrency = concurrency
+        self.max_page_bytes = max_page_bytes
+        self.render_mode = render_mode if render_mode in RENDER_MODES else "adaptive"
+        # Profil de rendu par host : {"verdict": None|"static"|"spa", "probes": int, "static_probes": int}
+        self._render_hosts: Dict[str, Dict] = {}
 
         # Résultats
         self.results: List[Dict] = []
-        self.visited: set = set()
+        self.visited_mode = visited_mode
+        self.visited_fp_rate = visited_fp_rate
+        self.visited = make_visited(visited_mode, visited_fp_rate)
+        self.frontier_mode = frontier
+        self.sitemap_seed = sitemap_seed
+        self._sitemap_entries: Optional[Dict[str, Dict]] = None  # sitemaps lus une fois par crawl
+        # robots.txt : filtrage avant le frontier + espacement Crawl-delay par host
+        self._robots = make_robots(robots, _revalidation_session())
+        self._crawl_delay = CrawlDelayScheduler(self._robots) if self._robots is not None else None
+        # Concurrence/débit par host (plafond : concurrency), partageable avec V1
+        self._host_limiter = make_host_limiter(host_limits, concurrency)
+        self._templates = set()       # patterns d'URL des pages retenues (stats["templates_crawled"])
+        self._pattern_groups = set()  # groupes analyze_patterns des pages retenues (crawl_summary sans results)
+        self.near_duplicates = near_duplicates if near_duplicates in NEAR_DUPLICATE_MODES else None
+        self.parse_offload = parse_offload if parse_offload in page_record.PARSE_OFFLOAD_MODES else None
+        self.shared_browser = shared_browser
+        # HTML complet compressé hors des pages (core/page_store.py) : html_ref + aperçu html_content,
+        # blobs rangés sous la portée du crawl (libérés par page_store.release(page_scope))
+        self._page_store = get_page_store()
+        self.page_scope = uuid.uuid4().hex
+        # Images, vidéos, polices, traceurs abandonnés avant téléchargement (core/resource_blocking.py)
+        self._blocker = make_resource_blocker(block_resources, blocked_domains)
+        self._near_dups = NearDuplicateIndex() if self.near_duplicates else None
+        self._canonicals = CanonicalIndex()  # clés rel=canonical des pages retenues
+        # Crawl suspendu tant que l'événement est baissé (posé par core/crawl_runner.py)
+        self.pause_gate: Optional[asyncio.Event] = None
+
+        # Points de reprise (crawls longs) : frontier restauré par resume()
+        self._checkpoint = CrawlCheckpoint.coerce(checkpoint)
+        self._resume_frontier: Optional[List[str]] = None
+        self._resumed_pages = 0
 
         # Vérification : les URLs de départ sont du même domaine (première URL)
         for url in self.start_urls:
@@ -118,12 +199,30 @@ class HotaruScraperV2:
             "links_discovered": 0,
             "links_filtered": 0,
             "links_duplicate": 0,
+            "queue_full_blocks": 0,
+            "frontier_spilled": 0,
+            "frontier_peak": 0,
+            "templates_crawled": 0,
+            "sitemap_urls": 0,
+            "sitemap_seeded": 0,
+            "robots_blocked": 0,
+            "throttle_retries": 0,
+            "rejected_non_html": 0,
+            "rejected_too_large": 0,
+            "near_duplicates": 0,
+            "canonical_duplicates": 0,
+            "parse_offloaded": 0,
             "errors": 0,
             "start_urls_count": len(self.start_urls),
             "cache_hits": 0,
+            "cache_misses": 0,
             "engine": "Crawl4AI v0.8 (Playwright)",
             "concurrency": concurrency,
             "proxy_used": proxy or "Aucun",
+            "render_mode": self.render_mode,
+            "renders_full": 0,
+            "renders_light": 0,
+            "render_profiles": {},
         }
 
         self.filtered_log = []
@@ -135,8 +234,12 @@ class HotaruScraperV2:
             self._log(f"   Domaines rattachés : {len(extra_domains)}")
         self._log(f"   Max URLs : {max_urls}")
         self._log(f"   Concurrence : {concurrency} pages en parallèle")
-        self._log(f"   Cache : {'activé' if cache else 'désactivé'}")
+        if self._crawl_cache is not None:
+            self._log(f"   Cache : {self._crawl_cache.directory} (TTL {self._crawl_cache.ttl_for(self.domain):g} h)")
+        else:
+            self._log(f"   Cache : {'activé' if cache else 'désactivé'}")
         self._log(f"   Proxy : {proxy or 'Aucun'}")
+        self._log(f"   Rendu : {self.render_mode}")
 
     # ══════════════════════════════════════════════════════════════════════════
     #  UTILITAIRES (identiques à V1)
@@ -144,15 +247,7 @@ class HotaruScraperV2:
 
     def normalize_url(self, url: str) -> str:
         """Normalise une URL pour éviter les doublons."""
-        url = url.split("#")[0].split("?")[0]
-        parsed = urlparse(url)
-        path = parsed.path.rstrip("/") or "/"
-        path = path.lower()
-        return urlunparse((
-            parsed.scheme.lower(),
-            parsed.netloc.lower(),
-            path, "", "", ""
-        ))
+        return page_record.normalize_url(url)
 
     def _log(self, message: str):
         """Log visible dans Streamlit ET console."""
@@ -170,261 +265,121 @@ class HotaruScraperV2:
 
     def clean_title(self, title: str, h1: str, url: str) -> str:
         """Nettoie le titre (identique à V1)."""
-        domain_name = urlparse(url).netloc.split(".")[0].lower()
-
-        def is_useful(text):
-            if not text or len(text) < 3:
-                return False
-            text_clean = text.lower().replace(" ", "").replace("-", "")
-            if domain_name in text_clean and len(text_clean) < len(domain_name) + 5:
-                return False
-            return True
-
-        text = h1 if (h1 and len(h1) > 10) else (title if (title and len(title) > 5) else "")
-
-        if text:
-            separators = [" - ", " | ", " : ", " — ", " – ", " · "]
-            for sep in separators:
-                if sep in text:
-                    parts = [p.strip() for p in text.split(sep)]
-                    useful_parts = [p for p in parts if is_useful(p)]
-                    if useful_parts:
-                        text = max(useful_parts, key=len)
-                    break
-
-        if not is_useful(text):
-            path = urlparse(url).path
-            segments = [s for s in path.split("/") if s and s not in ["fr", "en", "de", "es", "www"]]
-            text = segments[-1].replace("-", " ").replace("_", " ").title() if segments else "Accueil"
-
-        text = text.strip()
-        return text[:40] + ".." if len(text) > 40 else text
+        return page_record.clean_title(title, h1, url)
 
     # ══════════════════════════════════════════════════════════════════════════
     #  JSON-LD (logique métier V1 préservée + améliorée)
     # ══════════════════════════════════════════════════════════════════════════
 
-    def _extract_jsonld_from_soup(self, soup: BeautifulSoup) -> List[Dict]:
-        """Extraction JSON-LD depuis BeautifulSoup (identique V1)."""
-        out = []
-        for script in soup.find_all("script"):
-            t = (script.get("type") or "").lower()
-            if "ld+json" not in t:
-                continue
-            try:
-                raw = script.string or script.get_text(strip=True) or ""
-                if not raw.strip():
-                    continue
-                out.append(json.loads(raw))
-            except (json.JSONDecodeError, TypeError):
-                continue
-        return out
-
     def _extract_jsonld_from_html(self, html: str) -> List[Dict]:
-        """
-        Extraction JSON-LD robuste depuis HTML brut via regex.
-        Complément à soup pour les cas edge (scripts dynamiques injectés).
-        """
-        pattern = r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>'
-        matches = re.findall(pattern, html, re.IGNORECASE | re.DOTALL)
-        out = []
-        for raw in matches:
-            raw = raw.strip()
-            if not raw:
-                continue
-            try:
-                out.append(json.loads(raw))
-            except (json.JSONDecodeError, TypeError):
-                continue
-        return out
+        """Extraction JSON-LD par regex (complément lxml, cf. core/page_record.py)."""
+        return page_record.extract_jsonld_regex(html)
 
     def _merge_jsonld_no_duplicates(self, list_a: List, list_b: List = None) -> List:
         """Fusionne deux listes JSON-LD sans doublons (identique V1)."""
-        list_b = list_b or []
-        seen = set()
-        merged = []
-        for block in list_a + list_b:
-            if block is None:
-                continue
-            try:
-                canonical = json.dumps(block, sort_keys=True)
-                if canonical in seen:
-                    continue
-                seen.add(canonical)
-                merged.append(block)
-            except (TypeError, ValueError):
-                continue
-        return merged
+        return page_record.merge_jsonld(list_a, list_b)
 
     # ══════════════════════════════════════════════════════════════════════════
     #  CONSTRUCTION RÉSULTAT (compatible V1 + champs nouveaux)
     # ══════════════════════════════════════════════════════════════════════════
 
+    def _page_inputs(self, crawl_result) -> Dict:
+        """Entrées de page_record.extract_page_record (HTML, liens Crawl4AI, markdown, résultat JS) : picklables."""
+        crawl4ai_links = []
+        if getattr(crawl_result, "links", None):
+            internal = (crawl_result.links or {}).get("internal", []) or []
+            for link_obj in internal:
+                href = link_obj.get("href", "") if isinstance(link_obj, dict) else str(link_obj)
+                if href and href.startswith(("http", "/")):
+                    crawl4ai_links.append(href)
+        return {
+            "html": crawl_result.html or "",
+            "crawl4ai_links": crawl4ai_links,
+            "markdown": self._markdown_texts(crawl_result)[0],
+            "js_result": getattr(crawl_result, "js_execution_result", None),
+            "compress": self._page_store is not None,
+        }
+
+    @staticmethod
+    def _markdown_texts(crawl_result):
+        """(markdown complet, fit_markdown) du CrawlResult."""
+        markdown_obj = getattr(crawl_result, "markdown", None)
+        raw_md = ""
+        fit_md = ""
+        if markdown_obj:
+            if hasattr(markdown_obj, "raw_markdown"):
+                raw_md = markdown_obj.raw_markdown or ""
+            elif isinstance(markdown_obj, str):
+                raw_md = markdown_obj
+            if hasattr(markdown_obj, "fit_markdown"):
+                fit_md = markdown_obj.fit_markdown or ""
+        return raw_md, fit_md
+
     def _build_page_result(
         self,
         url: str,
         crawl_result,          # CrawlResult de Crawl4AI
     ) -> Optional[Dict]:
         """
-        Construit le dict résultat standard depuis un CrawlResult Crawl4AI.
+        Construit le dict résultat standard depuis un CrawlResult Crawl4AI (extraction dans le thread courant).
         Clés identiques à V1 + 'markdown' et 'fit_markdown' en bonus.
         """
-        try:
-            # DEBUG: Log au début pour tracer l'exécution
-            self._log(f"  🔍 Traitement: {url}")
-            html_content = crawl_result.html or ""
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # ── Titre & H1 ───────────────────────────────────────────────────
-            raw_title = soup.title.string.strip() if soup.title else ""
-            h1_tag = soup.find("h1")
-            h1 = h1_tag.get_text().strip() if h1_tag else ""
-            final_title = self.clean_title(raw_title, h1, url)
-
-            # ── Meta description ─────────────────────────────────────────────
-            meta_desc = ""
-            meta_tag = soup.find("meta", attrs={"name": "description"})
-            if meta_tag and meta_tag.get("content"):
-                meta_desc = meta_tag["content"].strip()
-
-            # ── Liens internes (utiliser LinkExtractor centralisé) ───────────────
-            normalized_current = self.normalize_url(url)
-
-            # Extraire liens de TOUS les fallbacks en parallèle
-            crawl4ai_links = []
-            if getattr(crawl_result, "links", None):
-                internal = (crawl_result.links or {}).get("internal", []) or []
-                for link_obj in internal:
-                    href = link_obj.get("href", "") if isinstance(link_obj, dict) else str(link_obj)
-                    if href and href.startswith(("http", "/")):
-                        crawl4ai_links.append(href)
-
-            soup_links = LinkExtractor.extract_from_soup(soup)
-            data_href_links = LinkExtractor.extract_from_data_href(soup)
-
-            markdown_text = ""
-            if getattr(crawl_result, "markdown", None):
-                md_obj = crawl_result.markdown
-                if hasattr(md_obj, "raw_markdown"):
-                    markdown_text = md_obj.raw_markdown or ""
-                elif isinstance(md_obj, str):
-                    markdown_text = md_obj
-            markdown_links = LinkExtractor.extract_from_markdown(markdown_text)
-
-            js_res = getattr(crawl_result, "js_execution_result", None)
-            js_links = LinkExtractor.extract_from_js_result(js_res)
-
-            # Fusion COMPLÈTE avec déduplication automatique
-            raw_links_set = LinkExtractor.merge_sources(
-                crawl4ai_links=crawl4ai_links,
-                soup_links=soup_links,
-                data_href_links=data_href_links,
-                js_links=js_links,
-                markdown_links=markdown_links,
-            )
+        self._log(f"  🔍 Traitement: {url}")
+        return self._extract_inline(url, crawl_result, self._page_inputs(crawl_result))
 
-            # Log sources trovées
-            sources_found = []
-            if crawl4ai_links:
-                sources_found.append(f"Crawl4AI({len(crawl4ai_links)})")
-            if soup_links:
-                sources_found.append(f"Soup({len(soup_links)})")
-            if data_href_links:
-                sources_found.append(f"data-href({len(data_href_links)})")
-            if js_links:
-                sources_found.append(f"JS({len(js_links)})")
-            if markdown_links:
-                sources_found.append(f"Markdown({len(markdown_links)})")
-
-            if sources_found:
-                self._log(f"    Sources: {', '.join(sources_found)}")
-
-            # Filtrer par domaine
-            valid_links, filtered_count = LinkExtractor.filter_by_domain(
-                list(raw_links_set),
-                self._domain_set,
-                url,
-                self.exclude_patterns,
+    async def _build_page_result_async(self, url: str, crawl_result) -> Optional[Dict]:
+        """
+        _build_page_result avec l'extraction (lxml, liens, JSON-LD, SimHash) dans le pool parse_offload :
+        la boucle ne fait que préparer les entrées et compléter la page compacte retournée.
+        """
+        pool = page_record.parse_pool(self.parse_offload)
+        if pool is None:
+            return self._build_page_result(url, crawl_result)
+        self._log(f"  🔍 Traitement: {url}")
+        inputs = self._page_inputs(crawl_result)
+        try:
+            record = await asyncio.get_running_loop().run_in_executor(
+                pool, page_record.extract_page_record, url, inputs, self._domain_set, tuple(self.exclude_patterns)
             )
-            self.stats["links_filtered"] += filtered_count
-
-            # Nettoyer les doublons (self-link)
-            unique_links = []
-            for link in valid_links:
-                clean_link = self.normalize_url(link)
-                if clean_link != normalized_current:
-                    unique_links.append(clean_link)
-
-            unique_links = list(set(unique_links))
-            self.stats["links_discovered"] += len(unique_links)
-
-            # ⚠️ DEBUG: Avertir si aucun lien découvert
-            if not unique_links and raw_links_set:
-                self._log(f"⚠️  {len(raw_links_set)} lien(s) trouvé(s) mais aucun du domaine!")
-            elif not unique_links:
-                self._log(f"⚠️  AUCUN lien découvert")
-                self._log(f"    HTML: {len(html_content)} bytes, Domaine: {self.domain}")
-
-            # ── JSON-LD (double extraction fusionnée) ────────────────────────
-            json_ld_soup = self._extract_jsonld_from_soup(soup)
-            json_ld_raw = self._extract_jsonld_from_html(html_content)
-            json_ld_data = self._merge_jsonld_no_duplicates(json_ld_soup, json_ld_raw)
-
-            # ── FALLBACK pour sites SANS JSON-LD ──────────────────────────────
-            fallback_used = False
-            if not json_ld_data:
-                fallback_struct = self._extract_html_fallback(soup, url)
-                json_ld_data = [fallback_struct]  # Enrober dans liste pour compatibilité
-                fallback_used = True
-                self._log(f"  💡 Fallback HTML activé (pas de JSON-LD trouvé)")
-
-            # ── Markdown (NOUVEAU — LLM-ready) ───────────────────────────────
-            markdown_obj = crawl_result.markdown
-            raw_md = ""
-            fit_md = ""
-            if markdown_obj:
-                if hasattr(markdown_obj, "raw_markdown"):
-                    raw_md = markdown_obj.raw_markdown or ""
-                elif isinstance(markdown_obj, str):
-                    raw_md = markdown_obj
-                if hasattr(markdown_obj, "fit_markdown"):
-                    fit_md = markdown_obj.fit_markdown or ""
-
-            # ── Temps de réponse ─────────────────────────────────────────────
-            response_time = getattr(crawl_result, "response_headers", {})
-            # Crawl4AI ne donne pas de response_time direct, on estime 0
-            response_time = 0.0
-
-            # 🚀 OPTIMISATION: Tronquer HTML pour réduire la mémoire
-            # (Garder 5KB max, suffisant pour structure + liens)
-            html_truncated = html_content[:5120] if len(html_content) > 5120 else html_content
-
-            return {
-                # ── Clés V1 (100% compatibles) ────────────────────────────
-                "url": url,
-                "title": final_title,
-                "links": unique_links,
-                "description": meta_desc,
-                "h1": h1,
-                "response_time": response_time,
-                "html_content": html_truncated,       # ← TRUNCATED to 5KB
-                "html_full_size": len(html_content),  # ← Track original size
-                "last_modified": "",
-                "has_structured_data": bool(json_ld_data),
-                "json_ld": json_ld_data,
-                "fallback_used": fallback_used,        # ← NOUVEAU: indique si fallback
-                "h2_count": len(soup.find_all("h2")),
-                "lists_count": len(soup.find_all(["ul", "ol"])),
-                # ── Clés NOUVELLES V2 ─────────────────────────────────────
-                "markdown": raw_md,           # Page complète en Markdown
-                "fit_markdown": fit_md,        # Contenu core uniquement (LLM)
-                "crawl4ai_success": crawl_result.success,
-            }
-
+        except Exception as e:
+            if isinstance(e, BrokenExecutor):
+                # Pool inutilisable (processus tué, démarrage impossible) : repli process → thread → boucle
+                page_record.discard_parse_pool(self.parse_offload)
+                fallback = "thread" if self.parse_offload == "process" else None
+                self._log(f"  ⚠️  Pool d'extraction '{self.parse_offload}' indisponible ({e}) : repli sur {fallback or 'la boucle'}")
+                self.parse_offload = fallback
+            # Extraction refaite ici : une défaillance du pool ne coûte pas la page
+            return self._extract_inline(url, crawl_result, inputs)
+        self.stats["parse_offloaded"] += 1
+        return self._complete_page_record(crawl_result, record)
+
+    def _extract_inline(self, url: str, crawl_result, inputs: Dict) -> Optional[Dict]:
+        try:
+            record = page_record.extract_page_record(url, inputs, self._domain_set, tuple(self.exclude_patterns))
         except Exception as e:
             self._log(f"Erreur _build_page_result({url}): {e}")
             self.stats["errors"] += 1
             return None
+        return self._complete_page_record(crawl_result, record)
+
+    def _complete_page_record(self, crawl_result, record: Dict) -> Dict:
+        """Page compacte de extract_page_record + compteurs, logs, en-têtes et markdown (dans la boucle)."""
+        self.stats["links_filtered"] += record["links_filtered"]
+        self.stats["links_discovered"] += record["links_discovered"]
+        for line in record["logs"]:
+            self._log(line)
+        page = record["page"]
+        response_headers = CaseInsensitiveDict(getattr(crawl_result, "response_headers", None) or {})
+        raw_md, fit_md = self._markdown_texts(crawl_result)
+        page["last_modified"] = http_date_to_iso(response_headers.get("Last-Modified"))
+        attach_html(page, crawl_result.html or "", self._page_store, record.get("html_blob"), self.page_scope)
+        # ── Clés NOUVELLES V2 ─────────────────────────────────────────────
+        page["markdown"] = raw_md             # Page complète en Markdown
+        page["fit_markdown"] = fit_md         # Contenu core uniquement (LLM)
+        page["crawl4ai_success"] = crawl_result.success
+        page["etag"] = response_headers.get("ETag", "")
+        page["content_hash"] = page.pop("content_hash")  # dernière clé, comme avant
+        return page
 
     # ══════════════════════════════════════════════════════════════════════════
     #  CONFIGURATION CRAWL4AI
@@ -440,10 +395,17 @@ class HotaruScraperV2:
             kwargs["proxy"] = {"server": self.proxy}
         return BrowserConfig(**kwargs)
 
-    def _get_run_config(self, cache_mode=None) -> CrawlerRunConfig:
-        """Configure une exécution de crawl."""
+    def _get_run_config(self, cache_mode=None, light: bool = False) -> CrawlerRunConfig:
+        """
+        Configure une exécution de crawl.
+        light=True : profil pour pages statiques (pas d'attente JS, pas de scroll ni simulation
+        utilisateur) — le HTML serveur contient déjà liens et JSON-LD.
+        Profil de blocage des ressources transmis au hook du navigateur par shared_data.
+        Cache géré (core/crawl_cache.py) consulté avant le rendu : Crawl4AI rend alors sans son propre cache.
+        """
         if cache_mode is None:
-            cache_mode = CacheMode.ENABLED if self.cache else CacheMode.BYPASS
+            cache_mode = CacheMode.ENABLED if self.cache and self._crawl_cache is None else CacheMode.BYPASS
+        blocking = {"shared_data": self._blocker.shared_data()} if self._blocker is not None else {}
 
         # JS : forcer l'extraction des liens depuis le DOM rendu (sites SPA / sans JSON-LD)
         # ✅ Collecte TOUS les liens <a> pour fallback en cas où Crawl4AI n'en extrait pas
@@ -459,6 +421,20 @@ class HotaruScraperV2:
             "return out; "
             "})()"
         )
+        if light:
+            return CrawlerRunConfig(
+                cache_mode=cache_mode,
+                page_timeout=PAGE_TIMEOUT_MS,
+                delay_before_return_html=0.1,
+                scan_full_page=False,
+                js_code=js_collect_links,
+                simulate_user=False,
+                magic=False,
+                word_count_threshold=10,
+                remove_overlay_elements=False,
+                exclude_external_links=False,
+                **blocking,
+            )
         return CrawlerRunConfig(
             cache_mode=cache_mode,
             page_timeout=PAGE_TIMEOUT_MS,
@@ -481,8 +457,142 @@ class HotaruScraperV2:
             # ⚠️ FIXE: exclude_external_links=False pour voir TOUS les liens
             # (On va filtrer par domaine manuellement après)
             exclude_external_links=False,
+            **blocking,
         )
 
+    # ══════════════════════════════════════════════════════════════════════════
+    #  RENDU ADAPTATIF PAR HOST (statique vs SPA)
+    # ══════════════════════════════════════════════════════════════════════════
+
+    def _render_profile(self, url: str) -> str:
+        """
+        Profil de rendu pour une URL : "full", "light" ou "probe" (rendu complet + HTML brut
+        comparés pour classer le host). Tant que le host n'est pas classé : rendu complet.
+        """
+        if self.render_mode != "adaptive":
+            return self.render_mode
+        host = urlparse(url).netloc.lower()
+        state = self._render_hosts.setdefault(host, {"verdict": None, "probes": 0, "static_probes": 0})
+        if state["verdict"] == "static":
+            return "light"
+        if state["verdict"] == "spa":
+            return "full"
+        if state["probes"] < RENDER_PROBE_PAGES:
+            state["probes"] += 1
+            return "probe"
+        return "full"
+
+    def _set_host_verdict(self, host: str, verdict: str, reasons: List[str]):
+        """Fixe le profil d'un host et l'expose dans stats['render_profiles']."""
+        state = self._render_hosts.setdefault(host, {"verdict": None, "probes": 0, "static_probes": 0})
+        if state["verdict"] == verdict:
+            return
+        state["verdict"] = verdict
+        self.stats["render_profiles"][host] = verdict
+        label = "statique → rendu léger" if verdict == "static" else "SPA → rendu complet"
+        self._log(f"  🎚️ {host} : {label}" + (f" ({'; '.join(reasons)})" if reasons else ""))
+
+    def _record_probe(self, url: str, raw_html: str, rendered_html: Optional[str]):
+        """Enregistre une sonde brut/rendu. Une seule page SPA suffit ; RENDER_PROBE_PAGES statiques pour alléger."""
+        host = urlparse(url).netloc.lower()
+        state = self._render_hosts[host]
+        if rendered_html is None:
+            state["probes"] -= 1  # rendu échoué : sonde non concluante, une autre page la remplacera
+            return
+        verdict = compare_raw_vs_rendered(raw_html, rendered_html)
+        if verdict["needs_render"]:
+            self._set_host_verdict(host, "spa", verdict["reasons"])
+            return
+        state["static_probes"] += 1
+        if state["static_probes"] >= RENDER_PROBE_PAGES:
+            self._set_host_verdict(host, "static", [])
+
+    def _fetch_raw_html(self, url: str) -> str:
+        """HTML serveur (sans JS) pour la sonde ; chaîne vide si indisponible."""
+        try:
+            proxies = {"http": self.proxy, "https": self.proxy} if self.proxy else None
+            resp = bounded_get(
+                requests,
+                url,
+                max_bytes=self.max_page_bytes,
+                timeout=RAW_PROBE_TIMEOUT,
+                proxies=proxies,
+                headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+            )
+            if resp.status_code != 200:
+                return ""
+            resp.encoding = resp.encoding or resp.apparent_encoding or "utf-8"
+            return resp.text
+        except Exception:
+            return ""
+
+    async def _crawl_url(self, crawler, url: str, run_configs: Dict[str, CrawlerRunConfig]):
+        """
+        Crawl une URL avec le profil de rendu de son host.
+        Retourne le CrawlResult, ou l'exception levée par Crawl4AI.
+        """
+        profile = self._render_profile(url)
+        raw_task = None
+        if profile == "probe":
+            raw_task = asyncio.create_task(asyncio.to_thread(self._fetch_raw_html, url))
+
+        light = profile == "light"
+        try:
+            cr = await crawler.arun(url=url, config=run_configs["light" if light else "full"])
+        except Exception as e:
+            cr = e
+        self.stats["renders_light" if light else "renders_full"] += 1
+        ok = not isinstance(cr, Exception) and cr is not None and cr.success
+
+        if raw_task is not None:
+            raw_html = await raw_task
+            self._record_probe(url, raw_html, (cr.html or "") if ok else None)
+        elif light and ok:
+            # Garde-fou : page rendue en léger qui semble construite côté client → page re-rendue en complet ;
+            # le host ne repasse en complet qu'après RENDER_SUSPECT_PAGES pages (une page contact ou mentions
+            # légales au texte court ne suffit pas)
+            check = await asyncio.to_thread(looks_client_rendered, cr.html or "")
+            if check["client_rendered"]:
+                host = urlparse(url).netloc.lower()
+                state = self._render_hosts.setdefault(host, {"verdict": "static", "probes": 0, "static_probes": 0})
+                state["suspects"] = state.get("suspects", 0) + 1
+                if state["suspects"] >= RENDER_SUSPECT_PAGES:
+                    self._set_host_verdict(host, "spa", check["reasons"])
+                try:
+                    cr = await crawler.arun(url=url, config=run_configs["full"])
+                except Exception as e:
+                    cr = e
+                self.stats["renders_full"] += 1
+        return cr
+
+    async def _crawl_limited(self, crawler, url: str, run_configs: Dict[str, CrawlerRunConfig]):
+        """_crawl_url sous le limiteur du host : slot réservé, réponse signalée, URL réessayée après un 429/503."""
+        if self._host_limiter is None:
+            return await self._crawl_url(crawler, url, run_configs)
+        for attempt in range(LIMITER_MAX_RETRIES + 1):
+            await self._host_limiter.acquire_async(url)
+            started = time.time()
+            cr = None
+            try:
+                cr = await self._crawl_url(crawler, url, run_configs)
+            finally:
+                status = None if cr is None or isinstance(cr, Exception) else getattr(cr, "status_code", None)
+                # Échec sans code HTTP (exception, timeout de navigation) : erreur réseau pour le limiteur
+                failed = status is None and (cr is None or isinstance(cr, Exception) or not cr.success)
+                headers = CaseInsensitiveDict(getattr(cr, "response_headers", None) or {}) if status else {}
+                throttled = self._host_limiter.release(
+                    url,
+                    status=status,
+                    latency=time.time() - started,
+                    retry_after=headers.get("Retry-After"),
+                    error=failed,
+                )
+            if not throttled or attempt == LIMITER_MAX_RETRIES:
+                return cr
+            self.stats["throttle_retries"] += 1
+            self._log(f"   HTTP {cr.status_code} : nouvel essai après la pause du host ({url})")
+        return cr
+
     # ══════════════════════════════════════════════════════════════════════════
     #  CRAWL PRINCIPAL (async)
     # ══════════════════════════════════════════════════════════════════════════
@@ -490,114 +600,370 @@ class HotaruScraperV2:
     async def _crawl_async(
         self,
         progress_callback: Callable = None,
+        emit: Callable[[Dict], None] = None,
     ) -> List[Dict]:
         """
         Crawl principal async avec Crawl4AI.
-        BFS sur le domaine, concurrence configurable.
+        BFS sur le domaine en fenêtre glissante : `concurrency` consommateurs partagent une
+        asyncio.Queue, chaque slot libéré reprend immédiatement l'URL suivante (pas d'attente
+        de la page la plus lente d'un lot).
+        `emit` : reçoit chaque page retenue (cf. aiter_pages) ; sans emit, les pages sont
+        rassemblées dans self.results et retournées.
         """
         browser_config = self._get_browser_config()
-        run_config = self._get_run_config()
+        run_configs = {
+            "full": self._get_run_config(),
+            "light": self._get_run_config(light=True),
+        }
 
-        # File BFS manuelle pour contrôle fin + compatibilité V1
-        queue = list(self.start_urls)
-        self.visited.update(self.start_urls)
+        # File partagée par les workers (BFS ou best-first, contrôle fin + compatibilité V1)
+        queue = FrontierQueue(frontier=await asyncio.to_thread(self._new_frontier))
+        resumed = self._resume_frontier is not None
+        if resumed:
+            frontier, self._resume_frontier = self._resume_frontier, None
+            for page in self.results:
+                queue.frontier.note_taken(page["url"])
+        else:
+            frontier = list(self.start_urls)
+            self.visited.update(self.start_urls)
+            if self._checkpoint is not None:
+                self._checkpoint.reset()
+        for url in frontier:
+            queue.put_nowait(url)
+        if self._robots is not None:
+            # robots.txt des URLs de départ lu hors de la boucle (les filtres de liens sont synchrones)
+            for url in self.start_urls:
+                await asyncio.to_thread(self._robots.rules, url)
+        if self.sitemap_seed and not resumed:
+            await asyncio.to_thread(self._sitemap)
+            self._seed_from_sitemap(queue.frontier.accepts, queue.put_nowait)
         results = []
-        crawled_count = 0
+        collect = emit is None
+        if collect:
+            emit = results.append
+        if self._checkpoint is not None:
+            sink = emit
+
+            def emit(page: Dict):
+                self._checkpoint.add_page(page)
+                sink(page)
+        # crawled : pages retenues ; active : pages en cours (réservées sur le budget max_urls)
+        state = {"crawled": self._resumed_pages, "active": 0}
+        # URLs sorties de la file mais pas encore traitées (remises dans le frontier d'un point de reprise)
+        in_progress: List[str] = []
+
+        def _frontier() -> List[str]:
+            return in_progress + list(queue.frontier)
+        budget = asyncio.Condition()
 
         self._log(f"\n{'='*60}")
         self._log(f"CRAWL V2 — max {self.max_urls} pages | {self.concurrency} en parallèle")
         self._log(f"{'='*60}\n")
 
-        async with AsyncWebCrawler(config=browser_config) as crawler:
+        async def _reserve_slot() -> bool:
+            """Réserve une place dans le budget ; attend si les pages en cours peuvent encore le remplir."""
+            async with budget:
+                await budget.wait_for(
+                    lambda: state["crawled"] >= self.max_urls
+                    or state["crawled"] + state["active"] < self.max_urls
+                )
+                if state["crawled"] >= self.max_urls:
+                    return False
+                state["active"] += 1
+                return True
+
+        async def _release_slot(kept: bool):
+            async with budget:
+                state["active"] -= 1
+                if kept:
+                    state["crawled"] += 1
+                budget.notify_all()
+
+        async def _worker(crawler):
+            while True:
+                url = await queue.get()
+                try:
+                    if self.pause_gate is not None and not self.pause_gate.is_set():
+                        # En pause : l'URL reste dans le frontier d'un point de reprise si le crawl est annulé
+                        in_progress.append(url)
+                        await self.pause_gate.wait()
+                        in_progress.remove(url)
+                    if not await _reserve_slot():
+                        continue  # budget atteint : on vide la file sans crawler
+                    kept = False
+                    in_progress.append(url)
+                    try:
+                        owner = self._canonicals.covered_by(url)
+                        if owner:
+                            # Canonique déjà retenue entre la mise en file et maintenant : pas de rendu
+                            self._canonical_duplicate(url, owner)
+                            in_progress.remove(url)
+                            continue
+                        cr = await self._cached_result(url)
+                        if cr is None:
+                            if self._crawl_delay is not None:
+                                wait = await asyncio.to_thread(self._crawl_delay.reserve, url)
+                                if wait > 0:
+                                    await asyncio.sleep(wait)
+                            cr = await self._crawl_limited(crawler, url, run_configs)
+                            await self._store_result(url, cr)
+                        if self._accept_crawl_result(url, cr):
+                            page_data = await self._build_page_result_async(url, cr)
+                            kept = self._commit_page(page_data, queue, emit)
+                        in_progress.remove(url)
+                        if not kept and self._checkpoint is not None:
+                            self._checkpoint.add_failed(url)
+                        self._save_checkpoint(_frontier)
+                    except Exception as e:
+                        # Une page en erreur ne doit pas tuer le worker (queue.join() attendrait sans fin)
+                        self._log(f"Erreur worker ({url}): {e}")
+                        self.stats["errors"] += 1
+                        if url in in_progress:
+                            in_progress.remove(url)
+                        if not kept and self._checkpoint is not None:
+                            self._checkpoint.add_failed(url)
+                    finally:
+                        await _release_slot(kept)
+                    if progress_callback:
+                        progress_callback(
+                            f"{state['crawled']}/{self.max_urls} | Queue: {queue.qsize()} | En cours: {state['active']}",
+                            min(state["crawled"] / self.max_urls, 0.99),
+                        )
+                finally:
+                    queue.task_done()
 
-            while queue and crawled_count < self.max_urls:
-                # Prend un batch de N URLs
-                batch_size = min(self.concurrency, self.max_urls - crawled_count, len(queue))
-                batch = [queue.pop(0) for _ in range(batch_size)]
+        browser_pool = get_browser_pool() if self.shared_browser else None
+        if browser_pool is not None:
+            browser = browser_pool.crawler(browser_config)  # navigateur chaud : pas de lancement de Chromium
+        else:
+            browser = install_resource_blocking(AsyncWebCrawler(config=browser_config))
+        async with browser as crawler:
+            workers = [
+                asyncio.create_task(_worker(crawler))
+                for _ in range(max(1, self.concurrency))
+            ]
+            finished = False
+            try:
+                await queue.join()
+                finished = True
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                self._save_checkpoint(_frontier, force=True, done=finished)
+                self.stats["frontier_spilled"] = queue.frontier.stats["spilled"]
+                self.stats["frontier_peak"] = queue.frontier.stats["max_size"]
+                queue.frontier.close()
+                if self._crawl_delay is not None:
+                    self.stats["crawl_delay"] = dict(self._crawl_delay.stats)
+                if self._host_limiter is not None:
+                    self.stats["host_limits"] = self._host_limiter.snapshot()
+                if browser_pool is not None:
+                    self.stats["browser_pool"] = browser_pool.snapshot()
+                if self._blocker is not None:
+                    self.stats["resource_blocking"] = self._blocker.snapshot()
+                if self._crawl_cache is not None:
+                    self.stats["crawl_cache"] = await asyncio.to_thread(self._crawl_cache.snapshot)
+
+        if collect:
+            self.results = (self.results if resumed else []) + results
+        return results
+
+    async def _cached_result(self, url: str):
+        """Rendu encore frais du cache géré (stats cache_hits / cache_misses) ; None : page à rendre."""
+        if self._crawl_cache is None:
+            return None
+        cr = await asyncio.to_thread(self._crawl_cache.lookup, url)
+        if cr is None:
+            self.stats["cache_misses"] += 1
+            return None
+        self.stats["cache_hits"] += 1
+        self._log(f"  💾 Cache : {url}")
+        return cr
+
+    async def _store_result(self, url: str, cr):
+        """Met en cache un rendu réussi (hors de la boucle : compression et écriture SQLite)."""
+        if self._crawl_cache is not None and not isinstance(cr, Exception) and cr is not None and cr.success:
+            await asyncio.to_thread(self._crawl_cache.store, url, cr)
+
+    def _track_template(self, url: str):
+        """Compte le template d'URL d'une page retenue (couverture comparable en bfs et priority) et son groupe."""
+        self._templates.add(PriorityFrontier.pattern(url))
+        self._pattern_groups.add(self._pattern_group(url))
+        self.stats["templates_crawled"] = len(self._templates)
+
+    def _new_frontier(self):
+        """
+        Frontier du crawl : FIFO à débordement disque (bfs) ou best-first par template (priority, en mémoire).
+        <priority> du sitemap pris en compte seulement si les sitemaps sont lus de toute façon (sitemap_seed).
+        """
+        if self.frontier_mode != "priority":
+            return Frontier(memory_limit=MAX_QUEUE_LINKS)
+        sitemap = self._sitemap() if self.sitemap_seed else {}
+        priorities = {url: e["priority"] for url, e in sitemap.items() if e["priority"] is not None}
+        return PriorityFrontier(max_per_pattern=self.max_urls, sitemap_priority=priorities)
+
+    def _sitemap(self) -> Dict[str, Dict]:
+        """Entrées des sitemaps {url normalisée: {"lastmod", "priority"}}, lues une seule fois (bloquant)."""
+        if self._sitemap_entries is None:
+            self._sitemap_entries = {
+                self.normalize_url(url): entry
+                for url, entry in fetch_sitemap_entries(_revalidation_session(), self.base_url, robots=self._robots).items()
+            }
+            self.stats["sitemap_urls"] = len(self._sitemap_entries)
+        return self._sitemap_entries
+
+    def _seed_from_sitemap(self, accepts: Callable[[str], bool], push: Callable[[str], None]):
+        """URLs des sitemaps (domaines du crawl, filtres d'URL) ajoutées au frontier via push."""
+        seeded = 0
+        for url in self._sitemap():
+            if url in self.visited or urlparse(url).netloc.lower() not in self._domain_set:
+                continue
+            if not self.is_valid_url(url) or not self._robots_allowed(url) or not accepts(url):
+                continue
+            self.visited.add(url)
+            push(url)
+            seeded += 1
+        self.stats["sitemap_seeded"] = seeded
+        self._log(f"Sitemap : {seeded} URL(s) ajoutée(s) au frontier ({self.stats['sitemap_urls']} dans les sitemaps)")
 
-                percent = min(crawled_count / self.max_urls, 0.99)
-                if progress_callback:
-                    progress_callback(
-                        f"{crawled_count}/{self.max_urls} | Queue: {len(queue)}",
-                        percent,
-                    )
+    def _near_duplicate(self, page: Dict) -> bool:
+        """
+        Repère un quasi-doublon d'une page déjà retenue (SimHash) : marqué near_duplicate_of.
+        En mode "drop", True : page écartée (duplicate_log), hors budget et liens non suivis.
+        """
+        if self._near_dups is None:
+            return False
+        original = self._near_dups.match(page["url"], page.get("simhash"))
+        if original is None:
+            return False
+        self.stats["near_duplicates"] += 1
+        page["near_duplicate_of"] = original
+        if self.near_duplicates != "drop":
+            return False
+        self.duplicate_log.append((page["url"], f"quasi-doublon : {original}"))
+        self._log(f"  ♊ {page['url']} → quasi-doublon de {original}")
+        return True
 
-                self._log(f"Batch {crawled_count+1}–{crawled_count+batch_size} | Queue: {len(queue)}")
+    def _canonical_duplicate(self, url: str, owner: str):
+        """URL écartée : sa canonique est déjà couverte par la page retenue `owner`."""
+        self.stats["canonical_duplicates"] += 1
+        self.duplicate_log.append((url, f"canonical : {owner}"))
+        self._log(f"  🔗 {url} → canonique déjà couverte par {owner}")
 
-                # Crawl du batch en parallèle
-                tasks = [
-                    crawler.arun(url=url, config=run_config)
-                    for url in batch
-                ]
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+    def _robots_allowed(self, url: str) -> bool:
+        """False si robots.txt interdit l'URL (journalisée dans filtered_log, jamais mise en file)."""
+        if self._robots is None or self._robots.allowed(url):
+            return True
+        self.stats["robots_blocked"] += 1
+        self.filtered_log.append((url, "robots.txt"))
+        return False
+
+    def _attach_sitemap_lastmod(self, page: Dict):
+        """lastmod du sitemap reporté sur la page (si les sitemaps ont été lus pour ce crawl)."""
+        entry = self._sitemap_entries.get(page["url"]) if self._sitemap_entries else None
+        if entry and entry["lastmod"]:
+            page["sitemap_lastmod"] = entry["lastmod"]
+
+    def _accept_crawl_result(self, url: str, cr) -> bool:
+        """False (journalisé, compté) si le rendu a échoué ou n'est pas une page HTML exploitable."""
+        if isinstance(cr, Exception):
+            self._log(f"  ❌ {url} → {cr}")
+            self.stats["errors"] += 1
+            self.stats["pages_skipped"] += 1
+            return False
+
+        if not cr or not cr.success:
+            reason = getattr(cr, "error_message", "unknown") if cr else "null result"
+            self._log(f"  ⚠️  {url} → {reason}")
+            self.stats["pages_skipped"] += 1
+            return False
+
+        # Le navigateur a déjà téléchargé le corps : on évite au moins d'extraire un PDF ou un fichier énorme
+        content_type = CaseInsensitiveDict(getattr(cr, "response_headers", None) or {}).get("Content-Type")
+        too_large = self.max_page_bytes and len(cr.html or "") > self.max_page_bytes
+        if not accepted_content_type(content_type) or too_large:
+            reason = f"trop volumineuse ({len(cr.html)} car.)" if too_large else f"non HTML ({content_type.split(';')[0]})"
+            self._log(f"  ⏭️  {url} → {reason}")
+            self.filtered_log.append((url, reason))
+            self.stats["rejected_too_large" if too_large else "rejected_non_html"] += 1
+            self.stats["pages_skipped"] += 1
+            return False
+        return True
 
-                for url, cr in zip(batch, batch_results):
-                    if isinstance(cr, Exception):
-                        self._log(f"  ❌ {url} → {cr}")
-                        self.stats["errors"] += 1
-                        self.stats["pages_skipped"] += 1
-                        continue
-
-                    if not cr or not cr.success:
-                        reason = getattr(cr, "error_message", "unknown") if cr else "null result"
-                        self._log(f"  ⚠️  {url} → {reason}")
-                        self.stats["pages_skipped"] += 1
-                        continue
-
-                    page_data = self._build_page_result(url, cr)
-                    if page_data:
-                        results.append(page_data)
-                        crawled_count += 1
-                        self.stats["pages_crawled"] += 1
-
-                        json_ld_count = len(page_data.get("json_ld", []))
-                        discovered_links = len(page_data["links"])
-
-                        self._log(
-                            f"  ✅ {page_data['title'][:40]} "
-                            f"| {json_ld_count} JSON-LD "
-                            f"| {discovered_links} liens découverts"
-                        )
+    def _commit_page(self, page_data: Optional[Dict], queue: FrontierQueue, emit: Callable[[Dict], None]) -> bool:
+        """
+        Intègre une page construite : doublons, `emit`, nouveaux liens dans la file. True si page retenue.
+        Synchrone (aucun await) : visited et la file ne sont jamais modifiés en concurrence.
+        """
+        if not page_data:
+            self.stats["pages_skipped"] += 1
+            return False
+        owner = self._canonicals.owner_of(page_data["url"], page_data["canonical"])
+        if owner:
+            self._canonical_duplicate(page_data["url"], owner)
+            return False
+        if self._near_duplicate(page_data):
+            return False
+        # Canonique enregistrée seulement pour une page retenue (pas pour un quasi-doublon écarté)
+        self._canonicals.register(page_data["url"], page_data["canonical"])
+        if page_data["canonical"]:
+            self.visited.add(page_data["canonical"])  # cible canonique couverte : jamais mise en file
+
+        self._attach_sitemap_lastmod(page_data)
+        emit(page_data)
+        self.stats["pages_crawled"] += 1
+        self._track_template(page_data["url"])
+
+        json_ld_count = len(page_data.get("json_ld", []))
+        discovered_links = len(page_data["links"])
+
+        self._log(
+            f"  ✅ {page_data['title'][:40]} "
+            f"| {json_ld_count} JSON-LD "
+            f"| {discovered_links} liens découverts"
+        )
 
-                        # Ajoute les nouveaux liens à la queue
-                        new_links_added = 0
-                        for link in page_data["links"]:
-                            if link in self.visited:
-                                self.stats["links_duplicate"] += 1
-                            elif len(queue) < MAX_QUEUE_LINKS:
-                                self.visited.add(link)
-                                queue.append(link)
-                                new_links_added += 1
-
-                        # Log si des liens ont été ajoutés à la queue
-                        if new_links_added > 0:
-                            self._log(f"     → {new_links_added} lien(s) ajouté(s) à la queue (queue size: {len(queue)})")
-                        elif discovered_links > 0:
-                            self._log(f"     ⚠️  {discovered_links} lien(s) découvert(s) mais aucun ajouté (tous en doublons)")
-                    else:
-                        self.stats["pages_skipped"] += 1
-
-        self.results = results
-        return results
+        # Ajoute les nouveaux liens à la queue
+        new_links_added = 0
+        for link in page_data["links"]:
+            if link in self.visited:
+                self.stats["links_duplicate"] += 1
+            elif not self._robots_allowed(link):
+                self.visited.add(link)  # journalisée une seule fois
+            elif not queue.frontier.accepts(link):
+                self.stats["queue_full_blocks"] += 1
+            else:
+                self.visited.add(link)
+                queue.put_nowait(link)
+                new_links_added += 1
+
+        # Log si des liens ont été ajoutés à la queue
+        if new_links_added > 0:
+            self._log(f"     → {new_links_added} lien(s) ajouté(s) à la queue (queue size: {queue.qsize()})")
+        elif discovered_links > 0:
+            self._log(f"     ⚠️  {discovered_links} lien(s) découvert(s) mais aucun ajouté (tous en doublons)")
+        return True
 
     # ══════════════════════════════════════════════════════════════════════════
     #  ANALYSE PATTERNS (identique V1)
     # ══════════════════════════════════════════════════════════════════════════
 
+    @staticmethod
+    def _pattern_group(url: str) -> str:
+        """Groupe d'une URL pour analyze_patterns : premier segment du chemin (hors langue), ou Accueil."""
+        segments = [s for s in urlparse(url).path.split("/") if s]
+        if not segments:
+            return "Accueil"
+        if segments[0] in ["fr", "en", "de", "es"] and len(segments) > 1:
+            return segments[1]
+        return segments[0]
+
     def analyze_patterns(self, pages: List[Dict]) -> List[Dict]:
         """Analyse les patterns d'URL (identique V1)."""
         groups = {}
         for p in pages:
-            path = urlparse(p["url"]).path
-            segments = [s for s in path.split("/") if s]
-
-            if segments:
-                group_key = segments[0]
-                if group_key in ["fr", "en", "de", "es"] and len(segments) > 1:
-                    group_key = segments[1]
-            else:
-                group_key = "Accueil"
-
+            group_key = self._pattern_group(p["url"])
             if group_key not in groups:
                 groups[group_key] = {"count": 0, "samples": [], "name": group_key}
 
@@ -613,19 +979,78 @@ class HotaruScraperV2:
     #  INTERFACE PUBLIQUE (identique V1)
     # ══════════════════════════════════════════════════════════════════════════
 
-    def run_analysis(
+    async def aiter_pages(
         self,
         progress_callback: Callable = None,
-        log_callback: Callable = None,
-    ):
+        keep_results: bool = False,
+    ) -> AsyncIterator[Dict]:
         """
-        Interface synchrone — compatible drop-in avec SmartScraper.run_analysis().
-        Retourne (results, summary) identiques à V1.
+        Crawl en flux (itérateur async) : chaque page est produite dès qu'elle est construite,
+        pendant que les workers continuent le crawl. Ordre = ordre de fin des pages (comme results).
+
+        Args:
+            progress_callback: callback(message, pourcentage)
+            keep_results: conserver aussi les pages dans self.results (par défaut non : mémoire bornée)
+
+        Usage :
+            async for page in scraper.aiter_pages():
+                ...
+            summary = scraper.crawl_summary()
         """
-        if log_callback:
-            self.log_callback = log_callback
+        pages: asyncio.Queue = asyncio.Queue()
+        done = object()
+        if self._resume_frontier is None:
+            self.results = []  # reprise : pages restaurées conservées
+
+        def _emit(page: Dict):
+            if keep_results:
+                self.results.append(page)
+            pages.put_nowait(page)
+
+        async def _produce():
+            try:
+                await self._crawl_async(progress_callback=progress_callback, emit=_emit)
+            finally:
+                pages.put_nowait(done)
+
+        producer = asyncio.create_task(_produce())
+        try:
+            while True:
+                page = await pages.get()
+                if page is done:
+                    break
+                yield page
+            await producer  # remonte l'exception éventuelle du crawl
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+    def iter_pages(
+        self,
+        progress_callback: Callable = None,
+        keep_results: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        Crawl en flux, version synchrone (même interface que SmartScraper.iter_pages).
+        La boucle event ne tourne que pendant l'attente de la page suivante : le crawl
+        avance au rythme du consommateur.
+        """
+        loop = self._event_loop()
+        pages = self.aiter_pages(progress_callback=progress_callback, keep_results=keep_results)
+        try:
+            while True:
+                try:
+                    page = loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield page
+        finally:
+            loop.run_until_complete(pages.aclose())
 
-        # Lance le crawl async dans une boucle event
+    @staticmethod
+    def _event_loop() -> asyncio.AbstractEventLoop:
+        """Boucle event du thread courant (créée si absente ou fermée)."""
         try:
             loop = asyncio.get_event_loop()
             if loop.is_closed():
@@ -634,27 +1059,109 @@ class HotaruScraperV2:
         except RuntimeError:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
+        return loop
 
-        results = loop.run_until_complete(
-            self._crawl_async(progress_callback=progress_callback)
-        )
+    def crawl_summary(self, patterns: Optional[List[Dict]] = None) -> Dict:
+        """
+        Résumé du crawl (second élément du retour de run_analysis), disponible après iter_pages même avec
+        keep_results=False : sans `patterns`, le nombre de groupes vient des pages retenues au fil du crawl.
+        """
+        return {
+            "total_urls": self.stats["pages_crawled"],
+            "patterns": len(patterns) if patterns is not None else len(self._pattern_groups),
+            "stats": self.stats,
+            "filtered_log": self.filtered_log,
+            "duplicate_log": self.duplicate_log,
+        }
 
+    def _finish(self, progress_callback: Callable = None):
+        """Logs de fin + résumé (run_analysis / run_analysis_async)."""
+        results = self.results
         patterns = self.analyze_patterns(results)
 
         self._log(f"\n✅ TERMINÉ : {self.stats['pages_crawled']} pages crawlées")
         self._log(f"   JSON-LD trouvés : {sum(len(r.get('json_ld',[])) for r in results)}")
         self._log(f"   Avec structured data : {sum(1 for r in results if r.get('has_structured_data'))}")
+        if self._crawl_cache is not None:
+            self._log(f"   Cache : {self.stats['cache_hits']} page(s) servie(s), {self.stats['cache_misses']} rendue(s)")
 
         if progress_callback:
             progress_callback(f"Terminé: {self.stats['pages_crawled']}", 1.0)
 
-        return results, {
-            "total_urls": len(results),
-            "patterns": len(patterns),
-            "stats": self.stats,
-            "filtered_log": self.filtered_log,
-            "duplicate_log": self.duplicate_log,
-        }
+        return results, self.crawl_summary(patterns)
+
+    def resume(
+        self,
+        checkpoint,
+        progress_callback: Callable = None,
+        log_callback: Callable = None,
+    ):
+        """
+        Reprend un crawl interrompu depuis un point de reprise (CrawlCheckpoint ou chemin) :
+        pages déjà crawlées, visited, frontier, stats et profils de rendu sont restaurés,
+        puis le crawl continue. Sans point de reprise exploitable, crawl complet.
+        Même retour que run_analysis() ; les pages restaurées sont dans self.results.
+        """
+        self._restore_from(checkpoint)
+        return self.run_analysis(progress_callback=progress_callback, log_callback=log_callback)
+
+    async def resume_async(
+        self,
+        checkpoint,
+        progress_callback: Callable = None,
+        log_callback: Callable = None,
+    ):
+        """Version async de resume() (cf. run_analysis_async)."""
+        self._restore_from(checkpoint)
+        return await self.run_analysis_async(progress_callback=progress_callback, log_callback=log_callback)
+
+    def _restore_from(self, checkpoint):
+        self._checkpoint = CrawlCheckpoint.coerce(checkpoint)
+        state = self._checkpoint.load() if self._checkpoint is not None else None
+        if not state:
+            return
+        self._checkpoint.restore_html(state, self.page_scope)
+        self.results = list(state["pages"])
+        self.visited = load_visited(state["visited"], self.visited_mode, self.visited_fp_rate)
+        self.stats.update(state["stats"])
+        self.stats["pages_crawled"] = len(self.results)
+        self._resumed_pages = len(self.results)
+        self._resume_frontier = list(state["frontier"])
+        for page in self.results:
+            self._track_template(page["url"])
+            if self._near_dups is not None and not page.get("near_duplicate_of"):
+                self._near_dups.add(page["url"], page.get("simhash"))
+            self._canonicals.register(page["url"], page.get("canonical"))
+        # Profils de rendu déjà établis : pas de nouvelles sondes pour ces hosts
+        for host, verdict in (self.stats.get("render_profiles") or {}).items():
+            self._render_hosts[host] = {
+                "verdict": verdict, "probes": RENDER_PROBE_PAGES, "static_probes": RENDER_PROBE_PAGES,
+            }
+        self._log(
+            f"Reprise : {self._resumed_pages} page(s) déjà crawlée(s), "
+            f"{len(self._resume_frontier)} URL(s) dans le frontier"
+        )
+
+    def _save_checkpoint(self, frontier: Callable[[], List[str]], force: bool = False, done: bool = False):
+        """Point de reprise si dû (ou forcé) ; `frontier` : callable → URLs restant à crawler."""
+        if self._checkpoint is not None and (force or self._checkpoint.due()):
+            self._checkpoint.save(frontier(), self.visited, self.stats, done=done)
+
+    def run_analysis(
+        self,
+        progress_callback: Callable = None,
+        log_callback: Callable = None,
+    ):
+        """
+        Interface synchrone — compatible drop-in avec SmartScraper.run_analysis().
+        Retourne (results, summary) identiques à V1.
+        """
+        if log_callback:
+            self.log_callback = log_callback
+
+        for _ in self.iter_pages(progress_callback=progress_callback, keep_results=True):
+            pass
+        return self._finish(progress_callback)
 
     async def run_analysis_async(
         self,
@@ -668,82 +1175,17 @@ class HotaruScraperV2:
         if log_callback:
             self.log_callback = log_callback
 
-        results = await self._crawl_async(progress_callback=progress_callback)
-        patterns = self.analyze_patterns(results)
-
-        if progress_callback:
-            progress_callback(f"Terminé: {self.stats['pages_crawled']}", 1.0)
-
-        return results, {
-            "total_urls": len(results),
-            "patterns": len(patterns),
-            "stats": self.stats,
-            "filtered_log": self.filtered_log,
-            "duplicate_log": self.duplicate_log,
-        }
+        async for _ in self.aiter_pages(progress_callback=progress_callback, keep_results=True):
+            pass
+        return self._finish(progress_callback)
 
     # ══════════════════════════════════════════════════════════════════════════
     #  EXTRACTION FALLBACK (HTML structuré sans JSON-LD)
     # ══════════════════════════════════════════════════════════════════════════
 
-    def _extract_html_fallback(self, soup: BeautifulSoup, url: str) -> Dict:
-        """
-        Fallback pour sites SANS JSON-LD.
-        Extrait une structure généralisée depuis HTML : headings, listes, éléments clés.
-        Retourne un dict compatible avec JSON-LD pour uniformité.
-        """
-        fallback = {
-            "@context": "https://schema.org",
-            "@type": "WebPage",
-            "url": url,
-            "mainEntity": {}
-        }
-
-        # ─ H1 (main title)
-        h1 = soup.find("h1")
-        if h1:
-            fallback["mainEntity"]["name"] = h1.get_text(strip=True)[:150]
-
-        # ─ Description (meta + premiers paragraphes)
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        if meta_desc:
-            fallback["description"] = meta_desc.get("content", "")[:300]
-        else:
-            p_tags = soup.find_all("p", limit=2)
-            if p_tags:
-                fallback["description"] = " ".join(p.get_text(strip=True) for p in p_tags)[:300]
-
-        # ─ H2s (sections principales)
-        h2_tags = soup.find_all("h2", limit=5)
-        if h2_tags:
-            fallback["mainEntity"]["sections"] = [
-                h2.get_text(strip=True)[:100] for h2 in h2_tags
-            ]
-
-        # ─ Listes (ul/ol → items)
-        lists = soup.find_all(["ul", "ol"], limit=3)
-        if lists:
-            all_items = []
-            for lst in lists:
-                items = lst.find_all("li", limit=10)
-                all_items.extend([li.get_text(strip=True)[:100] for li in items])
-            if all_items:
-                fallback["mainEntity"]["items"] = all_items[:10]
-
-        # ─ Images principales (alt text)
-        imgs = soup.find_all("img", limit=5)
-        if imgs:
-            fallback["image"] = []
-            for img in imgs:
-                alt = img.get("alt", "")
-                src = img.get("src", "")
-                if alt or src:
-                    fallback["image"].append({
-                        "url": src,
-                        "description": alt[:150] if alt else None
-                    })
-
-        return fallback
+    def _extract_html_fallback(self, fields: Dict, url: str) -> Dict:
+        """Fallback pour sites SANS JSON-LD (structure généralisée, cf. core/page_record.py)."""
+        return page_record.html_fallback(fields, url)
 
     def cleanup(self):
         """
@@ -761,13 +1203,40 @@ class HotaruScraperV2:
             "links_discovered": 0,
             "links_filtered": 0,
             "links_duplicate": 0,
+            "queue_full_blocks": 0,
+            "frontier_spilled": 0,
+            "frontier_peak": 0,
+            "templates_crawled": 0,
+            "sitemap_urls": 0,
+            "sitemap_seeded": 0,
+            "robots_blocked": 0,
+            "throttle_retries": 0,
+            "rejected_non_html": 0,
+            "rejected_too_large": 0,
+            "near_duplicates": 0,
+            "canonical_duplicates": 0,
+            "parse_offloaded": 0,
             "errors": 0,
             "start_urls_count": len(self.start_urls),
             "cache_hits": 0,
+            "cache_misses": 0,
             "engine": "Crawl4AI v0.8 (Playwright)",
             "concurrency": self.concurrency,
             "proxy_used": self.proxy or "Aucun",
+            "render_mode": self.render_mode,
+            "renders_full": 0,
+            "renders_light": 0,
+            "render_profiles": {},
         }
+        self._render_hosts.clear()
+        self._templates.clear()
+        self._pattern_groups.clear()
+        if self._near_dups is not None:
+            self._near_dups.clear()
+        self._canonicals.clear()
+        if self._blocker is not None:
+            self._blocker.reset()
+        self._sitemap_entries = None
         self._log("✅ Ressources nettoyées")
 
 
@@ -775,17 +1244,60 @@ class HotaruScraperV2:
 #  HELPER STANDALONE (compatible fetch_page de V1)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _revalidation_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    })
+    return session
+
+
+def _check_document(url: str, timeout: int):
+    """
+    En-têtes seuls (corps non lu) : ResponseRejected si l'URL n'est pas une page HTML de taille
+    raisonnable, avant de lancer un navigateur. Injoignable en HTTP simple : le navigateur tranchera.
+    """
+    try:
+        with _revalidation_session().get(url, timeout=timeout, stream=True) as resp:
+            check_headers(resp)
+    except ResponseRejected:
+        raise
+    except requests.RequestException:
+        pass
+
+
 async def fetch_page_async(url: str, timeout: int = 15) -> str:
-    """Récupère le HTML d'une seule page via Crawl4AI (async)."""
+    """
+    Récupère le HTML d'une seule page via Crawl4AI (async).
+    Document non HTML ou trop volumineux (en-têtes) : ResponseRejected, sans navigateur.
+    Cache HTTP conditionnel : si la page n'a pas changé (304), le HTML rendu
+    précédemment est réutilisé sans lancer de navigateur.
+    Rendu sur un navigateur chaud du pool (core/browser_pool.py) : pas de démarrage de Chromium.
+    """
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
+    await asyncio.to_thread(_check_document, url, timeout)
+    cache = get_http_cache()
+    if cache is not None:
+        entry = await asyncio.to_thread(
+            cache.revalidate, _revalidation_session(), url, "rendered", timeout=timeout
+        )
+        if entry is not None:
+            return entry["body"].decode("utf-8", errors="replace")
     config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
         page_timeout=timeout * 1000,
     )
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(url=url, config=config)
-        return result.html or ""
+    browser_pool = get_browser_pool()
+    if browser_pool is not None:
+        result = await browser_pool.arun(url, config=config)
+    else:
+        async with AsyncWebCrawler() as crawler:
+            result = await crawler.arun(url=url, config=config)
+    html = result.html or ""
+    if cache is not None and html and result.success:
+        cache.store(url, html.encode("utf-8"), getattr(result, "response_headers", None) or {}, variant="rendered")
+    return html
 
 
 def fetch_page(url: str, timeout: int = 15) -> str:
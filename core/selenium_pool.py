@@ -0,0 +1,172 @@
+"""
+Pool de drivers Chrome réutilisables (Selenium) pour le crawl V1 parallèle.
+- Taille bornée, drivers créés à la demande via core.selenium_utils.create_chrome_driver.
+- Recyclage : après N pages (fuites mémoire Chrome) ou dès qu'un driver plante (session morte :
+  session invalide, Chrome injoignable, current_url en échec). Une page lente (TimeoutException)
+  ou une erreur JS laisse le driver dans le pool.
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException
+
+from core.selenium_utils import create_chrome_driver
+
+DRIVER_MAX_PAGES = 50
+# Messages WebDriver d'une session navigateur perdue (Chrome planté ou fermé)
+_DEAD_SESSION_MARKERS = (
+    "chrome not reachable", "disconnected", "session deleted", "no such session",
+    "invalid session id", "target window already closed", "tab crashed",
+)
+
+
+def session_dead(driver, error: Optional[BaseException] = None) -> bool:
+    """True si la session du driver est morte (à recréer) ; False pour une erreur de page ordinaire."""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if error is not None and any(m in str(error).lower() for m in _DEAD_SESSION_MARKERS):
+        return True
+    try:
+        driver.current_url
+    except Exception:
+        return True
+    return False
+
+
+class PooledDriver:
+    """Driver + compteurs de recyclage."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.broken = False
+        # Bannière cookies déjà acceptée dans cette session navigateur
+        self.cookies_accepted = False
+
+
+class DriverPool:
+    """
+    Pool thread-safe de drivers Chrome.
+
+    Usage :
+        pool = DriverPool(size=4, proxy=proxy)
+        with pool.acquire() as slot:
+            slot.driver.get(url)
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        size: int,
+        proxy: Optional[str] = None,
+        max_pages_per_driver: int = DRIVER_MAX_PAGES,
+        log_callback: Optional[Callable[[str], None]] = None,
+        seed_driver=None,
+    ):
+        """
+        Args:
+            size: nombre maximum de drivers simultanés
+            proxy: proxy transmis à create_chrome_driver
+            max_pages_per_driver: pages rendues avant recyclage du driver
+            log_callback: callback de log (optionnel)
+            seed_driver: driver déjà créé (ex. SmartScraper.driver) confié au pool
+        """
+        self.size = max(1, size)
+        self.proxy = proxy
+        self.max_pages_per_driver = max_pages_per_driver
+        self.log_callback = log_callback
+        self._idle = queue.LifoQueue()  # LIFO : on réutilise le driver le plus « chaud »
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self.stats = {"drivers_created": 0, "drivers_recycled": 0, "drivers_crashed": 0}
+        if seed_driver is not None:
+            self._created = 1
+            self._idle.put(PooledDriver(seed_driver))
+
+    def _log(self, message: str):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def _new_slot(self) -> PooledDriver:
+        driver = create_chrome_driver(headless=True, proxy=self.proxy, no_images=True, log_callback=None)
+        with self._lock:
+            self.stats["drivers_created"] += 1
+        return PooledDriver(driver)
+
+    def _take(self) -> Optional[PooledDriver]:
+        """Driver libre, ou None si on peut en créer un nouveau (place réservée)."""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    return None
+            # Pool plein : attendre un retour (ou un recyclage qui libère une place)
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    @contextmanager
+    def acquire(self):
+        """
+        Emprunte un driver. Une exception dans le bloc ne le marque cassé (recréé au prochain emprunt)
+        que si la session est morte (session_dead) ; sinon il retourne dans le pool.
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool fermé")
+        slot = self._take()
+        if slot is None:
+            try:
+                slot = self._new_slot()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            yield slot
+        except Exception as e:
+            slot.broken = session_dead(slot.driver, e)
+            raise
+        finally:
+            slot.pages += 1
+            self._release(slot)
+
+    def _release(self, slot: PooledDriver):
+        recycle = slot.broken or slot.pages >= self.max_pages_per_driver or self._closed
+        if not recycle:
+            self._idle.put(slot)
+            return
+        with self._lock:
+            self.stats["drivers_crashed" if slot.broken else "drivers_recycled"] += 1
+            self._created -= 1
+        if slot.broken:
+            self._log("   Driver Selenium planté → remplacé")
+        try:
+            slot.driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Ferme tous les drivers libres (les drivers empruntés sont fermés à leur retour)."""
+        self._closed = True
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                slot.driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._created -= 1
+
+
+__all__ = ["DriverPool", "PooledDriver", "DRIVER_MAX_PAGES", "session_dead"]
@@ -0,0 +1,130 @@
+"""
+Empreinte SimHash du texte d'une page (quasi-doublons : listes à facettes, vues impression,
+variantes de paramètres qui survivent à normalize_url).
+- Texte visible découpé en mots, shingles de SIMHASH_SHINGLE mots, hachés sur 64 bits (blake2b :
+  empreintes stables d'un processus à l'autre, comparables entre sauvegardes).
+- Deux pages sont quasi-doublons si leurs empreintes diffèrent d'au plus NEAR_DUPLICATE_DISTANCE bits.
+- NearDuplicateIndex : recherche par bandes (8 × 8 bits ; avec 7 bits d'écart au plus, une bande
+  au moins est identique) au lieu d'une comparaison avec chaque page déjà vue.
+Empreintes en hexadécimal (16 caractères) : sérialisables telles quelles en JSON.
+"""
+import re
+import threading
+from collections import Counter
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SIMHASH_SHINGLE = 3              # mots par shingle
+SIMHASH_MIN_TOKENS = 30          # en dessous, pas d'empreinte (texte trop court pour être discriminant)
+NEAR_DUPLICATE_DISTANCE = 6      # bits d'écart max entre deux quasi-doublons (pages distinctes : > 20)
+NEAR_DUPLICATE_MODES = ("flag", "drop")
+_BANDS = 8
+_BAND_BITS = 64 // _BANDS
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Table de translate par bit : octet → 1 si le bit k est à 1, sinon 0
+_BIT_TABLES = [bytes((value >> k) & 1 for value in range(256)) for k in range(8)]
+
+
+def simhash(text: str, shingle: int = SIMHASH_SHINGLE) -> Optional[str]:
+    """Empreinte SimHash 64 bits du texte (hex), ou None si le texte compte moins de SIMHASH_MIN_TOKENS mots."""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < SIMHASH_MIN_TOKENS:
+        return None
+    shingles = Counter(" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1))
+    # Empreintes des shingles (répétées selon leur poids) bout à bout ; les bits sont ensuite
+    # comptés colonne par colonne côté C (translate + count) plutôt que bit par bit en Python.
+    blob = b"".join(
+        blake2b(gram.encode("utf-8"), digest_size=8).digest() * weight for gram, weight in shingles.items()
+    )
+    total = len(blob) // 8
+    fingerprint = 0
+    for i in range(8):
+        column = blob[i::8]
+        for k in range(8):
+            # Bit à 1 si la majorité (pondérée) des shingles a ce bit à 1
+            if 2 * column.translate(_BIT_TABLES[k]).count(1) > total:
+                fingerprint |= 1 << (i * 8 + k)
+    return f"{fingerprint:016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    """Nombre de bits qui diffèrent entre deux empreintes hex."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _bands(fingerprint: str) -> List[Tuple[int, int]]:
+    value = int(fingerprint, 16)
+    mask = (1 << _BAND_BITS) - 1
+    return [(band, (value >> (band * _BAND_BITS)) & mask) for band in range(_BANDS)]
+
+
+class NearDuplicateIndex:
+    """
+    Empreintes des pages retenues, interrogées par bandes. Thread-safe.
+
+    Usage :
+        original = index.match(url, page["simhash"])   # None : page originale (ajoutée à l'index)
+    """
+
+    def __init__(self, distance: int = NEAR_DUPLICATE_DISTANCE):
+        self.distance = min(distance, _BANDS - 1)
+        self._buckets: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def find(self, fingerprint: Optional[str]) -> Optional[str]:
+        """URL de la première page indexée à moins de `distance` bits, sinon None."""
+        if not fingerprint:
+            return None
+        with self._lock:
+            for key in _bands(fingerprint):
+                for url, other in self._buckets.get(key, ()):
+                    if hamming(fingerprint, other) <= self.distance:
+                        return url
+        return None
+
+    def add(self, url: str, fingerprint: Optional[str]):
+        if not fingerprint:
+            return
+        with self._lock:
+            for key in _bands(fingerprint):
+                self._buckets.setdefault(key, []).append((url, fingerprint))
+
+    def match(self, url: str, fingerprint: Optional[str]) -> Optional[str]:
+        """Page originale dont `url` est un quasi-doublon ; sinon None et `url` devient une référence."""
+        original = self.find(fingerprint)
+        if original is None:
+            self.add(url, fingerprint)
+        return original
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+def near_duplicate_groups(pages: Iterable[Dict], distance: int = NEAR_DUPLICATE_DISTANCE) -> Dict[int, int]:
+    """
+    {indice: indice du représentant} pour une liste de pages (clé "simhash" ou "near_duplicate_of").
+    La première page d'un groupe en est le représentant (elle pointe sur elle-même).
+    """
+    index = NearDuplicateIndex(distance)
+    pages = list(pages)
+    position = {page.get("url"): i for i, page in enumerate(pages)}
+    groups = {}
+    for i, page in enumerate(pages):
+        original = page.get("near_duplicate_of")
+        if original not in position:
+            original = index.match(page.get("url"), page.get("simhash"))
+        rep = position.get(original, i)
+        groups[i] = groups.get(rep, rep)
+    return groups
+
+
+__all__ = [
+    "NearDuplicateIndex",
+    "hamming",
+    "near_duplicate_groups",
+    "simhash",
+    "NEAR_DUPLICATE_DISTANCE",
+    "NEAR_DUPLICATE_MODES",
+    "SIMHASH_MIN_TOKENS",
+]
@@ -0,0 +1,155 @@
+"""
+Lecture des sitemaps d'un site (amorçage du frontier, priorités, lastmod du re-crawl incrémental).
+- Sitemaps déclarés dans robots.txt (lignes « Sitemap: »), sinon /sitemap.xml et /sitemap_index.xml.
+- Index de sitemaps développés niveau par niveau ; les sitemaps enfants d'un niveau sont
+  téléchargés en parallèle (pool de threads), résultats restitués dans l'ordre des index.
+- Lecture en flux (lxml iterparse) directement sur la réponse HTTP, .xml.gz compris :
+  mémoire bornée même pour un sitemap de 50 000 URLs / 50 Mo.
+- Chaque URL porte son lastmod et sa priority ({"lastmod": str|None, "priority": float|None}).
+"""
+import gzip
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import urljoin
+
+from lxml import etree
+
+SITEMAP_TIMEOUT = 10
+SITEMAP_WORKERS = 8            # sitemaps enfants téléchargés en parallèle
+SITEMAP_MAX_SITEMAPS = 200     # sitemaps lus au plus (index compris)
+SITEMAP_MAX_DEPTH = 3          # niveaux d'index développés sous les sitemaps racine
+SITEMAP_MAX_URLS = 50_000      # URLs retenues au plus (par défaut)
+_FALLBACK_PATHS = ("/sitemap.xml", "/sitemap_index.xml")
+
+
+def robots_sitemaps(session, base_url: str, timeout: int = SITEMAP_TIMEOUT) -> List[str]:
+    """Sitemaps déclarés dans robots.txt (ordre du fichier, sans doublons)."""
+    try:
+        resp = session.get(urljoin(base_url, "/robots.txt"), timeout=timeout)
+    except Exception:
+        return []
+    if resp.status_code != 200:
+        return []
+    found = []
+    for line in resp.text.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            found.append(urljoin(base_url, value.strip()))
+    return list(dict.fromkeys(found))
+
+
+def _open_stream(resp):
+    """Flux binaire du corps (Content-Encoding décodé ; fichier .xml.gz décompressé à la volée)."""
+    raw = getattr(resp, "raw", None)
+    if raw is None or not hasattr(raw, "readinto"):
+        stream = io.BufferedReader(io.BytesIO(resp.content))
+    else:
+        raw.decode_content = True
+        raw.auto_close = False  # sinon urllib3 ferme le flux en fin de corps, avant la fin du tampon
+        stream = io.BufferedReader(raw, buffer_size=65536)
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def _read_sitemap(session, url: str, timeout: int, limit: int, stop: threading.Event) -> Tuple[List, List[str]]:
+    """
+    Lit un sitemap en flux. Retourne ([(url, entrée)], [sitemaps enfants]).
+    Un sitemap tronqué ou invalide garde ce qui a été lu avant l'erreur.
+    """
+    entries, children = [], []
+    try:
+        with session.get(url, timeout=timeout, stream=True) as resp:
+            if resp.status_code != 200:
+                return entries, children
+            events = etree.iterparse(
+                _open_stream(resp),
+                events=("end",),
+                tag=("{*}url", "{*}sitemap"),
+                recover=True,
+                resolve_entities=False,
+                no_network=True,
+                huge_tree=True,
+            )
+            for _, el in events:
+                loc = (el.findtext("{*}loc") or "").strip()
+                if loc and etree.QName(el).localname == "sitemap":
+                    children.append(urljoin(url, loc))
+                elif loc:
+                    lastmod = (el.findtext("{*}lastmod") or "").strip() or None
+                    try:
+                        priority = float(el.findtext("{*}priority"))
+                    except (TypeError, ValueError):
+                        priority = None
+                    entries.append((loc, {"lastmod": lastmod, "priority": priority}))
+                # Éléments traités libérés au fil de la lecture (arbre jamais complet en mémoire)
+                el.clear()
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+                if len(entries) >= limit or stop.is_set():
+                    break
+    except Exception:
+        pass
+    return entries, children
+
+
+def iter_sitemap_entries(
+    session,
+    base_url: str,
+    limit: int = SITEMAP_MAX_URLS,
+    timeout: int = SITEMAP_TIMEOUT,
+    workers: int = SITEMAP_WORKERS,
+    robots=None,
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    (url, {"lastmod", "priority"}) des sitemaps du site, sans doublons, au plus `limit` URLs.
+    Ordre déterministe : sitemaps racine (robots.txt), puis enfants de chaque index dans l'ordre.
+    robots : RobotsCache de l'audit (robots.txt déjà lu : pas de second téléchargement).
+    """
+    if robots is not None:
+        declared = [urljoin(base_url, u) for u in dict.fromkeys(robots.sitemaps(base_url))]
+    else:
+        declared = robots_sitemaps(session, base_url, timeout)
+    level = declared or [urljoin(base_url, p) for p in _FALLBACK_PATHS]
+    read, emitted = set(), set()
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="hotaru-sitemap") as pool:
+        try:
+            for _ in range(SITEMAP_MAX_DEPTH + 1):
+                level = [u for u in dict.fromkeys(level) if u not in read][: SITEMAP_MAX_SITEMAPS - len(read)]
+                if not level:
+                    return
+                read.update(level)
+                next_level = []
+                for entries, children in pool.map(
+                    lambda u: _read_sitemap(session, u, timeout, limit, stop), level
+                ):
+                    next_level.extend(children)
+                    for url, entry in entries:
+                        if url in emitted:
+                            continue
+                        emitted.add(url)
+                        yield url, entry
+                        if len(emitted) >= limit:
+                            return
+                level = next_level
+        finally:
+            stop.set()  # lectures encore en cours interrompues (arrêt anticipé du consommateur)
+
+
+def fetch_sitemap_entries(
+    session, base_url: str, timeout: int = SITEMAP_TIMEOUT, limit: int = SITEMAP_MAX_URLS, robots=None
+) -> Dict[str, Dict]:
+    """{url: {"lastmod": str|None, "priority": float|None}} ; {} si pas de sitemap ou sitemap illisible."""
+    return dict(iter_sitemap_entries(session, base_url, limit=limit, timeout=timeout, robots=robots))
+
+
+__all__ = [
+    "fetch_sitemap_entries",
+    "iter_sitemap_entries",
+    "robots_sitemaps",
+    "SITEMAP_MAX_URLS",
+    "SITEMAP_TIMEOUT",
+]
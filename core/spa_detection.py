@@ -0,0 +1,149 @@
+"""
+Détection SPA / rendu client (agnostique UI).
+Utilisé par views/audit_scraping.py (diagnostic), core/scraping_v2.py (rendu adaptatif par host)
+et core/scraping_hybrid.py (escalade HTTP → navigateur).
+"""
+import re
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+# Regex compilées une fois (appelées sur chaque page sondée)
+_RE_LDJSON = re.compile(r"<script[^>]+type=[\"']?application/ld\+json", re.IGNORECASE)
+_RE_LINK = re.compile(r"<a\s[^>]*href=[\"']?(?!#|javascript:|mailto:|tel:)[^\"'\s>]+", re.IGNORECASE)
+_RE_BODY = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+_RE_STRIP = re.compile(r"<script.*?</script>|<style.*?</style>|<noscript.*?</noscript>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+_RE_EMPTY_MOUNT = re.compile(
+    r"<div[^>]+id=[\"'](root|app|__next|__nuxt)[\"'][^>]*>\s*</div>", re.IGNORECASE
+)
+_RE_FRAMEWORK = re.compile(
+    r"__NEXT_DATA__|data-reactroot|ng-version=|/_nuxt/|window\.__NUXT__|data-v-app|window\.__INITIAL_STATE__",
+    re.IGNORECASE,
+)
+
+# Seuils de décision
+MIN_BODY_TEXT = 200          # caractères de texte visible sous lesquels la page est considérée vide
+LINK_RATIO_STATIC = 0.5      # HTML brut doit contenir au moins 50 % des liens du rendu
+MIN_RENDERED_LINKS = 5       # en dessous, la comparaison de liens n'est pas significative
+POOR_LINKS = 3               # framework JS + moins de liens que ça + pas de JSON-LD → rendu client probable
+
+
+def detect_spa_indicators(html: str, soup: BeautifulSoup) -> List[Dict]:
+    """Détecte tous les indicateurs SPA possibles."""
+    html_l = html.lower()
+    indicators = []
+
+    # Patterns dans le texte
+    text_patterns = {
+        "react": "React (texte)",
+        "__next": "Next.js (texte)",
+        "nuxt": "Nuxt (texte)",
+        "_nuxt": "Nuxt (texte)",
+        "vue": "Vue (texte)",
+        "angular": "Angular (texte)",
+        "data-reactroot": "React (data-reactroot)",
+        '<div id="root">': "React (div#root)",
+        '<div id="app">': "Vue (div#app)",
+    }
+
+    for pattern, label in text_patterns.items():
+        if pattern in html_l:
+            indicators.append({"type": "texte", "signal": label, "pattern": pattern})
+
+    # Scripts avec src
+    for script in soup.find_all("script", src=True):
+        src = script["src"].lower()
+        if "_nuxt" in src:
+            indicators.append({"type": "script", "signal": "Nuxt", "pattern": f"src={script['src'][:60]}..."})
+        elif "__next" in src:
+            indicators.append({"type": "script", "signal": "Next.js", "pattern": f"src={script['src'][:60]}..."})
+        elif any(p in src for p in ["react", "vue", "angular"]):
+            indicators.append({"type": "script", "signal": "Framework JS", "pattern": f"src={script['src'][:60]}..."})
+
+    # Links modulepreload
+    for link in soup.find_all("link", rel=True):
+        rel = " ".join(link["rel"]).lower() if isinstance(link["rel"], list) else link["rel"].lower()
+        href = link.get("href", "").lower()
+
+        if "modulepreload" in rel and (".js" in href or "_nuxt" in href):
+            indicators.append({"type": "link", "signal": "ES Module", "pattern": f"modulepreload {href[:50]}..."})
+
+    # Scripts type=module
+    module_scripts = soup.find_all("script", type="module")
+    if module_scripts:
+        indicators.append({"type": "module", "signal": f"{len(module_scripts)} script(s) ES module", "pattern": "type=module"})
+
+    return indicators
+
+
+def html_signals(html: str) -> Dict:
+    """Compte rapide (regex, sans parsing) des signaux utiles : JSON-LD, liens, texte visible, framework JS."""
+    html = html or ""
+    body_match = _RE_BODY.search(html)
+    body = body_match.group(1) if body_match else html
+    text = _RE_STRIP.sub(" ", body)
+    return {
+        "jsonld": len(_RE_LDJSON.findall(html)),
+        "links": len(_RE_LINK.findall(html)),
+        "text_chars": len(" ".join(text.split())),
+        "empty_mount": bool(_RE_EMPTY_MOUNT.search(html)),
+        "framework": bool(_RE_FRAMEWORK.search(html)),
+    }
+
+
+def looks_client_rendered(html: str) -> Dict:
+    """
+    Heuristique sur un HTML seul : la page semble-t-elle construite côté client ?
+    Signaux : corps vide, point de montage framework vide, ni lien ni JSON-LD,
+    marqueurs de framework JS sur un HTML pauvre (SSR incomplet).
+
+    Returns:
+        {"client_rendered": bool, "reasons": [str], "signals": dict}
+    """
+    signals = html_signals(html)
+    reasons = []
+    if signals["empty_mount"]:
+        reasons.append("point de montage JS vide (#root/#app/#__next)")
+    if signals["text_chars"] < MIN_BODY_TEXT:
+        reasons.append(f"corps quasi vide ({signals['text_chars']} caractères)")
+    if not signals["links"] and not signals["jsonld"]:
+        reasons.append("aucun lien ni JSON-LD dans le HTML")
+    elif signals["framework"] and signals["links"] < POOR_LINKS and not signals["jsonld"]:
+        reasons.append(f"framework JS et HTML pauvre ({signals['links']} lien(s), pas de JSON-LD)")
+    return {"client_rendered": bool(reasons), "reasons": reasons, "signals": signals}
+
+
+def compare_raw_vs_rendered(raw_html: str, rendered_html: str) -> Dict:
+    """
+    Compare le HTML brut (HTTP) et le HTML rendu (navigateur) d'une même page.
+    Le rendu est nécessaire si le JS ajoute du JSON-LD ou la majorité des liens,
+    ou si le HTML brut est vide.
+
+    Returns:
+        {"needs_render": bool, "reasons": [str], "raw": dict, "rendered": dict}
+    """
+    raw = html_signals(raw_html)
+    rendered = html_signals(rendered_html)
+    reasons = []
+
+    if not raw_html:
+        reasons.append("HTML brut indisponible")
+    else:
+        if raw["jsonld"] < rendered["jsonld"]:
+            reasons.append(f"JSON-LD injecté par JS ({raw['jsonld']} brut / {rendered['jsonld']} rendu)")
+        if rendered["links"] >= MIN_RENDERED_LINKS and raw["links"] < rendered["links"] * LINK_RATIO_STATIC:
+            reasons.append(f"liens ajoutés par JS ({raw['links']} brut / {rendered['links']} rendu)")
+        if raw["text_chars"] < MIN_BODY_TEXT <= rendered["text_chars"]:
+            reasons.append("contenu texte ajouté par JS")
+        if raw["empty_mount"] and not rendered["empty_mount"]:
+            reasons.append("point de montage JS rempli au rendu")
+
+    return {"needs_render": bool(reasons), "reasons": reasons, "raw": raw, "rendered": rendered}
+
+
+__all__ = [
+    "detect_spa_indicators",
+    "html_signals",
+    "looks_client_rendered",
+    "compare_raw_vs_rendered",
+]
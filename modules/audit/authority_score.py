@@ -16,6 +16,8 @@ from urllib.parse import urlparse, urljoin
 from collections import Counter
 from bs4 import BeautifulSoup
 
+from core.bounded_fetch import SITEMAP_MAX_BYTES, bounded_get
+
 try:
     import trafilatura
     HAS_TRAFILATURA = True
@@ -284,7 +286,7 @@ class AuthorityScoreAnalyzer:
 
         for url in urls[:MAX_CRAWL_PAGES]:
             try:
-                r = self.session.get(url, timeout=HTTP_TIMEOUT)
+                r = bounded_get(self.session, url, timeout=HTTP_TIMEOUT)
                 if r.status_code != 200:
                     continue
                 details["pages_analyzed"] += 1
@@ -394,7 +396,7 @@ class AuthorityScoreAnalyzer:
 
         for sitemap_url in sitemap_candidates:
             try:
-                r = self.session.get(sitemap_url, timeout=HTTP_TIMEOUT)
+                r = bounded_get(self.session, sitemap_url, max_bytes=SITEMAP_MAX_BYTES, accept=None, timeout=HTTP_TIMEOUT)
                 if r.status_code == 200 and "xml" in r.headers.get("content-type", ""):
                     parsed_urls = self._parse_sitemap(r.text)
                     urls.update(parsed_urls)
@@ -406,7 +408,7 @@ class AuthorityScoreAnalyzer:
         # Si pas de sitemap, crawl leger de la homepage
         if not urls:
             try:
-                r = self.session.get(self.website_url, timeout=HTTP_TIMEOUT)
+                r = bounded_get(self.session, self.website_url, timeout=HTTP_TIMEOUT)
                 if r.status_code == 200:
                     soup = BeautifulSoup(r.text, "html.parser")
                     domain = urlparse(self.website_url).netloc
@@ -432,7 +434,9 @@ class AuthorityScoreAnalyzer:
             for sitemap in root.findall(".//sm:sitemap/sm:loc", ns):
                 if sitemap.text:
                     try:
-                        r = self.session.get(sitemap.text.strip(), timeout=HTTP_TIMEOUT)
+                        r = bounded_get(
+                            self.session, sitemap.text.strip(), max_bytes=SITEMAP_MAX_BYTES, accept=None, timeout=HTTP_TIMEOUT
+                        )
                         if r.status_code == 200:
                             child_urls = self._parse_sitemap(r.text)
                             urls.update(child_urls)
@@ -473,7 +477,7 @@ class AuthorityScoreAnalyzer:
         # 2. Signaux de confiance (page d'accueil) — remplace l'ancienne estimation backlinks
         soup_home = None
         try:
-            r = self.session.get(self.website_url, timeout=HTTP_TIMEOUT)
+            r = bounded_get(self.session, self.website_url, timeout=HTTP_TIMEOUT)
             if r.status_code == 200:
                 soup_home = BeautifulSoup(r.text, "html.parser")
         except Exception:
@@ -573,7 +577,7 @@ class AuthorityScoreAnalyzer:
             "instagram": False,
         }
         try:
-            r = self.session.get(self.website_url, timeout=HTTP_TIMEOUT)
+            r = bounded_get(self.session, self.website_url, timeout=HTTP_TIMEOUT)
             if r.status_code == 200:
                 soup = BeautifulSoup(r.text, "html.parser")
                 for a in soup.find_all("a", href=True):
@@ -697,7 +701,7 @@ class AuthorityScoreAnalyzer:
         try:
             if not url.startswith("http"):
                 url = "https://" + url
-            r = self.session.get(url, timeout=HTTP_TIMEOUT)
+            r = bounded_get(self.session, url, timeout=HTTP_TIMEOUT)
             if r.status_code != 200:
                 return ""
             text = None
@@ -759,7 +763,7 @@ class AuthorityScoreAnalyzer:
 
         for sitemap_url in sitemap_candidates:
             try:
-                r = self.session.get(sitemap_url, timeout=HTTP_TIMEOUT)
+                r = bounded_get(self.session, sitemap_url, max_bytes=SITEMAP_MAX_BYTES, accept=None, timeout=HTTP_TIMEOUT)
                 if r.status_code == 200 and "xml" in r.headers.get("content-type", ""):
                     sitemap_dates = self._extract_sitemap_dates(r.text)
                     dates.extend(sitemap_dates)
@@ -814,7 +818,9 @@ class AuthorityScoreAnalyzer:
             for sitemap in root.findall(".//sm:sitemap/sm:loc", ns):
                 if sitemap.text and len(dates) < MAX_CRAWL_PAGES:
                     try:
-                        r = self.session.get(sitemap.text.strip(), timeout=HTTP_TIMEOUT)
+                        r = bounded_get(
+                            self.session, sitemap.text.strip(), max_bytes=SITEMAP_MAX_BYTES, accept=None, timeout=HTTP_TIMEOUT
+                        )
                         if r.status_code == 200:
                             child_dates = self._extract_sitemap_dates(r.text)
                             dates.extend(child_dates)
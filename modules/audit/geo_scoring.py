@@ -8,6 +8,8 @@ from datetime import datetime
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 
+from core.page_store import page_html
+
 class GEOScorer:
     """
     Calcule un score GEO sur 100 points basé sur des critères techniques
@@ -233,7 +235,7 @@ class GEOScorer:
     
     def _score_structured_data(self, page_data):
         """Score les données structurées JSON-LD (15 points max)"""
-        html_content = page_data.get('html_content', '')
+        html_content = page_html(page_data)
         score = 0
         reco = []
         
@@ -293,7 +295,7 @@ class GEOScorer:
     
     def _score_semantic_structure(self, page_data):
         """Score la structure sémantique (20 points max) - formats préférés des LLMs"""
-        html_content = page_data.get('html_content', '')
+        html_content = page_html(page_data)
         score = 0
         reco = []
         
@@ -379,7 +381,7 @@ class GEOScorer:
     
     def _score_content_depth(self, page_data):
         """Score la profondeur du contenu (15 points max)"""
-        html_content = page_data.get('html_content', '')
+        html_content = page_html(page_data)
         score = 0
         reco = []
         
@@ -453,7 +455,7 @@ class GEOScorer:
     
     def _score_entity_richness(self, page_data):
         """Score la richesse en entités nommées (10 points max)"""
-        html_content = page_data.get('html_content', '')
+        html_content = page_html(page_data)
         title = page_data.get('title', '')
         description = page_data.get('description', '')
         
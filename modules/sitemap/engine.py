@@ -55,7 +55,7 @@ class SitemapEngine:
             prio = calculate_seo_priority(p)
             entry = {
                 "url": p["url"],
-                "lastmod": (p.get("last_modified") or "")[:10] or None,
+                "lastmod": (p.get("last_modified") or p.get("sitemap_lastmod") or "")[:10] or None,
                 "priority": prio,
                 "changefreq": determine_changefreq(p),
                 "content_type": p.get("content_type", "page"),
@@ -89,7 +89,7 @@ class SitemapEngine:
             prio = calculate_geo_priority(p)
             entry = {
                 "url": p["url"],
-                "lastmod": (p.get("last_modified") or "")[:10] or None,
+                "lastmod": (p.get("last_modified") or p.get("sitemap_lastmod") or "")[:10] or None,
                 "priority": prio,
                 "changefreq": determine_changefreq(p),
                 "content_type": p.get("content_type", "page"),
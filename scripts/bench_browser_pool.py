@@ -0,0 +1,62 @@
+"""
+Benchmark fetch_page V2 : un Chromium lancé à chaque appel vs navigateurs chauds du pool
+(core/browser_pool.py). Site fixture local (cf. bench_crawl.py), cache HTTP désactivé :
+chaque appel rend réellement la page. Nécessite Playwright (`playwright install chromium`).
+
+Usage :
+    python scripts/bench_browser_pool.py                 # 5 appels par mode
+    python scripts/bench_browser_pool.py --calls 10 --latency 0.2
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOTARU_HTTP_CACHE"] = "0"
+
+import core.browser_pool as browser_pool
+from core.scraping_v2 import fetch_page
+from scripts.bench_crawl import start_fixture_site
+
+
+def _bench(base_url, calls, pooled):
+    """Durées (s) de `calls` fetch_page successifs sur des pages distinctes."""
+    size = browser_pool.BROWSER_POOL_SIZE
+    browser_pool.BROWSER_POOL_SIZE = size if pooled else 0  # 0 : get_browser_pool() → None
+    try:
+        durations = []
+        for index in range(calls):
+            start = time.perf_counter()
+            fetch_page(f"{base_url}page/{index + 1}")
+            durations.append(time.perf_counter() - start)
+        return durations
+    finally:
+        browser_pool.BROWSER_POOL_SIZE = size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetch_page : Chromium par appel vs pool chaud")
+    parser.add_argument("--calls", type=int, default=5, help="Appels fetch_page par mode")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence serveur simulée (s)")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_site(args.calls + 1, args.latency)
+    print(f"Site fixture : {base_url} (latence {args.latency * 1000:.0f} ms)\n")
+    print(f"{'mode':>14} {'1er appel':>10} {'médiane suivants':>17}")
+    try:
+        for label, pooled in (("sans pool", False), ("pool chaud", True)):
+            durations = _bench(base_url, args.calls, pooled)
+            rest = durations[1:] or durations
+            print(f"{label:>14} {durations[0]:9.2f} s {statistics.median(rest):15.2f} s")
+        pool = browser_pool.get_browser_pool()
+        if pool is not None:
+            print(f"\nNavigateurs lancés par le pool : {pool.stats['started']}")
+            pool.shutdown()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark crawl V1 (SmartScraper) sur un site fixture local.
+Lance un serveur HTTP en thread (pages générées, latence simulée) puis mesure pages/seconde
+pour plusieurs valeurs de `workers`.
+
+Usage :
+    python scripts/bench_crawl.py                      # 200 pages, 50 ms, workers 1/4/8/16
+    python scripts/bench_crawl.py --pages 500 --latency 0.1 --workers 1 8 32
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURE_LAST_MODIFIED = "Mon, 05 Oct 2026 08:00:00 GMT"
+
+
+def _fixture_page(index, total, fanout):
+    """HTML d'une page fixture : titre, H1, JSON-LD, listes et `fanout` liens internes."""
+    links = "".join(
+        f'<li><a href="/page/{(index * fanout + k) % total}">Page {(index * fanout + k) % total}</a></li>'
+        for k in range(1, fanout + 1)
+    )
+    paragraphs = "".join(f"<p>Paragraphe {i} de la page {index}.</p>" for i in range(20))
+    return (
+        "<!doctype html><html><head>"
+        f"<title>Page {index} | Fixture</title>"
+        f'<meta name="description" content="Page fixture {index}">'
+        '<script type="application/ld+json">'
+        f'{{"@context": "https://schema.org", "@type": "WebPage", "name": "Page {index}"}}'
+        "</script></head><body>"
+        f"<h1>Page fixture numéro {index}</h1><h2>Section</h2>{paragraphs}"
+        f"<ul>{links}</ul></body></html>"
+    ).encode("utf-8")
+
+
+def start_fixture_site(total_pages=200, latency=0.05, fanout=5):
+    """Démarre le site fixture sur un port libre. Retourne (server, base_url)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.rstrip("/") or "/"
+            if path == "/":
+                index = 0
+            elif path.startswith("/page/") and path[6:].isdigit():
+                index = int(path[6:])
+            else:
+                self.send_error(404)
+                return
+            time.sleep(latency)
+            # Validateurs stables : un re-crawl conditionnel reçoit des 304 (cache HTTP)
+            etag = f'"fixture-{total_pages}-{fanout}-{index}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = _fixture_page(index, total_pages, fanout)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", FIXTURE_LAST_MODIFIED)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/"
+
+
+def bench_v1(base_url, max_urls, workers):
+    """Crawl V1 (requests) et retourne (pages, secondes)."""
+    from core.scraping import SmartScraper
+
+    scraper = SmartScraper(base_url, max_urls=max_urls, workers=workers, log_callback=None, http_cache=False)
+    scraper._log = lambda message: None  # silence : on mesure le crawl, pas la console
+    start = time.perf_counter()
+    results, _ = scraper.run_analysis()
+    return len(results), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pages/seconde du crawl V1")
+    parser.add_argument("--pages", type=int, default=200, help="Pages du site fixture (et max_urls)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence serveur simulée (s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_site(args.pages, args.latency)
+    print(f"Site fixture : {base_url} ({args.pages} pages, latence {args.latency * 1000:.0f} ms)")
+    try:
+        reference = None
+        for workers in args.workers:
+            pages, elapsed = bench_v1(base_url, args.pages, workers)
+            rate = pages / elapsed if elapsed else 0.0
+            reference = reference or rate
+            print(
+                f"  workers={workers:<3} {pages:>5} pages  {elapsed:7.2f} s  "
+                f"{rate:8.1f} pages/s  (x{rate / reference:.1f})"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Micro-benchmark de l'extraction des champs page : BeautifulSoup (html.parser + find_all
+par champ, ancienne extraction V1/V2) vs core.page_extractor (une passe lxml).
+
+Usage :
+    python scripts/bench_extract.py                          # page catalogue synthétique (~165 Ko)
+    python scripts/bench_extract.py page1.html page2.html    # HTML réels sauvegardés
+    python scripts/bench_extract.py https://www.example.com  # téléchargé une fois
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from core.page_extractor import extract_page_fields
+
+
+def _synthetic_page(products=400):
+    """Page catalogue volumineuse : menu, fiches produit, listes, JSON-LD, scripts inline."""
+    menu = "".join(f'<li><a href="/categorie/{i}">Catégorie {i}</a></li>' for i in range(150))
+    cards = "".join(
+        f'<article class="card" data-href="/produit/{i}"><h2>Produit {i}</h2>'
+        f'<img src="/img/{i}.jpg" alt="Produit {i}"><p>Description <b>courte</b> du produit {i}, '
+        f"avec quelques mots pour remplir le texte visible de la fiche.</p>"
+        f'<ul><li>Taille {i % 5}</li><li>Couleur {i % 7}</li></ul>'
+        f'<a href="/produit/{i}?ref=liste">Voir</a></article>'
+        for i in range(products)
+    )
+    jsonld = json.dumps({
+        "@context": "https://schema.org",
+        "@type": "ItemList",
+        "itemListElement": [{"@type": "ListItem", "position": i, "url": f"/produit/{i}"} for i in range(products)],
+    })
+    inline_js = "<script>window.__STATE__ = " + json.dumps({"items": list(range(2000))}) + ";</script>"
+    return (
+        "<!doctype html><html><head><title>Catalogue | Boutique</title>"
+        '<meta name="description" content="Catalogue complet de la boutique">'
+        f'<script type="application/ld+json">{jsonld}</script>{inline_js}</head>'
+        f"<body><nav><ul>{menu}</ul></nav><h1>Tous les produits</h1>"
+        f"<main>{cards}</main><footer><ol><li>Mentions</li><li>CGV</li></ol></footer></body></html>"
+    )
+
+
+def extract_with_soup(html):
+    """Ancienne extraction (V1 _get_with_requests + _build_page_result, V2 _build_page_result)."""
+    soup = BeautifulSoup(html, "html.parser")
+    str(soup)  # V1 re-sérialisait l'arbre pour html_content
+    raw_links = [a["href"] for a in soup.find_all("a", href=True)]
+    data_href = [t.get("data-href", "") for t in soup.find_all(attrs={"data-href": True})]
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    h1 = soup.find("h1").get_text().strip() if soup.find("h1") else ""
+    meta = soup.find("meta", attrs={"name": "description"})
+    json_ld = []
+    for script in soup.find_all("script"):
+        if "ld+json" in (script.get("type") or "").lower():
+            try:
+                json_ld.append(json.loads(script.string or ""))
+            except (json.JSONDecodeError, TypeError):
+                pass
+    return {
+        "title": title,
+        "h1": h1,
+        "description": meta.get("content", "") if meta else "",
+        "links": raw_links,
+        "data_href_links": data_href,
+        "json_ld": json_ld,
+        "h2_count": len(soup.find_all("h2")),
+        "lists_count": len(soup.find_all(["ul", "ol"])),
+    }
+
+
+def extract_with_lxml(html):
+    return extract_page_fields(html, data_href=True)
+
+
+def _load(source):
+    if source.startswith(("http://", "https://")):
+        from core.scraping import fetch_page
+        return fetch_page(source)
+    with open(source, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _time(func, html, repeat):
+    func(html)  # chauffe
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(html)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark extraction BeautifulSoup vs lxml une passe")
+    parser.add_argument("sources", nargs="*", help="Fichiers HTML ou URL (défaut : page synthétique)")
+    parser.add_argument("--repeat", type=int, default=10, help="Répétitions par page")
+    args = parser.parse_args()
+
+    pages = [(src, _load(src)) for src in args.sources] or [("synthétique", _synthetic_page())]
+    for name, html in pages:
+        soup_fields = extract_with_soup(html)
+        lxml_fields = extract_with_lxml(html)
+        same = all(soup_fields[k] == lxml_fields[k] for k in ("links", "h2_count", "lists_count", "json_ld"))
+        t_soup = _time(extract_with_soup, html, args.repeat)
+        t_lxml = _time(extract_with_lxml, html, args.repeat)
+        print(
+            f"{name[:50]:<50} {len(html) / 1024:7.0f} Ko  "
+            f"soup {t_soup * 1000:8.1f} ms  lxml {t_lxml * 1000:7.1f} ms  "
+            f"(x{t_soup / t_lxml:.1f}){'' if same else '  ⚠ champs différents'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark mémoire / vitesse des structures du crawl (core.frontier) par million d'URLs :
+ensemble des URLs vues (set de chaînes, empreintes compactes, filtre de Bloom) et
+frontier (liste / deque en mémoire vs Frontier à débordement disque).
+
+Usage :
+    python scripts/bench_frontier.py                    # 1 000 000 d'URLs
+    python scripts/bench_frontier.py --urls 200000 --fp-rate 0.01
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.frontier import BloomUrlSet, CompactUrlSet, Frontier, FRONTIER_MEMORY_URLS
+
+
+def _urls(n, prefix="https://www.boutique-exemple.fr"):
+    """URLs type e-commerce (~80 caractères), générées à la volée."""
+    for i in range(n):
+        yield f"{prefix}/categorie/{i % 500}/produit-{i}-reference-{i * 7919 % 100000}.html"
+
+
+def _size_exact(s):
+    return sys.getsizeof(s) + sum(sys.getsizeof(u) for u in s)
+
+
+def _size_compact(s):
+    return sys.getsizeof(s._sorted) + sys.getsizeof(s._recent) + sum(sys.getsizeof(h) for h in s._recent)
+
+
+def _size_bloom(s):
+    return sum(sys.getsizeof(layer["bits"]) for layer in s._layers)
+
+
+def _size_deque(d):
+    return sys.getsizeof(d) + sum(sys.getsizeof(u) for u in d)
+
+
+def _size_frontier(f):
+    return sys.getsizeof(f._mem) + sum(sys.getsizeof(u) for u in f._mem)
+
+
+def bench_visited(n, fp_rate):
+    print(f"\nEnsemble des URLs vues — {n:,} URLs".replace(",", " "))
+    print(f"{'structure':<22} {'octets/URL':>10} {'Mo/million':>11} {'add µs':>8} {'lookup µs':>10} {'faux +':>8}")
+    candidates = [
+        ("set() exact", set, _size_exact),
+        ("compact (64 bits)", CompactUrlSet, _size_compact),
+        (f"bloom ({fp_rate:g})", lambda: BloomUrlSet(fp_rate=fp_rate), _size_bloom),
+    ]
+    probes = min(n, 100_000)
+    for name, factory, size in candidates:
+        visited = factory()
+        start = time.perf_counter()
+        for url in _urls(n):
+            visited.add(url)
+        t_add = (time.perf_counter() - start) / n
+        start = time.perf_counter()
+        found = sum(1 for url in _urls(probes) if url in visited)
+        t_lookup = (time.perf_counter() - start) / probes
+        false_pos = sum(1 for url in _urls(probes, "https://autre-site.fr") if url in visited)
+        per_url = size(visited) / n
+        assert found == probes
+        print(
+            f"{name:<22} {per_url:10.1f} {per_url:11.1f} {t_add * 1e6:8.2f} {t_lookup * 1e6:10.2f} "
+            f"{false_pos / probes:8.3%}"
+        )
+
+
+def bench_frontier(n):
+    print(f"\nFrontier — {n:,} URLs en file".replace(",", " "))
+    print(f"{'structure':<22} {'Mo RAM':>8} {'Mo disque':>10} {'append µs':>10} {'pop µs':>8}")
+    q = deque()
+    start = time.perf_counter()
+    for url in _urls(n):
+        q.append(url)
+    t_add = (time.perf_counter() - start) / n
+    ram = _size_deque(q) / 1e6
+    start = time.perf_counter()
+    while q:
+        q.popleft()
+    t_pop = (time.perf_counter() - start) / n
+    print(f"{'deque mémoire':<22} {ram:8.1f} {0:10.1f} {t_add * 1e6:10.2f} {t_pop * 1e6:8.2f}")
+
+    f = Frontier()
+    start = time.perf_counter()
+    for url in _urls(n):
+        f.append(url)
+    t_add = (time.perf_counter() - start) / n
+    f._flush()
+    ram = _size_frontier(f) / 1e6
+    disk = (f._spill.seek(0, os.SEEK_END) if f._spill else 0) / 1e6
+    start = time.perf_counter()
+    popped = 0
+    while f:
+        f.popleft()
+        popped += 1
+    t_pop = (time.perf_counter() - start) / n
+    f.close()
+    assert popped == n
+    label = f"Frontier ({FRONTIER_MEMORY_URLS} en RAM)"
+    print(f"{label:<22} {ram:8.1f} {disk:10.1f} {t_add * 1e6:10.2f} {t_pop * 1e6:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mémoire par million d'URLs : visited et frontier")
+    parser.add_argument("--urls", type=int, default=1_000_000, help="Nombre d'URLs")
+    parser.add_argument("--fp-rate", type=float, default=0.001, help="Taux de faux positifs du filtre de Bloom")
+    args = parser.parse_args()
+    bench_visited(args.urls, args.fp_rate)
+    bench_frontier(args.urls)
+
+
+if __name__ == "__main__":
+    main()
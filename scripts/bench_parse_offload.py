@@ -0,0 +1,133 @@
+"""
+Benchmark du crawl V2 selon l'extraction HTML : dans la boucle asyncio, pool de threads ou pool
+de processus (parse_offload, core/page_record.py).
+Navigateur simulé (latence fixe, pages catalogue volumineuses pré-générées) : seul le coût
+d'extraction et son effet sur la boucle sont mesurés. Pour chaque combinaison : pages/seconde
+et retard de la boucle (tâche témoin réveillée toutes les 10 ms : médiane et max du retard).
+
+Usage :
+    python scripts/bench_parse_offload.py                                # 200 pages, concurrence 5/10/20
+    python scripts/bench_parse_offload.py --pages 300 --products 800 --concurrency 10 20 40
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.scraping_v2 as scraping_v2
+from core.scraping_v2 import HotaruScraperV2
+from scripts.bench_extract import _synthetic_page
+
+BASE_URL = "https://bench.hotaru.test"
+_TICK = 0.01
+
+
+def _site(total, products, fanout=5):
+    """{url: html} : pages catalogue de `products` fiches, `fanout` liens vers d'autres pages."""
+    catalogue = _synthetic_page(products)
+    site = {}
+    for index in range(total):
+        links = "".join(
+            f'<a href="/page/{(index * fanout + k) % total}">Page {(index * fanout + k) % total}</a>'
+            for k in range(1, fanout + 1)
+        )
+        url = BASE_URL + ("/" if index == 0 else f"/page/{index}")
+        site[url] = catalogue.replace("<h1>Tous les produits</h1>", f"<h1>Catalogue {index}</h1>{links}")
+    return site
+
+
+class _SimulatedCrawler:
+    """Remplace AsyncWebCrawler : HTML pré-généré rendu après `latency` secondes."""
+
+    site = {}
+    latency = 0.05
+
+    def __init__(self, config=None, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def arun(self, url, config=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        html = self.site.get(url.rstrip("/") or url) or self.site.get(url)
+        return SimpleNamespace(
+            url=url,
+            html=html or "",
+            success=html is not None,
+            status_code=200 if html is not None else 404,
+            error_message="" if html is not None else "404",
+            links={"internal": []},
+            markdown=None,
+            js_execution_result=None,
+            response_headers={"Content-Type": "text/html; charset=utf-8"},
+        )
+
+
+async def _run(pages, concurrency, mode):
+    scraper = HotaruScraperV2(
+        BASE_URL + "/",
+        max_urls=pages,
+        concurrency=concurrency,
+        cache=False,
+        render_mode="full",
+        robots=False,
+        host_limits=False,
+        parse_offload=mode,
+        shared_browser=False,  # navigateur simulé ci-dessous (pas de pool de navigateurs)
+    )
+    lags = []
+    stop = asyncio.Event()
+
+    async def _ticker():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(_TICK)
+            lags.append(time.perf_counter() - start - _TICK)
+
+    ticker = asyncio.create_task(_ticker())
+    start = time.perf_counter()
+    results, _ = await scraper.run_analysis_async()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return len(results), elapsed, lags, scraper.stats["parse_offloaded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction V2 : boucle vs threads vs processus")
+    parser.add_argument("--pages", type=int, default=200, help="Pages crawlées (max_urls)")
+    parser.add_argument("--products", type=int, default=400, help="Fiches produit par page (taille du HTML)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence du navigateur simulé (s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[5, 10, 20])
+    args = parser.parse_args()
+
+    _SimulatedCrawler.site = _site(args.pages, args.products)
+    _SimulatedCrawler.latency = args.latency
+    scraping_v2.AsyncWebCrawler = _SimulatedCrawler
+    size = len(next(iter(_SimulatedCrawler.site.values()))) / 1024
+    print(f"{args.pages} pages de {size:.0f} Ko, latence {args.latency * 1000:.0f} ms\n")
+    print(f"{'concurrence':>11} {'extraction':>10} {'pages/s':>8} {'retard médian':>14} {'retard max':>11}")
+    for concurrency in args.concurrency:
+        for mode in (None, "thread", "process"):
+            with redirect_stdout(io.StringIO()):
+                asyncio.run(_run(min(args.pages, 20), concurrency, mode))  # chauffe (pool démarré)
+                count, elapsed, lags, offloaded = asyncio.run(_run(args.pages, concurrency, mode))
+            print(
+                f"{concurrency:>11} {mode or 'boucle':>10} {count / elapsed:8.1f} "
+                f"{statistics.median(lags) * 1000:11.1f} ms {max(lags) * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
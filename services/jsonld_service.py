@@ -17,6 +17,9 @@ from functools import lru_cache
 
 from bs4 import BeautifulSoup
 
+from core.page_store import page_html
+from core.simhash import near_duplicate_groups
+
 # 🚀 OPTIMISATION: Regex compile cache (évite recompilation à chaque call)
 _REGEX_CACHE = {}
 
@@ -247,8 +250,8 @@ def page_similarity(page_a: dict, page_b: dict) -> float:
     """Score de similarité combiné entre deux pages (0 à 1)."""
     url_a = page_a.get("url", "")
     url_b = page_b.get("url", "")
-    html_a = page_a.get("html_content", "") or ""
-    html_b = page_b.get("html_content", "") or ""
+    html_a = page_html(page_a)
+    html_b = page_html(page_b)
     json_ld_a = page_a.get("json_ld", []) or []
     json_ld_b = page_b.get("json_ld", []) or []
 
@@ -278,9 +281,10 @@ def enrich_pages_for_clustering(results: list) -> list:
     enriched = []
     for r in results:
         row = dict(r)
-        row["dom_structure"] = extract_dom_structure(row.get("html_content") or "")
+        html = page_html(row)  # HTML complet (core/page_store.py), pas l'aperçu tronqué
+        row["dom_structure"] = extract_dom_structure(html)
         row["semantic_features"] = extract_semantic_features(
-            row.get("html_content") or "",
+            html,
             row.get("json_ld") or [],
         )
         enriched.append(row)
@@ -290,6 +294,8 @@ def enrich_pages_for_clustering(results: list) -> list:
 def cluster_pages(results: list, threshold: float = None) -> list:
     """
     Regroupe les pages par similarité DOM/URL/sémantique.
+    Les quasi-doublons (SimHash, near_duplicate_of) ne sont pas comparés : seul le représentant
+    de chaque groupe passe dans la comparaison par paires, ses doublons rejoignent son cluster.
     Returns:
         Liste de clusters : chaque cluster est une liste d'indices dans results.
     """
@@ -299,7 +305,9 @@ def cluster_pages(results: list, threshold: float = None) -> list:
     if not results:
         return []
 
-    pages = enrich_pages_for_clustering(results)
+    groups = near_duplicate_groups(results)
+    reps = sorted(set(groups.values()))
+    pages = enrich_pages_for_clustering([results[i] for i in reps])
     n = len(pages)
 
     parent = list(range(n))
@@ -320,9 +328,10 @@ def cluster_pages(results: list, threshold: float = None) -> list:
             if sim >= threshold:
                 union(i, j)
 
+    rep_position = {idx: pos for pos, idx in enumerate(reps)}
     clusters_by_root = defaultdict(list)
-    for i in range(n):
-        clusters_by_root[find(i)].append(i)
+    for i in range(len(results)):
+        clusters_by_root[find(rep_position[groups[i]])].append(i)
 
     clusters = list(clusters_by_root.values())
     clusters.sort(key=len, reverse=True)
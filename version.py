@@ -3,12 +3,37 @@
 
 import datetime
 
-VERSION = "3.5.1"
+VERSION = "3.5.26"
 BUILD_DATE = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-RELEASE_NOTE = "README mis à jour (version exemple alignée)."
+RELEASE_NOTE = "Cache de crawl V2 géré : emplacement, TTL par domaine, plafond, purge depuis le backoffice, hits/misses dans le résumé"
 
 # Historique des notes de version (précédentes uniquement, plus récente en premier) — date/heure de release
 RELEASE_HISTORY = [
+    {"version": "3.5.26", "date": "2026-10-16", "note": "Cache de crawl V2 géré : emplacement, TTL par domaine, plafond, purge depuis le backoffice, hits/misses dans le résumé"},
+    {"version": "3.5.25", "date": "2026-10-16", "note": "HTML complet des pages compressé hors des enregistrements (html_ref) au lieu d'une troncature à 5 Ko"},
+    {"version": "3.5.24", "date": "2026-10-16", "note": "Profil de blocage des ressources au rendu V2 (médias, polices, traceurs) et octets économisés"},
+    {"version": "3.5.23", "date": "2026-10-16", "note": "Pool de navigateurs Playwright chauds partagé par les crawls V2, l'hybride et fetch_page"},
+    {"version": "3.5.22", "date": "2026-10-16", "note": "Extraction HTML V2 déportée hors de la boucle asyncio (pool de threads / processus)"},
+    {"version": "3.5.21", "date": "2026-10-16", "note": "Crawl V2 en arrière-plan (pause, annulation)"},
+    {"version": "3.5.20", "date": "2026-10-16", "note": "Déduplication rel=canonical du frontier"},
+    {"version": "3.5.19", "date": "2026-10-16", "note": "Quasi-doublons SimHash au crawl et au clustering"},
+    {"version": "3.5.18", "date": "2026-10-16", "note": "Téléchargements bornés (Content-Type avant le corps, taille max)"},
+    {"version": "3.5.17", "date": "2026-10-16", "note": "Concurrence et débit adaptatifs par host (429/5xx, Retry-After)"},
+    {"version": "3.5.16", "date": "2026-10-16", "note": "robots.txt respecté par les crawls (Disallow avant le frontier, Crawl-delay par host), cache partagé avec l'accessibilité IA"},
+    {"version": "3.5.15", "date": "2026-10-16", "note": "Amorçage du frontier par les sitemaps (robots.txt, index en parallèle, lecture en flux, lastmod sur les pages)"},
+    {"version": "3.5.14", "date": "2026-10-16", "note": "Crawl best-first : frontier prioritaire qui maximise la couverture des templates d'URL (frontier='priority')"},
+    {"version": "3.5.13", "date": "2026-10-16", "note": "Frontier à débordement disque + visited compact (empreintes 64 bits) ou filtre de Bloom"},
+    {"version": "3.5.12", "date": "2026-10-16", "note": "Points de reprise des crawls longs : checkpoint SQLite + resume() (V1, hybride, V2)"},
+    {"version": "3.5.11", "date": "2026-10-16", "note": "Crawl en flux : iter_pages / aiter_pages (V1, hybride, V2), run_analysis en wrapper"},
+    {"version": "3.5.10", "date": "2026-10-16", "note": "Re-crawl incrémental depuis l'audit chargé : frontier amorcé, pages inchangées reprises (sitemap lastmod, 304), rapport nouvelles/modifiées/supprimées."},
+    {"version": "3.5.9", "date": "2026-10-16", "note": "Cache HTTP disque conditionnel (ETag/Last-Modified) pour V1, hybride et fetch_page : 304 → corps et extraction réutilisés ; last_modified renseigné."},
+    {"version": "3.5.8", "date": "2026-10-16", "note": "Extraction des pages en une passe lxml partagée par V1, V2 et le moteur hybride (micro-benchmark scripts/bench_extract.py)."},
+    {"version": "3.5.7", "date": "2026-10-16", "note": "Crawl V1 : mémoire par host de la cascade (méthode gagnante mémorisée, circuit breaker avec cooldown)."},
+    {"version": "3.5.6", "date": "2026-10-16", "note": "Crawl V1 Selenium : pool de drivers Chrome (rendu parallèle, recyclage après 50 pages ou crash, cookies acceptés une fois par driver)."},
+    {"version": "3.5.5", "date": "2026-10-16", "note": "Moteur Hybride (Audit GEO, Analyse JSON-LD) : HTTP parallèle, navigateur headless uniquement pour les pages rendues en JS ou bloquées."},
+    {"version": "3.5.4", "date": "2026-10-16", "note": "Crawl V2 : rendu adaptatif par host (sonde HTML brut vs rendu, profil léger pour sites statiques). Détection SPA centralisée dans core/spa_detection.py."},
+    {"version": "3.5.3", "date": "2026-10-16", "note": "Crawl V2 : ordonnanceur en fenêtre glissante (asyncio.Queue + N workers) au lieu de lots synchrones."},
+    {"version": "3.5.2", "date": "2026-10-16", "note": "Crawl V1 : mode concurrent (workers) avec frontier partagé, compteurs thread-safe et ordre déterministe. Benchmark scripts/bench_crawl.py."},
     {"version": "3.5.1", "date": "2026-02-20", "note": "README mis à jour (version exemple alignée)."},
     {"version": "3.4.1", "date": "2026-02-18", "note": "README et version.py a jour : Sitemap Dynamique, bouton ECRASER, Master save, suppression workspace, fix Mistral parse."},
     {"version": "3.4.0", "date": "2026-02-18", "note": "Module Sitemap Dynamique complet (SEO + GEO). Tables Supabase sitemap_projects/pages/generations."},
@@ -10,13 +10,16 @@ import html
 import requests
 import zlib
 import base64
+import uuid
 from urllib.parse import urlparse
+from datetime import datetime, timezone
 from collections import defaultdict, Counter
 import networkx as nx
 from pyvis.network import Network
 import streamlit.components.v1 as components
 from bs4 import BeautifulSoup
 from core.database import AuditDatabase
+from core.page_store import get_page_store, page_html
 from core.session_keys import get_current_user_email
 from modules.audit.geo_scoring import GEOScorer
 from views.off_page import render_off_page_audit
@@ -33,6 +36,9 @@ from services.jsonld_service import (
 # Configuree dans ~/.streamlit/secrets.toml sous [mistral] api_key = "..."
 MISTRAL_API_KEY_PATH = "mistral"  # Chemin dans st.secrets
 
+# Crawl V1 en mode Selenium : drivers Chrome rendus en parallèle (pool recyclé, ~250 Mo/driver)
+V1_SELENIUM_WORKERS = 3
+
 
 # =============================================================================
 # 0. DOUBLE VERIFICATION ACCESSIBILITE IA (FRONTEND + API)
@@ -162,7 +168,7 @@ def _detect_api_subdomain(base_url, crawl_results=None):
     sniffed_apis = set()
     if crawl_results:
         for page in crawl_results:
-            html = page.get('html_content', '')
+            html = page_html(page)
             if html:
                 # Chercher des patterns API dans le code source
                 api_patterns = re.findall(
@@ -204,13 +210,16 @@ def _detect_api_subdomain(base_url, crawl_results=None):
     return {"detected": False, "subdomain": None, "url": None, "source": None}
 
 
-def check_ai_accessibility(base_url, crawl_results=None):
+def check_ai_accessibility(base_url, crawl_results=None, robots=None):
     """
     Double verification de l'accessibilite IA :
     1. Site Principal (Frontend) : robots.txt + balises meta
     2. API Backend (si detectee) : robots.txt de l'API
+    robots : RobotsCache de l'audit (robots.txt deja lu par le crawl, pas de second telechargement).
     Retourne un dictionnaire complet pour le rapport GEO.
     """
+    from core.robots import RobotsCache
+    robots = robots or RobotsCache()
     result = {
         "domain": urlparse(base_url).netloc,
         "frontend": {},
@@ -220,18 +229,9 @@ def check_ai_accessibility(base_url, crawl_results=None):
 
     # === 1. VERIFICATION FRONTEND ===
     # Robots.txt du site principal
-    try:
-        robots_url = f"{base_url.rstrip('/')}/robots.txt"
-        r = requests.get(robots_url, timeout=5)
-        if r.status_code == 200:
-            robots_content = r.text
-            robots_found = True
-        else:
-            robots_content = ""
-            robots_found = False
-    except Exception:
-        robots_content = ""
-        robots_found = False
+    rules = robots.rules(base_url)
+    robots_content = rules.content
+    robots_found = rules.found
 
     robots_analysis = _parse_robots_txt(robots_content)
     meta_analysis = _check_meta_robots(base_url)
@@ -252,18 +252,9 @@ def check_ai_accessibility(base_url, crawl_results=None):
 
     if api_info["detected"]:
         # Verifier le robots.txt de l'API
-        try:
-            api_robots_url = f"{api_info['url'].rstrip('/')}/robots.txt"
-            r = requests.get(api_robots_url, timeout=5)
-            if r.status_code == 200:
-                api_robots_content = r.text
-                api_robots_found = True
-            else:
-                api_robots_content = ""
-                api_robots_found = False
-        except Exception:
-            api_robots_content = ""
-            api_robots_found = False
+        api_rules = robots.rules(api_info["url"])
+        api_robots_content = api_rules.content
+        api_robots_found = api_rules.found
 
         api_robots_analysis = _parse_robots_txt(api_robots_content)
         api_open = api_robots_analysis["accessible"]
@@ -355,8 +346,8 @@ def generate_geo_report(domain, accessibility_data):
 # 1. FONCTIONS TECHNIQUES (SCORING & INFRA)
 # =============================================================================
 
-def check_geo_infrastructure(base_url, crawl_results=None):
-    """Vérifie l'infrastructure GEO en utilisant les résultats du crawl si disponibles"""
+def check_geo_infrastructure(base_url, crawl_results=None, robots=None):
+    """Vérifie l'infrastructure GEO en utilisant les résultats du crawl si disponibles (robots : RobotsCache de l'audit)"""
     domain = base_url.rstrip('/')
     assets = {
         "robots.txt": {"url": f"{domain}/robots.txt", "desc": "Autorise GPTBot et les crawlers IA."},
@@ -369,6 +360,11 @@ def check_geo_infrastructure(base_url, crawl_results=None):
     
     # Vérifier robots.txt, sitemap.xml, llms.txt avec requests
     for name, data in list(assets.items())[:3]:
+        if name == "robots.txt" and robots is not None:
+            found = robots.rules(domain).found
+            results[name] = {"status": found, "meta": data}
+            score += 25 if found else 0
+            continue
         try:
             r = requests.get(data['url'], timeout=3)
             found = (r.status_code == 200)
@@ -429,37 +425,247 @@ def run_unified_site_analysis(
     progress_callback=None,
     log_callback=None,
     extra_domains=None,
+    workers=None,
+    incremental=False,
+    frontier="bfs",
+    sitemap_seed=False,
+    near_duplicates="flag",
+    block_resources="media",
+    resume=False,
 ):
     """
     Un seul scrape pour tout le dashboard : remplit Audit GEO (results, clusters, geo_infra, etc.)
     ET Vue d'ensemble JSON-LD (jsonld_analyzer_crawl_results, jsonld_analyzer_results).
     Utilisé depuis l'onglet Audit GEO et depuis l'onglet JSON-LD.
+    engine : "v2" (Crawl4AI), "v1" (requests/Selenium) ou "hybrid" (HTTP + navigateur si besoin).
+    workers : pages récupérées en parallèle (moteurs V1 et hybride, None = défaut du moteur).
+    incremental : re-crawl à partir des résultats en session (crawl précédent ou sauvegarde chargée).
+        V1/hybride : seules les pages modifiées sont re-téléchargées ; V2 : rapport de différences seul.
+        Rapport dans session_state["incremental_report"].
+    frontier : "bfs" (largeur d'abord) ou "priority" (best-first : un maximum de templates d'URL
+        échantillonnés dans le budget de pages, cf. core/frontier.py).
+    sitemap_seed : frontier amorcé par les sitemaps du site (robots.txt, index, .xml.gz ; core/sitemaps.py).
+    near_duplicates : quasi-doublons (SimHash, core/simhash.py) "flag" (marqués, un représentant par
+        groupe au clustering) ou "drop" (écartés au crawl, hors budget de pages).
+    block_resources : moteur V2, ressources abandonnées au rendu (core/resource_blocking.py) :
+        "media" (images, vidéos, polices, traceurs), "strict", "trackers" ou None.
+    robots.txt est lu une seule fois (core/robots.py) : respecté par le crawl (Disallow, Crawl-delay)
+    puis réutilisé par le panneau d'accessibilité IA.
+    resume : reprendre le crawl interrompu de même clé (utilisateur, moteur, URLs, budget, options ;
+        cf. site_crawl_checkpoint) ; à demander à l'utilisateur. False : crawl depuis le début.
+    Crawl en arrière-plan (moteur V2, sans bloquer le script) : start_site_crawl_job / finish_site_crawl_job.
+    """
+    ctx = _prepare_site_crawl(
+        session_state, urls, max_pages, use_selenium, selenium_mode, workspace_name, engine,
+        cluster_threshold, log_callback, extra_domains, workers, incremental, frontier, sitemap_seed,
+        near_duplicates, block_resources,
+    )
+    scr, checkpoint = ctx["scraper"], ctx["checkpoint"]
+    try:
+        if resume and checkpoint.resumable():
+            res, crawl_meta = scr.resume(checkpoint, progress_callback=progress_callback)
+        else:
+            res, crawl_meta = scr.run_analysis(progress_callback=progress_callback)
+    except Exception:
+        release_crawl_pages(ctx)
+        raise
+    return _complete_site_analysis(session_state, ctx, res, crawl_meta)
+
+
+def start_site_crawl_job(
+    session_state,
+    urls,
+    max_pages,
+    workspace_name,
+    cluster_threshold=0.85,
+    extra_domains=None,
+    incremental=False,
+    frontier="bfs",
+    sitemap_seed=False,
+    near_duplicates="flag",
+    block_resources="media",
+    resume=False,
+):
+    """
+    Lance le crawl V2 de run_unified_site_analysis en arrière-plan (core/crawl_runner.py) et rend la main :
+    le script Streamlit affiche la progression (job.poll) et peut suspendre ou annuler le crawl.
+    Options : cf. run_unified_site_analysis.
     """
+    from core.crawl_runner import start_crawl
+    ctx = _prepare_site_crawl(
+        session_state, urls, max_pages, False, None, workspace_name, "v2", cluster_threshold, None,
+        extra_domains, None, incremental, frontier, sitemap_seed, near_duplicates, block_resources,
+    )
+    checkpoint = ctx["checkpoint"]
+    job = start_crawl(ctx["scraper"], checkpoint=checkpoint if resume and checkpoint.resumable() else None)
+    job.context = ctx
+    return job
+
+
+def finish_site_crawl_job(session_state, job):
+    """Exploite un job terminé (clusters, infra GEO, JSON-LD) comme run_unified_site_analysis."""
+    from core.crawl_runner import forget_job
+    forget_job(job.id)
+    res, crawl_meta = job.result()
+    return _complete_site_analysis(session_state, job.context, res, crawl_meta)
+
+
+def release_crawl_pages(ctx):
+    """HTML complet d'un crawl abandonné (échec, annulation) libéré du store ; le point de reprise en garde une copie."""
+    store = get_page_store()
+    if store is not None:
+        store.release(getattr(ctx["scraper"], "page_scope", None))
+
+
+def _adopt_page_scope(session_state, scraper):
+    """Les pages du crawl remplacent celles de la session : HTML complet de l'ancien crawl libéré."""
+    store = get_page_store()
+    scope = getattr(scraper, "page_scope", None)
+    previous = session_state.get("page_store_scope")
+    if store is not None and previous and previous != scope:
+        store.release(previous)
+    session_state["page_store_scope"] = scope
+
+
+def _normalize_start_urls(urls):
+    """(URL de base, URLs de départ) : schéma ajouté, base sans slash final et en tête."""
     if not urls:
         raise ValueError("Au moins une URL requise")
     base_url = urls[0]
     if not base_url.startswith(("http://", "https://")):
         base_url = "https://" + base_url
     base_url = base_url.rstrip("/")
-    urls = [base_url] + [u for u in urls[1:] if u != base_url]
+    return base_url, [base_url] + [u for u in urls[1:] if u != base_url]
+
+
+def _crawl_owner(session_state):
+    """Propriétaire des points de reprise : utilisateur connecté, sinon identifiant de la session."""
+    email = (get_current_user_email() or "").strip().lower()
+    if email:
+        return email
+    if not session_state.get("crawl_session_id"):
+        session_state["crawl_session_id"] = uuid.uuid4().hex
+    return session_state["crawl_session_id"]
+
+
+def site_crawl_checkpoint(
+    session_state, urls, max_pages, engine="v2", use_selenium=False, selenium_mode=None, extra_domains=None,
+    incremental=False, frontier="bfs", sitemap_seed=False, near_duplicates="flag", block_resources="media",
+):
+    """
+    Point de reprise d'un audit (core/checkpoint.py), propre à l'utilisateur et aux options du crawl :
+    un crawl relancé avec d'autres options, ou par un autre utilisateur, ne reprend pas celui-ci.
+    Options : cf. run_unified_site_analysis.
+    """
+    from core.checkpoint import CrawlCheckpoint, checkpoint_path
+    if engine == "v2":
+        from core.scraping_v2 import EXCLUDE_PATTERNS as exclude_patterns
+        use_selenium, selenium_mode = False, None  # sans effet sur le moteur V2
+    else:
+        from core.scraping import EXCLUDE_PATTERNS_V1 as exclude_patterns
+    _, urls = _normalize_start_urls(urls)
+    max_urls = int(max_pages) if max_pages is not None else 500
+    options = {
+        "use_selenium": bool(use_selenium),
+        "selenium_mode": selenium_mode,
+        "extra_domains": sorted(extra_domains or []),
+        "incremental": bool(incremental),
+        "frontier": frontier,
+        "sitemap_seed": bool(sitemap_seed),
+        "near_duplicates": near_duplicates,
+        "block_resources": block_resources if engine == "v2" else None,
+        "robots": True,
+        "exclude_patterns": list(exclude_patterns),
+    }
+    return CrawlCheckpoint(checkpoint_path(engine, urls, max_urls, owner=_crawl_owner(session_state), options=options))
+
 
+def _prepare_site_crawl(
+    session_state, urls, max_pages, use_selenium, selenium_mode, workspace_name, engine, cluster_threshold,
+    log_callback, extra_domains, workers, incremental, frontier, sitemap_seed, near_duplicates,
+    block_resources="media",
+):
+    """Scraper configuré + contexte de l'audit (baseline incrémentale, robots partagé, point de reprise)."""
+    base_url, urls = _normalize_start_urls(urls)
+
+    baseline = None
+    previous = session_state.get("results") or []
+    if incremental and previous:
+        from core.incremental import IncrementalBaseline
+        previous_netloc = urlparse(previous[0].get("url", "")).netloc.lower().replace("www.", "", 1)
+        if previous_netloc == urlparse(base_url).netloc.lower().replace("www.", "", 1):
+            baseline = IncrementalBaseline(
+                previous, crawled_at=(session_state.get("crawl_stats") or {}).get("crawled_at")
+            )
+    crawled_at = datetime.now(timezone.utc).isoformat()
+
+    engine_kwargs = {}
     if engine == "v2":
         from core.scraping_v2 import HotaruScraperV2 as Scraper
+        engine_kwargs["block_resources"] = block_resources
+    elif engine == "hybrid":
+        from core.scraping_hybrid import HybridScraper as Scraper
+        if workers:
+            engine_kwargs["workers"] = workers
     else:
         from core.scraping import SmartScraper as Scraper
+        if workers:
+            engine_kwargs["workers"] = workers
+        elif use_selenium:
+            engine_kwargs["workers"] = V1_SELENIUM_WORKERS
+    if baseline is not None and engine in ("v1", "hybrid"):
+        engine_kwargs["baseline"] = baseline
+    engine_kwargs["frontier"] = frontier
+    engine_kwargs["sitemap_seed"] = sitemap_seed
+    engine_kwargs["near_duplicates"] = near_duplicates
+    from core.robots import RobotsCache
+    robots = RobotsCache()
+    engine_kwargs["robots"] = robots
+
+    max_urls = int(max_pages) if max_pages is not None else 500
+    # Point de reprise : un crawl interrompu (rerun, crash navigateur) peut reprendre là où il s'est arrêté
+    checkpoint = site_crawl_checkpoint(
+        session_state, urls, max_urls, engine, use_selenium, selenium_mode, extra_domains, incremental,
+        frontier, sitemap_seed, near_duplicates, block_resources,
+    )
 
     scr = Scraper(
         start_urls=urls,
-        max_urls=int(max_pages) if max_pages is not None else 500,
+        max_urls=max_urls,
         use_selenium=use_selenium,
         selenium_mode=selenium_mode,
         log_callback=log_callback,
         extra_domains=extra_domains,
+        checkpoint=checkpoint,
+        **engine_kwargs,
     )
-    res, crawl_meta = scr.run_analysis(progress_callback=progress_callback)
+    return {
+        "scraper": scr,
+        "checkpoint": checkpoint,
+        "baseline": baseline,
+        "robots": robots,
+        "base_url": base_url,
+        "urls": urls,
+        "crawled_at": crawled_at,
+        "workspace_name": workspace_name,
+        "cluster_threshold": cluster_threshold,
+    }
 
-    infra, score = check_geo_infrastructure(base_url, crawl_results=res)
-    ai_access = check_ai_accessibility(base_url, res)
+
+def _complete_site_analysis(session_state, ctx, res, crawl_meta):
+    """Après le crawl : infra GEO, accessibilité IA, clusters JSON-LD ; remplit session_state."""
+    scr, checkpoint, baseline, robots = ctx["scraper"], ctx["checkpoint"], ctx["baseline"], ctx["robots"]
+    base_url, urls, crawled_at = ctx["base_url"], ctx["urls"], ctx["crawled_at"]
+    workspace_name, cluster_threshold = ctx["workspace_name"], ctx["cluster_threshold"]
+    checkpoint.discard()
+    _adopt_page_scope(session_state, scr)
+    crawl_meta.setdefault("stats", {})["crawled_at"] = crawled_at
+    incremental_report = None
+    if baseline is not None:
+        incremental_report = crawl_meta.get("incremental") or baseline.report(res)
+
+    infra, score = check_geo_infrastructure(base_url, crawl_results=res, robots=robots)
+    ai_access = check_ai_accessibility(base_url, res, robots=robots)
     pattern_summary = scr.get_pattern_summary()
 
     session_state.update({
@@ -474,6 +680,7 @@ def run_unified_site_analysis(
         "ai_accessibility": ai_access,
         "geo_infra": infra,
         "geo_score": score,
+        "incremental_report": incremental_report,
     })
 
     # JSON-LD : clustering + nommage Mistral — toujours remplir la Vue d'ensemble (fallback si erreur)
@@ -504,7 +711,7 @@ def run_unified_site_analysis(
         cluster_jsonld = []
         for indices in clusters:
             page = res[indices[0]]
-            dom = page.get("dom_structure") or extract_dom_structure(page.get("html_content") or "")
+            dom = page.get("dom_structure") or extract_dom_structure(page_html(page))
             cluster_dom_structures.append(dom)
             jld = page.get("json_ld") or []
             cluster_jsonld.append(jld[0] if jld else None)
@@ -526,7 +733,7 @@ def run_unified_site_analysis(
         first_dom = {}
         first_jld = None
         if res:
-            first_dom = res[0].get("dom_structure") or extract_dom_structure(res[0].get("html_content") or "")
+            first_dom = res[0].get("dom_structure") or extract_dom_structure(page_html(res[0]))
             jld_list = res[0].get("json_ld") or []
             first_jld = jld_list[0] if jld_list else None
         session_state["jsonld_analyzer_results"] = {
@@ -937,7 +1144,7 @@ def render_journal_filtered(filtered_log):
 
 
 def render_journal_duplicates(duplicate_log):
-    """Vue C : Journal des doublons"""
+    """Vue C : Journal des doublons (entrées (url, raison) ; URL seule pour les anciens crawls)"""
     if not duplicate_log:
         st.markdown(
             '<p style="font-size:0.85rem;color:#94a3b8;font-style:italic;">Aucun doublon detecte lors de ce crawl.</p>',
@@ -945,12 +1152,16 @@ def render_journal_duplicates(duplicate_log):
         )
         return
 
-    counts = Counter(duplicate_log)
+    entries = [tuple(e) if isinstance(e, (list, tuple)) else (e, "") for e in duplicate_log]
+    counts = Counter(url for url, _ in entries)
+    reasons = {url: reason for url, reason in entries if reason}
+    kinds = Counter(reason.split(" : ", 1)[0] for _, reason in entries if reason)
     sorted_dupes = sorted(counts.items(), key=lambda x: -x[1])
 
+    summary = "".join(f'  &mdash;  {n} {kind}' for kind, n in kinds.most_common())
     st.markdown(
         f'<p style="font-size:0.75rem;font-weight:600;color:#94a3b8;margin-bottom:20px;">'
-        f'{len(duplicate_log)} doublons detectes  &mdash;  {len(counts)} URLs uniques</p>',
+        f'{len(duplicate_log)} doublons detectes  &mdash;  {len(counts)} URLs uniques{summary}</p>',
         unsafe_allow_html=True
     )
 
@@ -959,17 +1170,20 @@ def render_journal_duplicates(duplicate_log):
         '<div style="display:flex;align-items:center;padding:10px 0;border-bottom:2px solid #0f172a;margin-bottom:4px;">'
         '<span style="font-size:0.6rem;font-weight:800;letter-spacing:0.2em;text-transform:uppercase;color:#0f172a;width:60px;">OCCUR.</span>'
         '<span style="font-size:0.6rem;font-weight:800;letter-spacing:0.2em;text-transform:uppercase;color:#0f172a;flex:1;">PATH</span>'
+        '<span style="font-size:0.6rem;font-weight:800;letter-spacing:0.2em;text-transform:uppercase;color:#0f172a;flex:1;">RAISON</span>'
         '</div>',
         unsafe_allow_html=True
     )
 
     for url, count in sorted_dupes[:200]:
         path = urlparse(url).path or '/'
+        reason = reasons.get(url, "")
         st.markdown(
             f'<div style="display:flex;align-items:center;gap:12px;padding:6px 0;border-bottom:1px solid #f8fafc;">'
             f'<span style="background:#0f172a;color:#fff;padding:2px 10px;font-size:0.65rem;font-weight:800;'
             f'min-width:40px;text-align:center;">{count}x</span>'
-            f'<span style="font-size:0.8rem;font-family:\'Courier New\',monospace;color:#64748b;">{path}</span>'
+            f'<span style="font-size:0.8rem;font-family:\'Courier New\',monospace;color:#64748b;flex:1;">{path}</span>'
+            f'<span style="font-size:0.75rem;font-family:\'Courier New\',monospace;color:#94a3b8;flex:1;">{reason}</span>'
             f'</div>',
             unsafe_allow_html=True
         )
@@ -1515,6 +1729,152 @@ def render_methodologie():
     st.markdown('</div>', unsafe_allow_html=True)
 
 
+_GEO_PENDING_KEYS = (
+    "geo_pending_urls", "geo_pending_limit", "geo_pending_ws", "geo_pending_base_url",
+    "geo_crawl_decision", "geo_pending_extra_domains", "geo_resume_choice",
+)
+CRAWL_POLL_SECONDS = 1.0
+
+
+def _geo_crawl_options():
+    """Options de crawl choisies dans l'onglet Audit Site (cf. run_unified_site_analysis)."""
+    return {
+        "incremental": st.session_state.get("geo_incremental", False),
+        "frontier": "priority" if st.session_state.get("geo_priority_frontier", False) else "bfs",
+        "sitemap_seed": st.session_state.get("geo_sitemap_seed", False),
+        "near_duplicates": "drop" if st.session_state.get("geo_drop_near_duplicates", False) else "flag",
+        "block_resources": "media" if st.session_state.get("geo_block_resources", True) else None,
+    }
+
+
+def _pending_crawl_checkpoint(pending_urls):
+    """Point de reprise du crawl en attente (mêmes paramètres que le lancement)."""
+    engine = st.session_state.get("scraping_engine", "v2")
+    selenium_enabled = st.session_state.get("geo_crawl_decision") == "selenium"
+    pending_extra = st.session_state.get("geo_pending_extra_domains") or []
+    return site_crawl_checkpoint(
+        st.session_state,
+        pending_urls,
+        int(st.session_state.get("geo_pending_limit", 100) or 100),
+        engine=engine,
+        use_selenium=selenium_enabled,
+        selenium_mode="light" if selenium_enabled else None,
+        extra_domains=pending_extra if pending_extra else None,
+        **_geo_crawl_options(),
+    )
+
+
+def _render_resume_prompt(pending_urls):
+    """
+    Crawl interrompu pour cet audit : l'utilisateur choisit de le reprendre ou de recommencer.
+    Retourne True / False une fois le choix fait, None tant que la question est affichée.
+    """
+    if "geo_resume_choice" in st.session_state:
+        return st.session_state["geo_resume_choice"]
+    if not _pending_crawl_checkpoint(pending_urls).resumable():
+        st.session_state["geo_resume_choice"] = False
+        return False
+    st.info("Un crawl interrompu existe pour ce site avec les mêmes options. Le reprendre là où il s'est arrêté ?")
+    col1, col2, _ = st.columns([1, 1, 3])
+    with col1:
+        if st.button("Reprendre le crawl", type="primary", use_container_width=True, key="btn_crawl_resume"):
+            st.session_state["geo_resume_choice"] = True
+            st.rerun()
+    with col2:
+        if st.button("Recommencer", use_container_width=True, key="btn_crawl_restart"):
+            st.session_state["geo_resume_choice"] = False
+            st.rerun()
+    return None
+
+
+def _render_background_crawl(pending_urls):
+    """Crawl V2 de l'Audit Site en arrière-plan (core/crawl_runner.py), lancé au premier passage."""
+    job = st.session_state.get("geo_crawl_job")
+    if job is None:
+        resume = _render_resume_prompt(pending_urls)
+        if resume is None:
+            return
+        pending_extra = st.session_state.get("geo_pending_extra_domains") or []
+        try:
+            job = start_site_crawl_job(
+                st.session_state,
+                urls=pending_urls,
+                max_pages=int(st.session_state.get("geo_pending_limit", 100) or 100),
+                workspace_name=st.session_state.get("geo_pending_ws") or "Non classé",
+                cluster_threshold=0.85,
+                extra_domains=pending_extra if pending_extra else None,
+                resume=resume,
+                **_geo_crawl_options(),
+            )
+        except Exception as e:
+            st.error(_format_crawl_error(e))
+            for k in _GEO_PENDING_KEYS:
+                st.session_state.pop(k, None)
+            return
+        st.session_state["geo_crawl_job"] = job
+        st.session_state["geo_crawl_logs"] = []
+    render_crawl_job("geo_crawl_job", "geo_crawl_logs", cleanup_keys=_GEO_PENDING_KEYS, key_prefix="crawl")
+
+
+def render_crawl_job(job_key, logs_key, cleanup_keys=(), key_prefix="crawl", resume_hint=True):
+    """
+    Suivi d'un crawl V2 en arrière-plan rangé dans st.session_state[job_key] (start_site_crawl_job) :
+    progression, pause / reprise, annulation ; exploité par finish_site_crawl_job une fois terminé.
+    cleanup_keys : clés de session retirées à la fin du crawl ; key_prefix : préfixe des boutons ;
+    resume_hint : à l'annulation, indiquer que relancer l'audit proposera de reprendre le crawl.
+    """
+    import time
+
+    job = st.session_state[job_key]
+    logs = st.session_state.setdefault(logs_key, [])
+    logs.extend(payload for kind, payload in job.poll() if kind == "log")
+    del logs[:-200]
+
+    if job.finished:
+        st.session_state.pop(job_key, None)
+        for k in cleanup_keys:
+            st.session_state.pop(k, None)
+        if job.state == "done":
+            try:
+                finish_site_crawl_job(st.session_state, job)
+            except Exception as e:
+                st.error(_format_crawl_error(e))
+                return
+            st.rerun()
+        release_crawl_pages(job.context)
+        if job.state == "cancelled":
+            st.warning(
+                "Crawl annulé. Le point de reprise est conservé : relancer le même audit proposera de le reprendre."
+                if resume_hint else "Crawl annulé."
+            )
+        else:
+            st.error(_format_crawl_error(job.error or RuntimeError("crawl interrompu")))
+        return
+
+    message, ratio = job.progress
+    label = "EN PAUSE — " + message if job.paused else message
+    st.progress(min(max(ratio, 0.0), 1.0), label)
+    col1, col2, _ = st.columns([1, 1, 3])
+    with col1:
+        if job.paused:
+            if st.button("Reprendre", use_container_width=True, key=f"btn_{key_prefix}_unpause"):
+                job.unpause()
+                st.rerun()
+        elif st.button("Pause", use_container_width=True, key=f"btn_{key_prefix}_pause"):
+            job.pause()
+            st.rerun()
+    with col2:
+        if st.button("Annuler", use_container_width=True, key=f"btn_{key_prefix}_cancel"):
+            job.cancel()
+            st.rerun()
+    if logs:
+        st.code("\n".join(logs[-12:]), language=None)
+
+    if not job.paused:
+        time.sleep(CRAWL_POLL_SECONDS)
+        st.rerun()
+
+
 # =============================================================================
 # 7. INTERFACE PRINCIPALE - DESIGN HOTARU STRICT
 # =============================================================================
@@ -1529,7 +1889,14 @@ def render_audit_geo():
         # ========== CRAWL EN ATTENTE (tout en premier, après choix Flash/Selenium) ==========
         pending_urls = st.session_state.get("geo_pending_urls")
         pending_decision = st.session_state.get("geo_crawl_decision")
+        if pending_urls and pending_decision and st.session_state.get("scraping_engine", "v2") == "v2":
+            # Moteur V2 : crawl en arrière-plan, progression relue à chaque rerun
+            _render_background_crawl(pending_urls)
+            return
         if pending_urls and pending_decision:
+            resume = _render_resume_prompt(pending_urls)
+            if resume is None:
+                return
             bar = st.progress(0, "Crawl en cours...")
             crawl_logs = []
             def add_crawl_log(msg):
@@ -1552,13 +1919,15 @@ def render_audit_geo():
                     progress_callback=lambda m, v: bar.progress(v, m),
                     log_callback=add_crawl_log,
                     extra_domains=pending_extra if pending_extra else None,
+                    resume=resume,
+                    **_geo_crawl_options(),
                 )
-                for k in ("geo_pending_urls", "geo_pending_limit", "geo_pending_ws", "geo_pending_base_url", "geo_crawl_decision", "geo_pending_extra_domains"):
+                for k in _GEO_PENDING_KEYS:
                     st.session_state.pop(k, None)
                 st.rerun()
             except Exception as e:
                 st.error(_format_crawl_error(e))
-                for k in ("geo_pending_urls", "geo_pending_limit", "geo_pending_ws", "geo_pending_base_url", "geo_crawl_decision", "geo_pending_extra_domains"):
+                for k in _GEO_PENDING_KEYS:
                     st.session_state.pop(k, None)
             return
 
@@ -1614,23 +1983,28 @@ def render_audit_geo():
         # ── Choix moteur (V1 / V2) ─────────────────────────────────────────
         if "scraping_engine" not in st.session_state:
             st.session_state["scraping_engine"] = "v2"
+        _engine_options = {
+            "v2": "🚀 V2 — Crawl4AI (rapide, Markdown LLM-ready)",
+            "v1": "🔧 V1 — Selenium (robuste, sites protégés)",
+            "hybrid": "⚡ Hybride — HTTP + navigateur si besoin",
+        }
+        _engine_keys = list(_engine_options)
+        _current_engine = st.session_state.get("scraping_engine")
         _engine_label = st.radio(
             "⚙️ Moteur de scraping",
-            options=[
-                "🚀 V2 — Crawl4AI (rapide, Markdown LLM-ready)",
-                "🔧 V1 — Selenium (robuste, sites protégés)",
-            ],
-            index=0 if st.session_state.get("scraping_engine") == "v2" else 1,
+            options=list(_engine_options.values()),
+            index=_engine_keys.index(_current_engine) if _current_engine in _engine_keys else 0,
             horizontal=True,
             key="scraping_engine_radio_audit_geo",
             help=(
                 "V2 = Playwright async, x5 plus rapide, génère du Markdown propre pour l'IA. "
-                "V1 = cascade requests→Selenium, pour les sites qui bloquent (Cloudflare, anti-bot)."
+                "V1 = cascade requests→Selenium, pour les sites qui bloquent (Cloudflare, anti-bot). "
+                "Hybride = HTTP parallèle, navigateur uniquement pour les pages rendues en JS."
             ),
         )
-        use_v2 = str(_engine_label).startswith("🚀")
-        st.session_state["scraping_engine"] = "v2" if use_v2 else "v1"
-        st.caption(f"Moteur actif : {'🚀 Crawl4AI V2' if use_v2 else '🔧 Selenium V1'}")
+        _engine = next(k for k, v in _engine_options.items() if v == _engine_label)
+        st.session_state["scraping_engine"] = _engine
+        st.caption(f"Moteur actif : {_engine_options[_engine]}")
 
         c1, c2 = st.columns([3, 1])
 
@@ -1673,6 +2047,60 @@ def render_audit_geo():
             help="Active Selenium pour le chargement des pages. Recommandé si le site timeout ou est en SPA.",
         )
 
+        st.checkbox(
+            "Couvrir un maximum de templates (crawl prioritaire)",
+            value=False,
+            key="geo_priority_frontier",
+            help=(
+                "Crawl best-first : les types de pages encore peu échantillonnés (/blog/…, /produit/…) passent avant "
+                "les milliers de pages d'un même template (file en mémoire). Décoché : crawl en largeur historique, "
+                "file à débordement disque."
+            ),
+        )
+
+        st.checkbox(
+            "Amorcer le crawl avec le sitemap",
+            value=False,
+            key="geo_sitemap_seed",
+            help=(
+                "Ajoute au crawl les URLs des sitemaps (déclarés dans robots.txt, index et .xml.gz compris) : "
+                "les pages profondes sont atteintes sans suivre les liens. Le lastmod du sitemap est reporté sur chaque page."
+            ),
+        )
+
+        st.checkbox(
+            "Écarter les quasi-doublons",
+            value=False,
+            key="geo_drop_near_duplicates",
+            help=(
+                "Pages au texte quasi identique à une page déjà crawlée (facettes, vues impression, variantes de "
+                "paramètres) : écartées sans consommer le budget de pages ni suivre leurs liens. Décoché : conservées "
+                "et marquées, le clustering ne compare qu'un représentant par groupe."
+            ),
+        )
+
+        st.checkbox(
+            "Alléger le rendu (images, vidéos, polices, traceurs bloqués)",
+            value=True,
+            key="geo_block_resources",
+            help=(
+                "Moteur V2 : le navigateur ne télécharge ni médias ni polices ni scripts publicitaires / analytics, "
+                "inutiles à l'audit (DOM, liens, JSON-LD, texte). Rendu plus rapide sur les sites riches en médias. "
+                "Décoché : pages chargées intégralement."
+            ),
+        )
+
+        if st.session_state.get("results"):
+            st.checkbox(
+                "Re-crawl incrémental (à partir de l'audit chargé)",
+                value=False,
+                key="geo_incremental",
+                help=(
+                    "Reprend les URLs de l'audit en mémoire : seules les pages modifiées (sitemap, ETag/Last-Modified) "
+                    "sont re-téléchargées avec V1/Hybride. Rapport nouvelles / modifiées / supprimées."
+                ),
+            )
+
         st.markdown("<br>", unsafe_allow_html=True)
 
         def _on_launch_geo():
@@ -1720,6 +2148,17 @@ def render_audit_geo():
                             )
                             home_results, _ = scraper_home.run_analysis()
                             data_home = home_results[0] if home_results else None
+                        elif engine == "hybrid":
+                            from core.scraping_hybrid import HybridScraper as ScraperHome
+                            scraper_home = ScraperHome(
+                                start_urls=[base_url],
+                                max_urls=1,
+                                log_callback=None,
+                            )
+                            try:
+                                data_home = scraper_home.get_page_details(base_url)
+                            finally:
+                                scraper_home.close()
                         else:
                             from core.scraping import SmartScraper as ScraperHome
                             scraper_home = ScraperHome(
@@ -1785,12 +2224,29 @@ def render_audit_geo():
                     except Exception:
                         pass
 
+                extra_list_direct = [line.strip() for line in (extra_domains_input or "").strip().splitlines() if line.strip()]
+                engine_direct = st.session_state.get("scraping_engine", "v2")
+                if engine_direct == "v2" or site_crawl_checkpoint(
+                    st.session_state, urls, limit_in, engine=engine_direct,
+                    use_selenium=selenium_enabled, selenium_mode=selenium_mode,
+                    extra_domains=extra_list_direct if extra_list_direct else None,
+                    **_geo_crawl_options(),
+                ).resumable():
+                    # Moteur V2 : crawl en arrière-plan (pause, annulation, progression) via le crawl en attente,
+                    # qui demande aussi s'il faut reprendre un crawl interrompu
+                    st.session_state["geo_pending_urls"] = urls
+                    st.session_state["geo_pending_limit"] = limit_in
+                    st.session_state["geo_pending_ws"] = ws_in or "Non classé"
+                    st.session_state["geo_pending_base_url"] = base_url
+                    st.session_state["geo_crawl_decision"] = "selenium" if selenium_enabled else "flash"
+                    st.session_state["geo_pending_extra_domains"] = extra_list_direct
+                    st.rerun()
+
                 bar = st.progress(0, "Crawl en cours...")
                 crawl_logs = []
                 def add_crawl_log(msg):
                     crawl_logs.append(msg)
 
-                extra_list_direct = [line.strip() for line in (extra_domains_input or "").strip().splitlines() if line.strip()]
                 try:
                     run_unified_site_analysis(
                         st.session_state,
@@ -1804,6 +2260,7 @@ def render_audit_geo():
                         progress_callback=lambda m, v: bar.progress(v, m),
                         log_callback=add_crawl_log,
                         extra_domains=extra_list_direct if extra_list_direct else None,
+                        **_geo_crawl_options(),
                     )
                 except Exception as e:
                     st.error(_format_crawl_error(e))
@@ -1821,6 +2278,26 @@ def render_audit_geo():
         if "results" in st.session_state:
             st.markdown('<div class="zen-divider"></div>', unsafe_allow_html=True)
 
+            inc_report = st.session_state.get("incremental_report")
+            if inc_report:
+                st.info(
+                    f"**Re-crawl incrémental** : {len(inc_report['new'])} nouvelle(s), "
+                    f"{len(inc_report['changed'])} modifiée(s), {len(inc_report['unchanged'])} inchangée(s), "
+                    f"{len(inc_report['removed'])} supprimée(s), {len(inc_report['not_checked'])} non vérifiée(s) — "
+                    f"{inc_report.get('carried_forward', 0)} page(s) reprise(s) sans re-téléchargement."
+                )
+                light = (inc_report.get("carry_skipped") or {}).get("light_record", 0)
+                if light:
+                    st.caption(
+                        f"{light} page(s) re-téléchargée(s) : la sauvegarde chargée est allégée (ni HTML ni liens), "
+                        "ses enregistrements ne peuvent pas être repris tels quels."
+                    )
+                with st.expander("Détail des changements"):
+                    for key, label in (("new", "Nouvelles"), ("changed", "Modifiées"), ("removed", "Supprimées")):
+                        if inc_report[key]:
+                            st.markdown(f"**{label}**")
+                            st.code("\n".join(inc_report[key][:200]))
+
             # ========== 02 / SCORE AI-READABLE ==========
             st.markdown(
                 '<p class="section-title">02 / SCORE AI-READABLE</p>',
@@ -1944,6 +2421,14 @@ def render_audit_geo():
                         f'URLs visitees : <strong>{len(st.session_state.results)}</strong></p>',
                         unsafe_allow_html=True
                     )
+                if stats.get("crawl_cache"):
+                    # Cache de crawl V2 (core/crawl_cache.py) : pages servies sans rendu navigateur
+                    st.markdown(
+                        f'<p style="font-size:0.75rem;color:#94a3b8;font-style:italic;">'
+                        f'Cache de crawl : <strong>{stats.get("cache_hits", 0)}</strong> page(s) servie(s), '
+                        f'<strong>{stats.get("cache_misses", 0)}</strong> rendue(s)</p>',
+                        unsafe_allow_html=True
+                    )
 
             st.markdown('<div class="zen-divider"></div>', unsafe_allow_html=True)
 
@@ -4,6 +4,9 @@ import re
 import streamlit as st
 from bs4 import BeautifulSoup
 
+from core.page_store import page_html
+from core.spa_detection import detect_spa_indicators as _detect_spa_indicators
+
 def _render_log_box(logs):
     """Affiche les logs techniques dans un bloc monospace."""
     if not logs:
@@ -19,54 +22,6 @@ def _render_log_box(logs):
     )
 
 
-def _detect_spa_indicators(html: str, soup: BeautifulSoup):
-    """Détecte tous les indicateurs SPA possibles."""
-    html_l = html.lower()
-    indicators = []
-    
-    # Patterns dans le texte
-    text_patterns = {
-        "react": "React (texte)",
-        "__next": "Next.js (texte)",
-        "nuxt": "Nuxt (texte)",
-        "_nuxt": "Nuxt (texte)",
-        "vue": "Vue (texte)",
-        "angular": "Angular (texte)",
-        "data-reactroot": "React (data-reactroot)",
-        '<div id="root">': "React (div#root)",
-        '<div id="app">': "Vue (div#app)",
-    }
-    
-    for pattern, label in text_patterns.items():
-        if pattern in html_l:
-            indicators.append({"type": "texte", "signal": label, "pattern": pattern})
-    
-    # Scripts avec src
-    for script in soup.find_all("script", src=True):
-        src = script["src"].lower()
-        if "_nuxt" in src:
-            indicators.append({"type": "script", "signal": "Nuxt", "pattern": f"src={script['src'][:60]}..."})
-        elif "__next" in src:
-            indicators.append({"type": "script", "signal": "Next.js", "pattern": f"src={script['src'][:60]}..."})
-        elif any(p in src for p in ["react", "vue", "angular"]):
-            indicators.append({"type": "script", "signal": "Framework JS", "pattern": f"src={script['src'][:60]}..."})
-    
-    # Links modulepreload
-    for link in soup.find_all("link", rel=True):
-        rel = " ".join(link["rel"]).lower() if isinstance(link["rel"], list) else link["rel"].lower()
-        href = link.get("href", "").lower()
-        
-        if "modulepreload" in rel and (".js" in href or "_nuxt" in href):
-            indicators.append({"type": "link", "signal": "ES Module", "pattern": f"modulepreload {href[:50]}..."})
-    
-    # Scripts type=module
-    module_scripts = soup.find_all("script", type="module")
-    if module_scripts:
-        indicators.append({"type": "module", "signal": f"{len(module_scripts)} script(s) ES module", "pattern": "type=module"})
-    
-    return indicators
-
-
 def render_scraping_debug_tab():
     """Onglet de debug Scraping/JSON-LD ultra-complet."""
 
@@ -276,7 +231,7 @@ def render_scraping_debug_tab():
         with col_scrap3:
             st.metric("Liens", len(data.get("links", [])))
         with col_scrap4:
-            st.metric("HTML", f"{len(data.get('html_content', '')) // 1024}KB")
+            st.metric("HTML", f"{(data.get('html_full_size') or len(data.get('html_content', ''))) // 1024}KB")
 
         # ===== JSON-LD =====
         st.markdown('<div class="zen-divider"></div>', unsafe_allow_html=True)
@@ -328,7 +283,7 @@ def render_scraping_debug_tab():
             unsafe_allow_html=True,
         )
 
-        html = data.get("html_content") or ""
+        html = page_html(data)
         soup = BeautifulSoup(html, "html.parser")
         scripts = soup.find_all("script")
 
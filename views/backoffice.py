@@ -1,16 +1,17 @@
 # Backoffice HOTARU — Gestion centralisée (tabs SaaS-ready)
-# Onglets : Utilisateurs | Workspaces | Accès
+# Onglets : Utilisateurs | Workspaces | Accès | Cache de crawl
 
 import logging
 import streamlit as st
 
+from core.crawl_cache import get_crawl_cache
 from core.session_keys import get_current_user_email, is_admin
 
 logger = logging.getLogger(__name__)
 
 
 def render_backoffice_tab(auth, db):
-    """Backoffice complet : Utilisateurs, Workspaces, Accès — en tabs."""
+    """Backoffice complet : Utilisateurs, Workspaces, Accès, Cache de crawl — en tabs."""
     if not is_admin():
         st.warning("Accès réservé aux administrateurs.")
         return
@@ -24,10 +25,11 @@ def render_backoffice_tab(auth, db):
     st.markdown("## Backoffice")
     st.caption("Gestion centralisée des utilisateurs, workspaces et droits d'accès.")
 
-    tab_users, tab_workspaces, tab_access = st.tabs([
+    tab_users, tab_workspaces, tab_access, tab_cache = st.tabs([
         "Utilisateurs",
         "Workspaces",
         "Accès par workspace",
+        "Cache de crawl",
     ])
 
     with tab_users:
@@ -39,6 +41,9 @@ def render_backoffice_tab(auth, db):
     with tab_access:
         _render_access_tab(auth, db)
 
+    with tab_cache:
+        _render_crawl_cache_tab()
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 1 — Utilisateurs
@@ -410,3 +415,59 @@ def _render_access_tab(auth, db):
                 logger.error("Échec set_user_workspaces('%s', %s): %s", email, selected, e, exc_info=True)
                 st.error(str(e)[:200])
         st.divider()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TAB 4 — Cache de crawl (pages rendues du moteur V2, core/crawl_cache.py)
+# ═══════════════════════════════════════════════════════════════════════════════
+def _render_crawl_cache_tab():
+    cache = get_crawl_cache()
+    if cache is None:
+        st.info("Cache de crawl désactivé (HOTARU_CRAWL_CACHE=0) ou dossier du cache inaccessible.")
+        return
+
+    snap = cache.snapshot()
+    st.markdown("### Cache de crawl")
+    st.caption(
+        f"Dossier : `{snap['directory']}` — {snap['entries']} page(s), "
+        f"{snap['size_bytes'] / 1048576:.1f} / {snap['max_bytes'] / 1048576:.0f} Mo — "
+        f"durée par défaut : {snap['ttl_hours']:g} h"
+    )
+
+    domains = cache.domains()
+    ttls = cache.domain_ttls()
+    if not domains:
+        st.info("Cache vide.")
+    for i, (domain, info) in enumerate(domains.items()):
+        cols = st.columns([3, 1.5, 1.5, 1])
+        cols[0].markdown(f"**{domain}**")
+        cols[1].markdown(f"{info['pages']} page(s) · {info['bytes'] / 1048576:.1f} Mo")
+        cols[2].markdown(f"TTL {cache.ttl_for(domain):g} h")
+        if cols[3].button("Purger", key=f"bo_cache_purge_{i}"):
+            count = cache.purge_domain(domain)
+            logger.info("Cache de crawl : %s purgé (%d page(s), par %s)", domain, count, get_current_user_email())
+            st.toast(f"{domain} : {count} page(s) supprimée(s) du cache.")
+            st.rerun()
+
+    st.markdown("### Durée de validité par domaine")
+    st.caption("0 h : domaine jamais mis en cache. Vide : durée par défaut.")
+    with st.form("bo_cache_ttl_form"):
+        c1, c2 = st.columns([3, 1])
+        domain = c1.text_input("Domaine", placeholder="example.com")
+        hours = c2.text_input("TTL (heures)", placeholder=f"{snap['ttl_hours']:g}")
+        if st.form_submit_button("Enregistrer"):
+            try:
+                cache.set_domain_ttl(domain, float(hours.replace(",", ".")) if hours.strip() else None)
+                logger.info("Cache de crawl : TTL %s = %s h (par %s)", domain, hours or "défaut", get_current_user_email())
+                st.toast(f"TTL enregistré pour {domain}.")
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e)[:200])
+    for domain, value in sorted(ttls.items()):
+        st.markdown(f"- `{domain}` : {value:g} h")
+
+    if st.button("Vider tout le cache", key="bo_cache_clear"):
+        cache.clear()
+        logger.info("Cache de crawl vidé par %s", get_current_user_email())
+        st.toast("Cache de crawl vidé.")
+        st.rerun()
@@ -11,6 +11,7 @@ import time
 import zipfile
 from urllib.parse import urlparse
 
+from core.page_store import page_html
 from services.jsonld_service import (
     extract_dom_structure,
     cluster_pages,
@@ -101,7 +102,9 @@ def _get_mistral_key():
 def render_jsonld_analyzer_tab():
     """Onglet Vue d'ensemble : crawl + clustering + comparaison JSON-LD."""
     import streamlit as st
-    from views.audit_geo import run_unified_site_analysis, _format_crawl_error
+    from views.audit_geo import (
+        _format_crawl_error, render_crawl_job, run_unified_site_analysis, start_site_crawl_job,
+    )
 
     st.markdown("<p class='section-title'>VUE ENSEMBLE</p>", unsafe_allow_html=True)
     st.markdown(
@@ -120,17 +123,28 @@ def render_jsonld_analyzer_tab():
     with tab_new:
         st.caption("Un seul scrape remplit l'Audit GEO et la Vue d'ensemble JSON-LD.")
 
+        if st.session_state.get("jsonld_crawl_job") is not None:
+            # Moteur V2 : crawl en arrière-plan, progression relue à chaque rerun
+            render_crawl_job("jsonld_crawl_job", "jsonld_crawl_logs", key_prefix="jsonld_crawl", resume_hint=False)
+            return
+
         if "scraping_engine" not in st.session_state:
             st.session_state["scraping_engine"] = "v2"
+        _engine_options = {
+            "v2": "V2 — Crawl4AI (rapide)",
+            "v1": "V1 — Selenium (robuste)",
+            "hybrid": "Hybride — HTTP + navigateur si besoin",
+        }
+        _engine_keys = list(_engine_options)
+        _current_engine = st.session_state.get("scraping_engine")
         _engine_label = st.radio(
             "Moteur de scraping",
-            ["V2 — Crawl4AI (rapide)", "V1 — Selenium (robuste)"],
-            index=0 if st.session_state.get("scraping_engine") == "v2" else 1,
+            list(_engine_options.values()),
+            index=_engine_keys.index(_current_engine) if _current_engine in _engine_keys else 0,
             horizontal=True,
             key="scraping_engine_radio_jsonld",
         )
-        use_v2 = "V2" in str(_engine_label)
-        st.session_state["scraping_engine"] = "v2" if use_v2 else "v1"
+        st.session_state["scraping_engine"] = next(k for k, v in _engine_options.items() if v == _engine_label)
 
         url_input = st.text_input("URL du site", placeholder="https://www.example.com", key="jsonld_analyzer_url")
         max_pages = st.slider("Pages à crawler", 1, 10000, 150, 10, key="jsonld_analyzer_max_pages")
@@ -160,6 +174,24 @@ def render_jsonld_analyzer_tab():
             if not url.startswith(("http://", "https://")):
                 url = "https://" + url
 
+            if st.session_state.get("scraping_engine", "v2") == "v2":
+                # Crawl V2 hors du script Streamlit (pause, annulation, progression) : cf. render_crawl_job
+                try:
+                    st.session_state["jsonld_crawl_job"] = start_site_crawl_job(
+                        st.session_state,
+                        urls=[url],
+                        max_pages=max_pages,
+                        workspace_name=st.session_state.get("audit_workspace_select") or "Non classé",
+                        cluster_threshold=cluster_threshold,
+                        frontier="priority",  # clustering : un maximum de templates dans le budget de pages
+                        near_duplicates="drop",  # une seule page par groupe de quasi-doublons
+                    )
+                except Exception as e:
+                    st.error(_format_crawl_error(e))
+                    return
+                st.session_state["jsonld_crawl_logs"] = []
+                st.rerun()
+
             progress_ph = st.empty()
             with progress_ph:
                 bar = st.progress(0.0, "Crawl et analyse unifiés...")
@@ -175,6 +207,8 @@ def render_jsonld_analyzer_tab():
                     cluster_threshold=cluster_threshold,
                     progress_callback=lambda msg, val: bar.progress(min(val, 1.0), msg),
                     log_callback=lambda msg: None,
+                    frontier="priority",  # clustering : un maximum de templates dans le budget de pages
+                    near_duplicates="drop",  # une seule page par groupe de quasi-doublons
                 )
             except Exception as e:
                 progress_ph.empty()
@@ -368,7 +402,7 @@ def _render_cluster_detail(idx, cluster_labels, cluster_urls, cluster_dom, clust
                 for url in urls_in_cluster:
                     for page in st.session_state["jsonld_analyzer_crawl_results"]:
                         if page.get("url") == url:
-                            page_dom = page.get("dom_structure") or extract_dom_structure(page.get("html_content") or "")
+                            page_dom = page.get("dom_structure") or extract_dom_structure(page_html(page))
                             cluster_doms.append(page_dom)
                             break
                 if cluster_doms: